@@ -0,0 +1,54 @@
+'''Запуск бенчмарков из командной строки.
+
+Примеры:
+    python -m benchmarks run --json baseline.json
+    python -m benchmarks run --quick --only client_overhead --only crud_c8
+    python -m benchmarks compare baseline.json current.json --threshold 0.1
+
+compare завершается с кодом 1, если есть регрессии - так его можно
+поставить шагом в CI.'''
+
+import argparse
+import json
+import sys
+from benchmarks.compare import DEFAULT_THRESHOLD, compare, format_table, load
+from benchmarks.suite import BENCHMARKS, run
+from core.logs.pipeline import setup_logging, stop_logging
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Бенчмарки клиента API')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='запустить бенчмарки')
+    run_parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS), help='только этот бенчмарк')
+    run_parser.add_argument('--quick', action='store_true', help='короткие серии (для проверки, не для сравнения)')
+    run_parser.add_argument('--json', dest='json_path', help='куда сохранить результаты')
+    run_parser.add_argument('--log-level', default='WARNING', help='уровень логирования')
+
+    compare_parser = commands.add_parser('compare', help='сравнить два отчёта')
+    compare_parser.add_argument('baseline', help='отчёт до изменений')
+    compare_parser.add_argument('current', help='отчёт после изменений')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help='допустимое ухудшение (доля, 0.1 = 10%%)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        rows = compare(load(args.baseline), load(args.current), args.threshold)
+        print(format_table(rows))
+        return 1 if any(row['regression'] for row in rows) else 0
+
+    setup_logging(level=args.log_level.upper())
+    report = run(args.only, quick=args.quick)
+    stop_logging()
+    for name, result in report['results'].items():
+        print(f"{name:<22}{result['value']:>14.1f} {result['unit']}")
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f'Результаты сохранены: {args.json_path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+'''Сравнение двух отчётов бенчмарков.
+
+Регрессия - это изменение главного числа (value) в худшую сторону
+больше чем на threshold (доля: 0.1 = 10%). Направление берётся из
+higher_is_better: для ops/s хуже - меньше, для us/request хуже - больше.'''
+
+import json
+
+DEFAULT_THRESHOLD = 0.10
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    '''Сравнивает отчёты. Возвращает строки сравнения по бенчмаркам, которые есть в обоих.
+
+    Каждая строка: {'name', 'unit', 'baseline', 'current', 'change', 'regression'},
+    change - относительное изменение в "хорошую" сторону (отрицательное - стало хуже).'''
+    rows = []
+    for name in sorted(set(baseline['results']) & set(current['results'])):
+        before = baseline['results'][name]
+        after = current['results'][name]
+        if before['value'] == 0:
+            change = 0.0
+        else:
+            change = (after['value'] - before['value']) / before['value']
+            if not after['higher_is_better']:
+                change = -change
+        rows.append({
+            'name': name,
+            'unit': after['unit'],
+            'baseline': before['value'],
+            'current': after['value'],
+            'change': change,
+            'regression': change < -threshold,
+        })
+    return rows
+
+
+def format_table(rows):
+    '''Таблица сравнения для консоли.'''
+    header = f"{'benchmark':<22}{'unit':>14}{'baseline':>14}{'current':>14}{'change':>9}"
+    lines = [header, '-' * len(header)]
+    for row in rows:
+        mark = '  ❌ регрессия' if row['regression'] else ''
+        lines.append(
+            f"{row['name']:<22}{row['unit']:>14}{row['baseline']:>14.1f}{row['current']:>14.1f}"
+            f"{row['change'] * 100:>+8.1f}%{mark}"
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,220 @@
+'''Бенчмарки клиента, моделей и генератора данных.
+
+Каждый бенчмарк меряет одну вещь и возвращает BenchmarkResult:
+    client_overhead      - сколько стоит сам APIClient._request (сеть заменена
+                           заглушкой, которая сразу отдаёт готовый ответ)
+    booking_validation   - проверка Booking из dict
+    response_validation  - проверка BookingResponse прямо из байтов
+    payload_generation   - генерация данных бронирований
+    crud_c1/c8/c64       - полный цикл CRUD против локального сервера
+                           при 1, 8 и 64 потоках
+    crud_scaling         - crud_c64 / crud_c1 (считается из уже измеренных crud_*)
+
+Локальный сервер работает в том же процессе, поэтому crud_* - это
+сравнение сборок между собой, а не оценка реального сервера. Сервер и
+все потоки клиента делят один GIL, так что с ростом числа потоков
+итераций в секунду почти не прибавляется (crud_scaling около 1, может
+быть и меньше). crud_scaling сравнивается с базовым отчётом, как и
+остальные числа: если он упал - клиент стал хуже переносить конкуренцию
+потоков (блокировки, пул соединений).
+
+У клиентов бенчмарков session.trust_env = False: иначе requests на каждый
+запрос ищет прокси в переменных окружения (merge_environment_settings),
+и в client_overhead это ~75% времени - бенчмарк мерил бы окружение,
+а не код клиента.'''
+
+import json
+import os
+import platform
+import statistics
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from core.clients.api_client import APIClient
+from core.data.booking_data import BookingDataGenerator
+from core.load.runner import LoadRunner
+from core.metrics.latency import LatencyRegistry
+from core.models.booking import Booking, booking_response_adapter
+from core.server.local_server import LocalBookingServer
+from core.settings.config import Users
+
+FORMAT_VERSION = 1
+CRUD_CONCURRENCY = (1, 8, 64)
+
+
+@dataclass
+class BenchmarkResult:
+    '''Результат одного бенчмарка.
+
+    value: главное число (его и сравнивает compare)
+    unit: единица измерения value
+    higher_is_better: True - чем больше, тем лучше (ops/s), False - наоборот (мкс)
+    extra: дополнительные числа (перцентили, разброс)'''
+    value: float
+    unit: str
+    higher_is_better: bool
+    extra: dict = field(default_factory=dict)
+
+
+def measure(func, number, repeat=5):
+    '''Вызывает func() number раз, repeat серий (плюс одна на прогрев).
+
+    Возвращает операций в секунду: медиану и разброс по сериям.'''
+    func()  # Прогрев: ленивые импорты, кэши, первое соединение
+    rates = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        rates.append(number / (time.perf_counter() - start))
+    return statistics.median(rates), min(rates), max(rates)
+
+
+def _rate_result(rates, unit='ops/s'):
+    median, low, high = rates
+    return BenchmarkResult(median, unit, True, {'min': low, 'max': high})
+
+
+# === КЛИЕНТ ===
+
+class _StubAdapter(HTTPAdapter):
+    '''Вместо сети сразу отдаёт один и тот же ответ - остаётся только цена клиента.'''
+    def __init__(self, body=b'Created', status=201):
+        super().__init__()
+        self.body = body
+        self.status = status
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = self.status
+        response.headers = CaseInsensitiveDict({'Content-Type': 'text/plain', 'Content-Length': str(len(self.body))})
+        response._content = self.body
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+
+def _client(max_workers=None):
+    '''APIClient со своим реестром времени и без настроек из окружения (прокси, .netrc).'''
+    kwargs = {'latency': LatencyRegistry()}
+    if max_workers:
+        kwargs['max_workers'] = max_workers
+    client = APIClient(**kwargs)
+    client.session.trust_env = False
+    return client
+
+
+def client_overhead(quick=False):
+    '''Микросекунд на вызов ping() без сети.'''
+    client = _client()
+    adapter = _StubAdapter()
+    client.session.mount('http://', adapter)
+    client.session.mount('https://', adapter)
+    median, low, high = measure(client.ping, number=2_000 if quick else 20_000)
+    return BenchmarkResult(1_000_000 / median, 'us/request', False,
+                           {'min': 1_000_000 / high, 'max': 1_000_000 / low})
+
+
+# === МОДЕЛИ ===
+
+def booking_validation(quick=False):
+    '''Проверок Booking(**dict) в секунду.'''
+    data = BookingDataGenerator(seed=0).batch(1)[0]
+    return _rate_result(measure(lambda: Booking(**data), number=5_000 if quick else 50_000))
+
+
+def response_validation(quick=False):
+    '''Проверок BookingResponse из JSON-байтов в секунду.'''
+    booking = BookingDataGenerator(seed=0).batch(1)[0]
+    payload = json.dumps({'bookingid': 1, 'booking': booking}).encode('utf-8')
+    return _rate_result(measure(lambda: booking_response_adapter.validate_json(payload),
+                                number=5_000 if quick else 50_000))
+
+
+# === ДАННЫЕ ===
+
+def payload_generation(quick=False):
+    '''Бронирований в секунду (пачками по 1000).'''
+    generator = BookingDataGenerator(seed=0)
+    median, low, high = measure(lambda: generator.batch(1000), number=5 if quick else 50)
+    return BenchmarkResult(median * 1000, 'bookings/s', True, {'min': low * 1000, 'max': high * 1000})
+
+
+# === ПОЛНЫЙ ЦИКЛ ===
+
+def crud_throughput(concurrency, quick=False):
+    '''Итераций CRUD в секунду при concurrency потоках (закрытая модель).'''
+    client = _client(max_workers=concurrency)
+    client.auth()
+    generator = BookingDataGenerator(seed=0)
+    report = LoadRunner(client, scenario='crud', concurrency=concurrency, duration=1 if quick else 5,
+                        payload_factory=generator).run()
+    create = report.endpoints.get('POST /booking', {'count': 0})
+    iterations = create['count'] / report.elapsed
+    extra = {'error_rate': report.error_rate}
+    extra.update({f'{key} p{p}': stats[f'p{p}'] for key, stats in report.endpoints.items() for p in (50, 99)})
+    return BenchmarkResult(iterations, 'iterations/s', True, extra)
+
+
+def _crud(concurrency):
+    return lambda quick=False: crud_throughput(concurrency, quick)
+
+
+def crud_scaling(results):
+    '''Отношение итераций CRUD при наибольшем и наименьшем числе потоков.
+
+    results - уже посчитанные результаты (dict из run). None, если crud_* измерено меньше двух.'''
+    measured = {concurrency: results[f'crud_c{concurrency}']['value']
+                for concurrency in CRUD_CONCURRENCY if f'crud_c{concurrency}' in results}
+    if len(measured) < 2 or not measured[min(measured)]:
+        return None
+    low, high = min(measured), max(measured)
+    return BenchmarkResult(measured[high] / measured[low], f'x c{high}/c{low}', True,
+                           {f'crud_c{concurrency}': value for concurrency, value in measured.items()})
+
+
+BENCHMARKS = {
+    'client_overhead': client_overhead,
+    'booking_validation': booking_validation,
+    'response_validation': response_validation,
+    'payload_generation': payload_generation,
+    **{f'crud_c{concurrency}': _crud(concurrency) for concurrency in CRUD_CONCURRENCY},
+}
+
+
+def run(names=None, quick=False):
+    '''Запускает бенчмарки против локального сервера и возвращает отчёт (dict).'''
+    names = names or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f'Неизвестные бенчмарки: {unknown}. Доступны: {", ".join(BENCHMARKS)}')
+
+    server = LocalBookingServer(username=Users.USERNAME.value, password=Users.PASSWORD.value).start()
+    # Клиенты ходят только в локальный сервер, без кассет и общего кэша токенов
+    saved = {name: os.environ.get(name) for name in ('ENVIRONMENT', 'LOCAL_BASE_URL', 'CASSETTE_MODE', 'TOKEN_CACHE')}
+    os.environ.update(ENVIRONMENT='LOCAL', LOCAL_BASE_URL=server.url, CASSETTE_MODE='off', TOKEN_CACHE='off')
+    try:
+        results = {name: asdict(BENCHMARKS[name](quick=quick)) for name in names}
+        scaling = crud_scaling(results)
+        if scaling is not None:
+            results['crud_scaling'] = asdict(scaling)
+    finally:
+        server.stop()
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    return {
+        'version': FORMAT_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'quick': quick,
+        'results': results,
+    }
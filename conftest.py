@@ -1,29 +1,49 @@
 '''Главный конфигурационный файл pytest.
-Содержит все фикстуры и настройки для тестов.'''
+Содержит все фикстуры и настройки для тестов.
+
+Клиенты, локальный сервер и всё тяжёлое (requests, httpx, pydantic)
+импортируются внутри фикстур: pytest --collect-only и тесты, которым
+клиент не нужен, их не загружают. Проверка - tests/test_startup.py.'''
 
 import pytest
+import pytest_asyncio
 import logging
+import os
+import random
 import sys
+import zlib
 from datetime import datetime, timedelta
-from faker import Faker
-
-from core.clients.api_client import APIClient
-
 
-# ========== ПРОСТЕЙШЕЕ ЛОГИРОВАНИЕ (3 строки) ==========
-# logging - встроенная библиотека Python, ничего устанавливать не нужно
-# basicConfig - базовая настройка логирования
+from core.clients.booking_pool import BookingPool
+from core.data.booking_data import BookingDataGenerator
+from core.logs.pipeline import setup_logging, stop_logging
+from core.settings.config import Users
+from core.settings.environments import load_env
+
+# Плагины из core/plugins (опции командной строки, отчёты)
+pytest_plugins = [
+    'core.plugins.load',
+    'core.plugins.latency_report',
+    'core.plugins.cassette',
+    'core.plugins.scheduling',
+    'core.plugins.concurrent_params',
+    'core.plugins.fuzzing',
+    'core.plugins.targets',
+]
+
+
+# ========== ЛОГИРОВАНИЕ ==========
+# setup_logging - обёртка над встроенным logging (см. core/logs/pipeline.py):
 # level=logging.INFO - показывать информационные сообщения и выше (WARNING, ERROR)
 #                    - если поставить DEBUG, будет показывать ВСЁ
-# format - как будут выглядеть логи: время | сообщение
-# handlers - куда выводить логи (в консоль)
-logging.basicConfig(
-    level=logging.INFO,  # Для отладки меняйте на logging.DEBUG
-    format='%(asctime)s | %(name)-25s | %(levelname)-8s | %(message)s',  # Простой формат: время | имя модуля.
-    # Цифра -25 означает, что под имя резервируется 25 символов, а текст будет выровнен по левому краю | Текстовое название
-    # уровня (INFO, DEBUG и т.д.). Резервируется 8 символов. | сообщение
-    handlers=[logging.StreamHandler(sys.stdout)]  # Вывод в консоль
-)
+# Формат тот же: время | имя модуля | уровень | сообщение.
+# Под pytest вывод синхронный (без очереди). С опциями нагрузки, soak и фаззинга
+# строки "по одной на запрос" выводятся с ограничением частоты.
+# Настраивается при импорте conftest, как раньше basicConfig: pytest в этот момент
+# уже перехватывает вывод, и обработчик пишет в перехват. Строки из фоновых
+# потоков (concurrent_params, хеджирование) между тестами тоже попадают туда,
+# а не в строку прогресса. В pytest_configure sys.stdout - уже настоящий вывод.
+setup_logging(level=logging.INFO, stream=sys.stdout, use_queue=False)  # Для отладки меняйте на logging.DEBUG
 
 # Создаём логгер для этого файла
 # __name__ - специальная переменная, равна "conftest"
@@ -31,16 +51,52 @@ logger = logging.getLogger(__name__)
 # =======================================================
 
 
+def pytest_unconfigure(config):
+    '''Дописываем логи из очереди, пока pytest ещё не закрыл вывод.'''
+    stop_logging()
+
+
 @pytest.fixture(scope='session')
-def api_client():
+def local_server():
+    '''Локальный сервер бронирований (только для ENVIRONMENT=LOCAL).
+
+    Запускается один раз за сессию и прописывает свой адрес в LOCAL_BASE_URL,
+    поэтому клиенты ходят в него, а не в общее окружение.'''
+    load_env()  # ENVIRONMENT может быть задан в .env
+    if os.getenv('ENVIRONMENT', 'PROD').upper() != 'LOCAL':
+        yield None
+        return
+
+    from core.server.local_server import LocalBookingServer
+    server = LocalBookingServer(username=Users.USERNAME.value, password=Users.PASSWORD.value).start()
+    previous_url = os.environ.get('LOCAL_BASE_URL')
+    os.environ['LOCAL_BASE_URL'] = server.url
+    yield server
+    server.stop()
+    # Возвращаем адрес из окружения (.env), чтобы он не указывал на остановленный сервер
+    if previous_url is None:
+        os.environ.pop('LOCAL_BASE_URL', None)
+    else:
+        os.environ['LOCAL_BASE_URL'] = previous_url
+
+
+@pytest.fixture(scope='session')
+def api_client(local_server, target, client_pool):
     '''Фикстура для создания API клиента.
-    scope='session' - создаётся ОДИН РАЗ за все тесты.'''
+    scope='session' - создаётся ОДИН РАЗ за все тесты.
+    С --targets - клиент цели этого теста из общего пула (core/plugins/targets.py).'''
 
     logger.info("=" * 50)
-    logger.info("🚀 НАЧАЛО ТЕСТОВОЙ СЕССИИ")
+    logger.info("🚀 НАЧАЛО ТЕСТОВОЙ СЕССИИ" + (f" ({target})" if target else ""))
     logger.info("=" * 50)
 
-    # Создаём клиент
+    if target is not None:
+        # Клиент уже создан и аутентифицирован пулом, закроет его тоже пул
+        yield client_pool.client(target)
+        return
+
+    # Создаём клиент (импорт здесь - requests и pydantic грузятся только когда нужны)
+    from core.clients.api_client import APIClient
     client = APIClient()
 
     # Аутентифицируемся
@@ -57,11 +113,42 @@ def api_client():
     logger.info("=" * 50)
 
 
+@pytest_asyncio.fixture(scope='session', loop_scope='session')
+async def async_api_client(local_server, target, client_pool):
+    '''Фикстура для асинхронного API клиента.
+    scope='session' - создаётся ОДИН РАЗ за все тесты,
+    loop_scope='session' - живёт в одном event loop со всеми тестами.
+    С --targets - отдельный клиент на цель, время ответа пишется в отчёт цели.'''
+
+    # Создаём клиент (импорт здесь - httpx грузится только для async-тестов)
+    from core.clients.async_api_client import AsyncAPIClient
+    client = client_pool.async_client(target) if target is not None else AsyncAPIClient()
+
+    # Аутентифицируемся
+    logger.info("🔑 Аутентификация (async)...")
+    await client.auth()
+    logger.info("✅ Аутентификация успешна")
+
+    # yield - отдаём клиент тестам
+    yield client
+
+    # Закрываем соединения после ВСЕХ тестов
+    await client.aclose()
+
+
+@pytest.fixture(scope='session')
+def today():
+    '''Сегодняшняя дата для тестовых данных.
+    С кассетой (CASSETTE_MODE=record/replay) - фиксированная,
+    чтобы запросы совпадали с записанными в любой день.'''
+    if os.getenv('CASSETTE_MODE', 'off').lower() != 'off':
+        return datetime(2030, 1, 1)
+    return datetime.today()
+
 
 @pytest.fixture
-def booking_dates():
+def booking_dates(today):
     '''Фикстура с датами'''
-    today = datetime.today()
     checkin_date = today + timedelta(days=10)
     checkout_date = checkin_date + timedelta(days=5)
 
@@ -71,24 +158,51 @@ def booking_dates():
     }
 
 
+@pytest.fixture(scope='session')
+def booking_pool(api_client, today, booking_data_seed):
+    '''Пул заранее созданных бронирований.
+    Создаётся один раз за сессию, в конце всё созданное удаляется.'''
+    generator = BookingDataGenerator(seed=booking_data_seed, today=today)
+    pool = BookingPool(api_client, payload_factory=generator).fill()
+    yield pool
+    pool.cleanup()
+
+
+@pytest.fixture
+def exclusive_booking(booking_pool):
+    '''Бронирование только для этого теста - можно менять и удалять.'''
+    return booking_pool.lease_exclusive()
+
+
+@pytest.fixture
+def shared_booking(booking_pool):
+    '''Бронирование только для чтения - общее с другими тестами.'''
+    return booking_pool.lease_shared()
+
+
+@pytest.fixture(scope='session')
+def booking_data_seed():
+    '''Зерно генератора тестовых данных на всю сессию.
+    BOOKING_DATA_SEED=<число> - повторить данные прошлого прогона.'''
+    seed = os.getenv('BOOKING_DATA_SEED')
+    seed = int(seed) if seed else random.randrange(2 ** 32)
+    logger.info(f"🎲 Зерно тестовых данных: {seed}")
+    return seed
+
+
 @pytest.fixture()
-def generate_random_booking_data(booking_dates):
+def generate_random_booking_data(request, booking_dates, booking_data_seed):
     '''Генерация случайных данных для бронирования.
 
-    Использует библиотеку Faker для создания:
-    - реальных имён и фамилий
-    - случайных цен
-    - случайных булевых значений'''
-    fake = Faker()
-
-    data = {
-        'firstname': fake.first_name(),
-        'lastname': fake.last_name(),
-        'totalprice': fake.random_int(100, 999),
-        'depositpaid': fake.boolean(),
-        'bookingdates': booking_dates,
-        'additionalneeds': fake.sentence()
-    }
+    Использует BookingDataGenerator (данные Faker загружаются один раз на процесс):
+    - реальные имена и фамилии
+    - случайные цены
+    - случайные булевы значения
+    Зерно - зерно сессии + имя теста, поэтому данные теста
+    не зависят от того, какие тесты запускались до него.'''
+    seed = booking_data_seed ^ zlib.crc32(request.node.nodeid.encode('utf-8'))
+    data = BookingDataGenerator(seed=seed).batch(1)[0]
+    data['bookingdates'] = booking_dates
 
     # Логируем сгенерированные данные (уровень DEBUG - видно только если включили DEBUG)
     logger.debug(f"📝 Сгенерированы тестовые данные: {data}")
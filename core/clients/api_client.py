@@ -3,29 +3,64 @@
 
 import requests
 import os
+import threading
 import time
-from dotenv import load_dotenv
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Optional
 from requests.auth import HTTPBasicAuth
-from core.settings.environments import Environment
+from core.clients.cassette import adapter_from_env
+from core.clients.token_cache import token_cache_from_env
+from core.clients.http_cache import http_cache_from_env
+from core.clients.json_stream import iter_json_array
+from core.clients.resilience import resilience_from_env
+from core.settings.environments import Environment, load_env
 from core.clients.endpoints import Endpoints
-from core.settings.config import Users, Timeouts
+from core.settings.config import Users, Timeouts, Limits, Streaming
+from core.models import booking as models
+from core.metrics.latency import registry
+from core.logs.pipeline import hot_path_enabled
 import logging
 
-# Загружаем переменные из .env
-load_dotenv()
-
 # ПОЛУЧАЕМ ЛОГГЕР (НЕ настраиваем, просто получаем)
 # Логгер уже настроен в conftest.py, здесь просто берём его
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class BulkResult:
+    '''Результат одной операции в массовом запросе.
+
+    item - то, что передали (данные бронирования или ID),
+    response - ответ сервера, если запрос прошёл успешно,
+    error - исключение, если запрос упал.'''
+    item: Any
+    response: Optional[requests.Response] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
 class APIClient:
     '''Клиент для API.'''
-    def __init__(self):
+    def __init__(self, max_workers=Limits.BULK_WORKERS.value, latency=None, environment=None, base_url=None):
         '''Инициализация клиента.
-        Определяет окружение, базовый URL, создаёт сессию.'''
+        Определяет окружение, базовый URL, создаёт сессию.
+
+        Аргументы:
+            max_workers: сколько потоков выполняют массовые операции
+                         (create_bookings, delete_bookings и т.д.)
+            latency: LatencyRegistry для времени ответа (по умолчанию - общий)
+            environment: имя окружения (TEST, PROD, LOCAL), по умолчанию - ENVIRONMENT
+            base_url: свой базовый URL вместо URL окружения (например, реплика стенда)'''
+        # Загружаем переменные из .env (при первом создании клиента)
+        load_env()
+
         # Определяем окружение (test или prod)
-        environment_str = os.getenv('ENVIRONMENT', 'PROD')
+        environment_str = environment or os.getenv('ENVIRONMENT', 'PROD')
         try:
             self.environment = Environment[environment_str.upper()]
         except KeyError:
@@ -34,7 +69,7 @@ class APIClient:
             raise ValueError(error_msg)
 
         # Получаем базовый URL
-        self.base_url = self._get_base_url()
+        self.base_url = base_url or self._get_base_url()
 
         # Создаём сессию (для повторного использования соединения)
         self.session = requests.Session()
@@ -43,9 +78,31 @@ class APIClient:
             "Accept": "application/json"
         })
 
+        # По умолчанию urllib3 держит только 10 соединений на хост.
+        # Делаем пул размером с число потоков, иначе потоки будут ждать соединение.
+        # С CASSETTE_MODE=record/replay адаптер ещё и пишет/отдаёт ответы из кассеты
+        self.max_workers = max_workers
+        adapter = adapter_from_env(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
         # Таймаут по умолчанию
         self.timeout = Timeouts.DEFAULT.value
 
+        # Куда записываем время ответа каждого запроса
+        self.latency = latency if latency is not None else registry
+
+        # Повторы, предохранитель и хеджирование (RESILIENCE, HEDGE)
+        self.resilience = resilience_from_env(self.latency)
+
+        # Кэш ответов GET /booking/{id} с условными запросами (HTTP_CACHE=on)
+        self.http_cache = http_cache_from_env()
+
+        # Токен и общий (между процессами) кэш токенов
+        self.token = None
+        self.token_cache = token_cache_from_env()
+        self._token_lock = threading.Lock()
+
         logger.info(f"✅ Клиент создан для окружения: {self.environment.value}")
         logger.debug(f"Базовый URL: {self.base_url}")
 
@@ -55,10 +112,12 @@ class APIClient:
             return os.getenv('TEST_BASE_URL')
         elif self.environment == Environment.PROD:
             return os.getenv('PROD_BASE_URL')
+        elif self.environment == Environment.LOCAL:
+            return os.getenv('LOCAL_BASE_URL')
         else:
             raise ValueError(f'Неподдерживаемое окружение: {self.environment}')
 
-    def _request(self, method, endpoint, **kwargs):
+    def _request(self, method, endpoint, retry_auth=True, **kwargs):
         '''УНИВЕРСАЛЬНЫЙ МЕТОД ДЛЯ ВСЕХ ЗАПРОСОВ.
 
         ПРОСТОЕ ОБЪЯСНЕНИЕ:
@@ -68,21 +127,47 @@ class APIClient:
         Аргументы:
             method: GET, POST, PUT, DELETE, PATCH
             endpoint: /ping, /booking и т.д.
+            retry_auth: при 403 один раз обновить токен и повторить запрос
             **kwargs: дополнительные параметры (json, params, auth)'''
 
         url = f"{self.base_url}{endpoint}"
 
+        # Политика эндпоинта: повторы, хеджирование, таймаут (core/clients/resilience.py)
+        key, policy = self.resilience.policy(method, endpoint)
+
         # Добавляем таймаут, если не указан
         if 'timeout' not in kwargs:
-            kwargs['timeout'] = self.timeout
+            kwargs['timeout'] = policy.timeout or self.timeout
 
         # ЛОГИРУЕМ ЗАПРОС (DEBUG уровень)
-        logger.debug(f"➡️ {method} {url}")
-        if 'json' in kwargs:
-            logger.debug(f"📦 Тело запроса: {kwargs['json']}")
+        # Это горячий путь: строки собираем, только если DEBUG включён,
+        # а параметры передаём через %s - logging подставит их сам и только при выводе
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("➡️ %s %s", method, url)
+            if 'json' in kwargs:
+                logger.debug("📦 Тело запроса: %s", kwargs['json'])
+
+        # Токен, с которым уходит запрос: при 403 отклонён именно он,
+        # а self.token к тому времени мог обновить другой поток
+        sent_token = self.token
+
+        # Отправляем запрос по политике: при ошибке сети идемпотентные запросы
+        # повторяются, а если сервер лежит - предохранитель сразу бросает CircuitOpenError
+        response = self.resilience.execute(key, policy, method, lambda: self._send(method, url, endpoint, kwargs))
+
+        # 403 - токен мог истечь: один раз обновляем его и повторяем запрос
+        if response.status_code == 403 and retry_auth and sent_token:
+            logger.warning("🔑 403 - обновляем токен и повторяем запрос")
+            response.close()  # Соединение первого ответа возвращаем в пул
+            self._refresh_token(sent_token)
+            return self._request(method, endpoint, retry_auth=False, **kwargs)
 
-        # Засекаем время
-        start_time = time.time()
+        return response
+
+    def _send(self, method, url, endpoint, kwargs):
+        '''Одна попытка запроса: отправка, время ответа и логи.'''
+        # Засекаем время (perf_counter - монотонные часы высокой точности)
+        start_time = time.perf_counter()
 
         try:
 
@@ -90,18 +175,24 @@ class APIClient:
             response = self.session.request(method, url, **kwargs)
 
             # Считаем время ответа
-            duration = time.time() - start_time
-
-            # ЛОГИРУЕМ ОТВЕТ (INFO уровень)
-            logger.info(f"✅ {method} {url} - {response.status_code} ({duration:.2f}с)")
-
-            # Если статус не 2xx, логируем предупреждение
-            if response.status_code >= 400:
-                logger.warning(f"⚠️ Ошибка: {response.status_code}")
-                logger.debug(f"Тело ошибки: {response.text[:200]}")
-
-            return response
-
+            duration = time.perf_counter() - start_time
+            self.latency.record(method, endpoint, duration)
+
+            # ЛОГИРУЕМ ОТВЕТ (INFO уровень; в режиме горячего пути - с ограничением частоты)
+            if hot_path_enabled(logger):
+                logger.info(
+                    "✅ %s %s - %s (%.2fс)", method, url, response.status_code, duration,
+                    extra={'method': method, 'endpoint': endpoint,
+                           'status': response.status_code, 'duration': duration}
+                )
+
+            # Если статус не 2xx, логируем предупреждение. Это тоже строка на запрос:
+            # под фаззингом или нагрузкой с ошибками их тысячи, поэтому с тем же ограничением
+            if response.status_code >= 400 and hot_path_enabled(logger, logging.WARNING):
+                logger.warning("⚠️ Ошибка: %s", response.status_code)
+                if logger.isEnabledFor(logging.DEBUG):
+                    # Первые 200 байт, а не response.text - он декодирует всё тело
+                    logger.debug("Тело ошибки: %r", response.content[:200])
 
         except requests.exceptions.Timeout:
             logger.error(f"⏰ Таймаут: {method} {url} (ждали {kwargs['timeout']}с)")
@@ -113,66 +204,284 @@ class APIClient:
             logger.error(f"💥 Неожиданная ошибка: {method} {url} - {e}")
             raise
 
-    # === МЕТОДЫ API ===
+        return response
 
-    def ping(self):
-        '''Проверка доступности сервера.'''
-        logger.info("🏓 Проверка соединения (ping)")
-        return self._request('GET', Endpoints.PING_ENDPOINT.value)
+    # === ТОКЕН ===
 
-    def auth(self):
-        '''Аутентификация и получение токена.'''
-        logger.info("🔑 Аутентификация...")
+    @property
+    def _token_key(self):
+        '''Ключ в кэше токенов: один токен на сервер и пользователя.'''
+        return f'{self.base_url}|{Users.USERNAME.value}'
+
+    def _set_token(self, token):
+        if token:
+            self.token = token
+            self.session.headers.update({'Cookie': f'token={token}'})
+
+    def _fetch_token(self):
+        '''Запрос к /auth за новым токеном.'''
         payload = {
             'username': Users.USERNAME.value,
             'password': Users.PASSWORD.value
         }
-        response = self._request('POST', Endpoints.AUTH_ENDPOINT.value, json=payload)
+        response = self._request('POST', Endpoints.AUTH_ENDPOINT.value, retry_auth=False, json=payload)
         token = response.json().get('token')
         if token:
-            self.session.headers.update({'Cookie': f'token={token}'})
+            self._set_token(token)
             logger.info("✅ Токен получен")
         else:
             logger.debug("ℹ️ Токен не требуется или не получен")  # 👈 DEBUG вместо ERROR
 
         return response
 
+    def _basic_auth(self):
+        '''Basic auth для PUT/DELETE или None, если логин и пароль не заданы
+        (тогда запрос идёт только с токеном из cookie).'''
+        if Users.USERNAME.value is None or Users.PASSWORD.value is None:
+            return None
+        return HTTPBasicAuth(Users.USERNAME.value, Users.PASSWORD.value)
+
+    def _refresh_token(self, rejected_token):
+        '''Заменяет токен, который отклонил сервер.
+
+        Из кэша убирается только rejected_token: новый токен, который туда уже
+        положил другой клиент или воркер, остаётся, и auth() возьмёт его без /auth.
+        Если этот клиент уже обновил токен в другом потоке - просто повторяем запрос.'''
+        with self._token_lock:
+            if self.token != rejected_token:
+                return
+            if self.token_cache is not None:
+                self.token_cache.invalidate(self._token_key, rejected_token)
+            self.auth()
+
+    def close(self):
+        '''Закрывает сессию (соединения) и потоки хеджирования.'''
+        self.resilience.close()
+        self.session.close()
+
+    # === МЕТОДЫ API ===
+
+    def ping(self):
+        '''Проверка доступности сервера.'''
+        if hot_path_enabled(logger):
+            logger.info("🏓 Проверка соединения (ping)")
+        return self._request('GET', Endpoints.PING_ENDPOINT.value)
+
+    def auth(self, use_cache=True):
+        '''Аутентификация и получение токена.
+
+        С кэшем токенов (включён по умолчанию, TOKEN_CACHE=off - выключить)
+        токен берётся из общего файла, пока он не истёк. Тогда запроса
+        к /auth нет и метод возвращает None, иначе - ответ /auth.
+
+        Аргументы:
+            use_cache: False - всегда ходить в /auth'''
+        logger.info("🔑 Аутентификация...")
+        if not use_cache or self.token_cache is None:
+            return self._fetch_token()
+
+        responses = []
+
+        def fetch():
+            responses.append(self._fetch_token())
+            return self.token
+
+        self._set_token(self.token_cache.get_or_fetch(self._token_key, fetch))
+        return responses[0] if responses else None
+
     def create_booking(self, booking_data):
-        '''Создание бронирования.'''
-        logger.info("📝 Создание нового бронирования")
-        response = self._request('POST', Endpoints.BOOKING_ENDPOINT.value, json=booking_data)
+        '''Создание бронирования.
+
+        Аргументы:
+            booking_data: словарь или готовое JSON-тело в bytes (например, из batch_json)'''
+        if hot_path_enabled(logger):
+            logger.info("📝 Создание нового бронирования")
+        body = {'data': booking_data} if isinstance(booking_data, bytes) else {'json': booking_data}
+        response = self._request('POST', Endpoints.BOOKING_ENDPOINT.value, **body)
         response.raise_for_status()
         return response
 
     def get_booking_by_id(self, booking_id):
         '''Получение бронирования по ID.'''
-        logger.info(f"🔍 Получение бронирования ID: {booking_id}")
+        if hot_path_enabled(logger):
+            logger.info("🔍 Получение бронирования ID: %s", booking_id)
         endpoint = f'{Endpoints.BOOKING_ENDPOINT.value}/{booking_id}'
-        response = self._request('GET', endpoint)
+        if self.http_cache is None:
+            response = self._request('GET', endpoint)
+        else:
+            response = self._cached_get(endpoint)
         response.raise_for_status()
         return response
 
+    def _cached_get(self, endpoint):
+        '''GET через кэш: если ответ уже есть - условный запрос, на 304 ответ берётся из кэша.'''
+        url = f"{self.base_url}{endpoint}"
+        entry = self.http_cache.lookup(url)
+        if entry is None:
+            response = self._request('GET', endpoint)
+        else:
+            response = self._request('GET', endpoint, headers=entry.conditional_headers())
+            if response.status_code == 304:
+                return self.http_cache.response_from(entry, response)
+        self.http_cache.store(url, response)
+        return response
+
+    def _invalidate_cached(self, endpoint):
+        if self.http_cache is not None:
+            self.http_cache.invalidate(f"{self.base_url}{endpoint}")
+
     def update_booking(self, booking_id, booking_data):
         '''Полное обновление бронирования.'''
-        logger.info(f"📝 Обновление бронирования ID: {booking_id}")
+        if hot_path_enabled(logger):
+            logger.info("📝 Обновление бронирования ID: %s", booking_id)
         endpoint = f"{Endpoints.BOOKING_ENDPOINT.value}/{booking_id}"
-        response =  self._request(
-            'PUT',
-            endpoint,
-            json=booking_data,
-            auth=HTTPBasicAuth(Users.USERNAME.value, Users.PASSWORD.value)
-        )
+        try:
+            response = self._request(
+                'PUT',
+                endpoint,
+                json=booking_data,
+                auth=self._basic_auth()
+            )
+        finally:
+            self._invalidate_cached(endpoint)
         response.raise_for_status()
         return response
 
     def delete_booking(self, booking_id):
         '''Удаление бронирования.'''
-        logger.info(f"🗑️ Удаление бронирования ID: {booking_id}")
+        if hot_path_enabled(logger):
+            logger.info("🗑️ Удаление бронирования ID: %s", booking_id)
         endpoint = f"{Endpoints.BOOKING_ENDPOINT.value}/{booking_id}"
-        response = self._request(
-            'DELETE',
-            endpoint,
-            auth=HTTPBasicAuth(Users.USERNAME.value, Users.PASSWORD.value)
-        )
+        try:
+            response = self._request(
+                'DELETE',
+                endpoint,
+                auth=self._basic_auth()
+            )
+        finally:
+            self._invalidate_cached(endpoint)
         response.raise_for_status()
         return response
+
+    # === ТИПИЗИРОВАННЫЕ МЕТОДЫ ===
+    # Возвращают сразу модели pydantic. Ответ проверяется прямо из байтов
+    # (response.content), без json() и без второго прохода по dict.
+
+    def create_booking_typed(self, booking_data):
+        '''Создание бронирования -> BookingResponse.'''
+        response = self.create_booking(booking_data)
+        return models.booking_response_adapter.validate_json(response.content)
+
+    def get_booking_typed(self, booking_id):
+        '''Получение бронирования по ID -> Booking.'''
+        response = self.get_booking_by_id(booking_id)
+        return models.booking_adapter.validate_json(response.content)
+
+    def get_booking_ids_typed(self, **filters):
+        '''Список бронирований (GET /booking) -> list[BookingId].
+
+        Аргументы:
+            **filters: firstname, lastname, checkin, checkout'''
+        logger.info(f"📋 Получение списка бронирований {filters or ''}")
+        response = self._request('GET', Endpoints.BOOKING_ENDPOINT.value, params=filters or None)
+        response.raise_for_status()
+        return models.booking_ids_adapter.validate_json(response.content)
+
+    # === ПОТОКОВЫЙ СПИСОК ===
+
+    def list_bookings(self, fetch=False, batch_size=Streaming.FETCH_BATCH.value, **filters):
+        '''Генератор ID бронирований из GET /booking с фильтрами.
+
+        Ответ читается кусками (stream=True) и разбирается по мере прихода,
+        поэтому память не зависит от числа бронирований на сервере.
+
+        Аргументы:
+            fetch: True - отдавать пары (booking_id, Booking): полные записи
+                   загружаются параллельно, не больше batch_size одновременно
+            batch_size: сколько бронирований загружается одновременно при fetch=True
+            **filters: firstname, lastname, checkin, checkout'''
+        booking_ids = self._iter_booking_ids(filters)
+        if fetch:
+            return self._fetch_bookings(booking_ids, batch_size)
+        return booking_ids
+
+    def _iter_booking_ids(self, filters):
+        logger.info(f"📋 Потоковое получение списка бронирований {filters or ''}")
+        response = self._request('GET', Endpoints.BOOKING_ENDPOINT.value, params=filters or None, stream=True)
+        try:
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=Streaming.CHUNK_SIZE.value)
+            for item in iter_json_array(chunks, response.encoding or 'utf-8'):
+                yield item['bookingid']
+        finally:
+            # Возвращаем соединение в пул, даже если генератор бросили на середине
+            response.close()
+
+    def _fetch_bookings(self, booking_ids, batch_size):
+        '''Загружает полные записи по мере прихода ID, сохраняя порядок.'''
+        workers = min(self.max_workers, batch_size)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+
+            def drain():
+                booking_id, future = pending.popleft()
+                try:
+                    response = future.result()
+                except requests.exceptions.RequestException as e:
+                    # Бронирование могли удалить, пока мы читали список
+                    logger.warning(f"⚠️ Не удалось получить бронирование {booking_id}: {e}")
+                    return
+                yield booking_id, models.booking_adapter.validate_json(response.content)
+
+            for booking_id in booking_ids:
+                pending.append((booking_id, executor.submit(self.get_booking_by_id, booking_id)))
+                if len(pending) >= batch_size:
+                    yield from drain()
+            while pending:
+                yield from drain()
+
+    # === МАССОВЫЕ ОПЕРАЦИИ ===
+
+    def _bulk(self, operation, items, unpack=False):
+        '''Выполняет operation для каждого элемента items в пуле потоков.
+
+        Результаты возвращаются в том же порядке, что и items.
+        Ошибка одного запроса не останавливает остальные -
+        она просто попадает в BulkResult.error.'''
+        items = list(items)
+        if not items:
+            return []
+
+        def run(item):
+            try:
+                response = operation(*item) if unpack else operation(item)
+                return BulkResult(item=item, response=response)
+            except Exception as e:
+                return BulkResult(item=item, error=e)
+
+        workers = min(self.max_workers, len(items))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run, items))
+
+        failed = sum(1 for result in results if not result.ok)
+        logger.info(f"📦 Массовая операция: {len(results)} запросов, ошибок: {failed}")
+        return results
+
+    def create_bookings(self, bookings_data):
+        '''Создание нескольких бронирований параллельно.'''
+        return self._bulk(self.create_booking, bookings_data)
+
+    def get_bookings(self, booking_ids):
+        '''Получение нескольких бронирований по ID параллельно.'''
+        return self._bulk(self.get_booking_by_id, booking_ids)
+
+    def update_bookings(self, updates):
+        '''Обновление нескольких бронирований параллельно.
+
+        Аргументы:
+            updates: пары (booking_id, booking_data)'''
+        return self._bulk(self.update_booking, updates, unpack=True)
+
+    def delete_bookings(self, booking_ids):
+        '''Удаление нескольких бронирований параллельно.'''
+        return self._bulk(self.delete_booking, booking_ids)
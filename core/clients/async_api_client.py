@@ -0,0 +1,332 @@
+'''Асинхронный клиент для работы с API.
+
+Делает то же самое, что и APIClient, но на asyncio (через httpx).
+Пока один запрос ждёт ответа от сервера, другие уже отправляются -
+так один процесс держит в полёте сотни запросов, а не один.
+
+Методы и ошибки такие же, как у APIClient:
+- timeout -> requests.exceptions.Timeout
+- нет соединения -> requests.exceptions.ConnectionError
+- статус 4xx/5xx -> requests.exceptions.HTTPError (с .response внутри)
+Поэтому тесты могут проверять оба клиента одинаково.'''
+
+import asyncio
+import os
+import time
+import httpx
+import requests
+from core.settings.environments import Environment, load_env
+from core.clients.endpoints import Endpoints
+from core.settings.config import Users, Timeouts, Limits
+from core.metrics.latency import registry
+from core.logs.pipeline import hot_path_enabled
+from core.clients.async_cassette import async_transport_from_env
+from core.clients.token_cache import token_cache_from_env
+from core.clients.resilience import resilience_from_env
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAPIClient:
+    '''Асинхронный клиент для API.'''
+    def __init__(self, max_concurrency=Limits.MAX_CONCURRENCY.value, latency=None, environment=None, base_url=None):
+        '''Инициализация клиента.
+
+        Аргументы:
+            max_concurrency: сколько запросов может быть "в полёте" одновременно.
+                             Остальные ждут своей очереди на семафоре.
+            latency: LatencyRegistry для времени ответа (по умолчанию - общий)
+            environment: имя окружения (TEST, PROD, LOCAL), по умолчанию - ENVIRONMENT
+            base_url: свой базовый URL вместо URL окружения (например, реплика стенда)'''
+        # Загружаем переменные из .env (при первом создании клиента)
+        load_env()
+
+        # Определяем окружение (test или prod)
+        environment_str = environment or os.getenv('ENVIRONMENT', 'PROD')
+        try:
+            self.environment = Environment[environment_str.upper()]
+        except KeyError:
+            error_msg = f'Неподдерживаемое окружение: {environment_str}'
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        # Получаем базовый URL
+        self.base_url = base_url or self._get_base_url()
+
+        # Таймаут по умолчанию
+        self.timeout = Timeouts.DEFAULT.value
+
+        # Куда записываем время ответа каждого запроса
+        self.latency = latency if latency is not None else registry
+
+        # Повторы, предохранитель и хеджирование (RESILIENCE, HEDGE)
+        self.resilience = resilience_from_env(self.latency)
+
+        # Семафор ограничивает число одновременных запросов
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Создаём сессию. Пул соединений - по размеру семафора,
+        # чтобы запросы не ждали свободного соединения
+        self.session = httpx.AsyncClient(
+            headers={
+                'Content-Type': 'application/json',
+                "Accept": "application/json"
+            },
+            # С CASSETTE_MODE=record/replay транспорт пишет/отдаёт ответы из кассеты
+            transport=async_transport_from_env(limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency
+            ))
+        )
+
+        # Токен и общий с APIClient (и между процессами) кэш токенов
+        self.token = None
+        self.token_cache = token_cache_from_env()
+        self._token_lock = asyncio.Lock()
+
+        logger.info(f"✅ Асинхронный клиент создан для окружения: {self.environment.value}")
+        logger.debug(f"Базовый URL: {self.base_url}, одновременных запросов: {max_concurrency}")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        '''Закрывает сессию и все соединения.'''
+        await self.session.aclose()
+
+    def _get_base_url(self):
+        '''Получает URL в зависимости от окружения.'''
+        if self.environment == Environment.TEST:
+            return os.getenv('TEST_BASE_URL')
+        elif self.environment == Environment.PROD:
+            return os.getenv('PROD_BASE_URL')
+        elif self.environment == Environment.LOCAL:
+            return os.getenv('LOCAL_BASE_URL')
+        else:
+            raise ValueError(f'Неподдерживаемое окружение: {self.environment}')
+
+    @staticmethod
+    def _raise_for_status(response):
+        '''Аналог response.raise_for_status() из requests.
+
+        Бросает requests.exceptions.HTTPError, чтобы тесты
+        ловили одну и ту же ошибку для обоих клиентов.'''
+        if response.status_code >= 400:
+            kind = 'Client Error' if response.status_code < 500 else 'Server Error'
+            raise requests.exceptions.HTTPError(
+                f'{response.status_code} {kind}: {response.reason_phrase} for url: {response.url}',
+                response=response
+            )
+
+    async def _request(self, method, endpoint, retry_auth=True, **kwargs):
+        '''Универсальный метод для всех запросов (асинхронная версия).
+
+        Аргументы:
+            method: GET, POST, PUT, DELETE, PATCH
+            endpoint: /ping, /booking и т.д.
+            retry_auth: при 403 один раз обновить токен и повторить запрос
+            **kwargs: дополнительные параметры (json, params, auth)'''
+
+        url = f"{self.base_url}{endpoint}"
+
+        # Политика эндпоинта: повторы, хеджирование, таймаут (core/clients/resilience.py)
+        key, policy = self.resilience.policy(method, endpoint)
+
+        # Добавляем таймаут, если не указан
+        if 'timeout' not in kwargs:
+            kwargs['timeout'] = policy.timeout or self.timeout
+
+        # ЛОГИРУЕМ ЗАПРОС (DEBUG уровень)
+        # Это горячий путь: строки собираем, только если DEBUG включён,
+        # а параметры передаём через %s - logging подставит их сам и только при выводе
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("➡️ %s %s", method, url)
+            if 'json' in kwargs:
+                logger.debug("📦 Тело запроса: %s", kwargs['json'])
+
+        # Токен, с которым уходит запрос (как в APIClient)
+        sent_token = self.token
+
+        # Отправляем запрос по политике (повторы, предохранитель, хеджирование GET)
+        response = await self.resilience.execute_async(
+            key, policy, method, lambda: self._send(method, url, endpoint, kwargs)
+        )
+
+        # 403 - токен мог истечь: один раз обновляем его и повторяем запрос
+        if response.status_code == 403 and retry_auth and sent_token:
+            logger.warning("🔑 403 - обновляем токен и повторяем запрос")
+            await response.aclose()
+            await self._refresh_token(sent_token)
+            return await self._request(method, endpoint, retry_auth=False, **kwargs)
+
+        return response
+
+    async def _send(self, method, url, endpoint, kwargs):
+        '''Одна попытка запроса: отправка, время ответа и логи.'''
+        # Ждём своей очереди, если уже max_concurrency запросов в полёте
+        async with self._semaphore:
+            # Засекаем время (perf_counter - монотонные часы высокой точности)
+            start_time = time.perf_counter()
+
+            try:
+
+                # Отправляем запрос
+                response = await self.session.request(method, url, **kwargs)
+
+                # Считаем время ответа
+                duration = time.perf_counter() - start_time
+                self.latency.record(method, endpoint, duration)
+
+                # ЛОГИРУЕМ ОТВЕТ (INFO уровень; в режиме горячего пути - с ограничением частоты)
+                if hot_path_enabled(logger):
+                    logger.info(
+                        "✅ %s %s - %s (%.2fс)", method, url, response.status_code, duration,
+                        extra={'method': method, 'endpoint': endpoint,
+                               'status': response.status_code, 'duration': duration}
+                    )
+
+                # Если статус не 2xx, логируем предупреждение. Это тоже строка на запрос:
+                # под фаззингом или нагрузкой с ошибками их тысячи, поэтому с тем же ограничением
+                if response.status_code >= 400 and hot_path_enabled(logger, logging.WARNING):
+                    logger.warning("⚠️ Ошибка: %s", response.status_code)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        # Первые 200 байт, а не response.text - он декодирует всё тело
+                        logger.debug("Тело ошибки: %r", response.content[:200])
+
+                return response
+
+            except httpx.TimeoutException as e:
+                logger.error(f"⏰ Таймаут: {method} {url} (ждали {kwargs['timeout']}с)")
+                raise requests.exceptions.Timeout(str(e)) from e
+            except httpx.TransportError as e:
+                logger.error(f"🔌 Ошибка соединения: {method} {url} - {e}")
+                raise requests.exceptions.ConnectionError(str(e)) from e
+            except Exception as e:
+                logger.error(f"💥 Неожиданная ошибка: {method} {url} - {e}")
+                raise
+
+    # === ТОКЕН ===
+
+    @property
+    def _token_key(self):
+        '''Ключ в кэше токенов - тот же, что у APIClient: токен общий для обоих клиентов.'''
+        return f'{self.base_url}|{Users.USERNAME.value}'
+
+    def _set_token(self, token):
+        if token:
+            self.token = token
+            self.session.headers.update({'Cookie': f'token={token}'})
+
+    async def _fetch_token(self):
+        '''Запрос к /auth за новым токеном.'''
+        payload = {
+            'username': Users.USERNAME.value,
+            'password': Users.PASSWORD.value
+        }
+        response = await self._request('POST', Endpoints.AUTH_ENDPOINT.value, retry_auth=False, json=payload)
+        token = response.json().get('token')
+        if token:
+            self._set_token(token)
+            logger.info("✅ Токен получен")
+        else:
+            logger.debug("ℹ️ Токен не требуется или не получен")
+
+        return response
+
+    async def _refresh_token(self, rejected_token):
+        '''Заменяет токен, который отклонил сервер (см. APIClient._refresh_token).'''
+        async with self._token_lock:
+            if self.token != rejected_token:
+                return
+            if self.token_cache is not None:
+                await asyncio.to_thread(self.token_cache.invalidate, self._token_key, rejected_token)
+            await self.auth()
+
+    # === МЕТОДЫ API ===
+
+    async def ping(self):
+        '''Проверка доступности сервера.'''
+        if hot_path_enabled(logger):
+            logger.info("🏓 Проверка соединения (ping)")
+        return await self._request('GET', Endpoints.PING_ENDPOINT.value)
+
+    async def auth(self, use_cache=True):
+        '''Аутентификация и получение токена.
+
+        Кэш токенов - как у APIClient: пока токен в общем файле не истёк,
+        запроса к /auth нет и метод возвращает None, иначе - ответ /auth.
+        Файл кэша блокируется надолго (пока другой процесс ходит в /auth),
+        поэтому с ним работаем в отдельном потоке, а сам запрос к /auth
+        из этого потока выполняется в event loop клиента.
+
+        Аргументы:
+            use_cache: False - всегда ходить в /auth'''
+        logger.info("🔑 Аутентификация...")
+        if not use_cache or self.token_cache is None:
+            return await self._fetch_token()
+
+        loop = asyncio.get_running_loop()
+        responses = []
+
+        def fetch():
+            responses.append(asyncio.run_coroutine_threadsafe(self._fetch_token(), loop).result())
+            return self.token
+
+        self._set_token(await asyncio.to_thread(self.token_cache.get_or_fetch, self._token_key, fetch))
+        return responses[0] if responses else None
+
+    async def create_booking(self, booking_data):
+        '''Создание бронирования.'''
+        if hot_path_enabled(logger):
+            logger.info("📝 Создание нового бронирования")
+        response = await self._request('POST', Endpoints.BOOKING_ENDPOINT.value, json=booking_data)
+        self._raise_for_status(response)
+        return response
+
+    async def get_booking_by_id(self, booking_id):
+        '''Получение бронирования по ID.'''
+        if hot_path_enabled(logger):
+            logger.info("🔍 Получение бронирования ID: %s", booking_id)
+        endpoint = f'{Endpoints.BOOKING_ENDPOINT.value}/{booking_id}'
+        response = await self._request('GET', endpoint)
+        self._raise_for_status(response)
+        return response
+
+    def _basic_auth(self):
+        '''Basic auth для PUT/DELETE или None, если логин и пароль не заданы
+        (тогда запрос идёт только с токеном из cookie).'''
+        if Users.USERNAME.value is None or Users.PASSWORD.value is None:
+            return None
+        return httpx.BasicAuth(Users.USERNAME.value, Users.PASSWORD.value)
+
+    async def update_booking(self, booking_id, booking_data):
+        '''Полное обновление бронирования.'''
+        if hot_path_enabled(logger):
+            logger.info("📝 Обновление бронирования ID: %s", booking_id)
+        endpoint = f"{Endpoints.BOOKING_ENDPOINT.value}/{booking_id}"
+        response = await self._request(
+            'PUT',
+            endpoint,
+            json=booking_data,
+            auth=self._basic_auth()
+        )
+        self._raise_for_status(response)
+        return response
+
+    async def delete_booking(self, booking_id):
+        '''Удаление бронирования.'''
+        if hot_path_enabled(logger):
+            logger.info("🗑️ Удаление бронирования ID: %s", booking_id)
+        endpoint = f"{Endpoints.BOOKING_ENDPOINT.value}/{booking_id}"
+        response = await self._request(
+            'DELETE',
+            endpoint,
+            auth=self._basic_auth()
+        )
+        self._raise_for_status(response)
+        return response
@@ -0,0 +1,47 @@
+'''Кассеты для AsyncAPIClient (транспорт httpx).
+
+Отдельно от core/clients/cassette.py, чтобы синхронный клиент
+и плагины pytest не загружали httpx. Формат кассеты и ключи - те же.'''
+
+import httpx
+from core.clients.cassette import _stored_headers, cassette_from_env, request_key
+
+
+class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+    '''Как CassetteAdapter, только для AsyncAPIClient (транспорт httpx).
+
+    Аргументы:
+        cassette: Cassette
+        transport: настоящий транспорт для режима record'''
+    def __init__(self, cassette, transport):
+        self.cassette = cassette
+        self.transport = transport
+
+    async def handle_async_request(self, request):
+        body = await request.aread()
+        key = request_key(request.method, str(request.url), body)
+        if self.cassette.mode == 'replay':
+            status, reason, headers, content = self.cassette.lookup(key, f'{request.method} {request.url}')
+            return httpx.Response(status, headers=headers, content=content, request=request,
+                                  extensions={'reason_phrase': reason.encode('ascii', 'replace')})
+        response = await self.transport.handle_async_request(request)
+        content = await response.aread()
+        reason = response.extensions.get('reason_phrase', b'').decode('ascii', 'replace')
+        self.cassette.append(key, response.status_code, reason, response.headers, content)
+        return httpx.Response(response.status_code, headers=_stored_headers(response.headers), content=content,
+                              request=request, extensions=response.extensions)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def async_transport_from_env(**kwargs):
+    '''Транспорт для httpx: с кассетой, если она включена, иначе обычный.
+
+    Аргументы:
+        **kwargs: параметры httpx.AsyncHTTPTransport (limits)'''
+    transport = httpx.AsyncHTTPTransport(**kwargs)
+    cassette = cassette_from_env()
+    if cassette is None:
+        return transport
+    return AsyncCassetteTransport(cassette, transport)
@@ -0,0 +1,108 @@
+'''Пул заранее созданных бронирований.
+
+Тестам, которым нужно существующее бронирование, больше не надо
+создавать его самим: пул в начале сессии создаёт N бронирований
+параллельно, а тесты берут их "в аренду":
+- exclusive - бронирование только для этого теста (можно менять и удалять),
+  обратно в пул оно не возвращается;
+- shared - бронирование для чтения, одно на несколько тестов.
+В конце сессии всё, что пул создал, удаляется параллельно.'''
+
+import itertools
+import threading
+from dataclasses import dataclass
+from core.data.booking_data import random_booking_data
+from core.settings.config import Pool
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BookingLease:
+    '''Арендованное бронирование: ID и данные, с которыми оно создано.'''
+    booking_id: int
+    booking_data: dict
+
+
+class BookingPool:
+    '''Пул бронирований поверх APIClient.
+
+    Аргументы:
+        client: APIClient
+        size: сколько бронирований создать заранее
+        max_shared: сколько бронирований делят тесты "только для чтения"
+        payload_factory: функция, возвращающая данные нового бронирования'''
+    def __init__(self, client, size=Pool.SIZE.value, max_shared=Pool.MAX_SHARED.value,
+                 payload_factory=random_booking_data):
+        self.client = client
+        self.size = size
+        self.max_shared = max_shared
+        self.payload_factory = payload_factory
+        self._lock = threading.Lock()
+        self._free = []
+        self._shared = []
+        self._shared_cycle = None
+        self._created = []
+
+    def _create(self, bookings_data):
+        '''Создаёт бронирования параллельно, возвращает успешные аренды.'''
+        leases = []
+        for result in self.client.create_bookings(bookings_data):
+            if result.ok:
+                lease = BookingLease(result.response.json()['bookingid'], result.item)
+                leases.append(lease)
+            else:
+                logger.warning(f"⚠️ Пул: не удалось создать бронирование - {result.error}")
+        with self._lock:
+            self._created.extend(lease.booking_id for lease in leases)
+        return leases
+
+    def fill(self):
+        '''Создаёт size бронирований заранее.'''
+        leases = self._create(self.payload_factory() for _ in range(self.size))
+        with self._lock:
+            self._free.extend(leases)
+        logger.info(f"🏊 Пул бронирований: создано {len(leases)} из {self.size}")
+        return self
+
+    def lease_exclusive(self):
+        '''Бронирование только для одного теста. Если пул пуст - создаётся новое.'''
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+        leases = self._create([self.payload_factory()])
+        if not leases:
+            raise RuntimeError('Пул: не удалось создать бронирование')
+        return leases[0]
+
+    def lease_shared(self):
+        '''Бронирование для чтения. Тесты получают их по кругу.'''
+        with self._lock:
+            if len(self._shared) < self.max_shared:
+                lease = self._free.pop() if self._free else None
+                if lease is not None:
+                    self._shared.append(lease)
+                    self._shared_cycle = itertools.cycle(list(self._shared))
+                    return lease
+            if self._shared:
+                return next(self._shared_cycle)
+        # Пул пуст и общих ещё нет - берём новое и делаем его общим
+        lease = self.lease_exclusive()
+        with self._lock:
+            self._shared.append(lease)
+            self._shared_cycle = itertools.cycle(list(self._shared))
+        return lease
+
+    def cleanup(self):
+        '''Удаляет параллельно все бронирования, созданные пулом.
+
+        Ошибки (например, тест уже удалил бронирование сам) только логируются.'''
+        with self._lock:
+            booking_ids, self._created = self._created, []
+            self._free, self._shared, self._shared_cycle = [], [], None
+        results = self.client.delete_bookings(booking_ids)
+        failed = [result.item for result in results if not result.ok]
+        logger.info(f"🧹 Пул бронирований: удалено {len(results) - len(failed)} из {len(results)}")
+        if failed:
+            logger.debug(f"Не удалось удалить: {failed}")
@@ -0,0 +1,257 @@
+'''Кассеты: запись и воспроизведение ответов API без сети.
+
+Работает на уровне транспорта (HTTPAdapter для requests, AsyncBaseTransport
+для httpx - он в core/clients/async_cassette.py), то есть прямо под _request - сами клиенты и тесты ничего не замечают.
+Режимы (переменная CASSETTE_MODE или опция pytest --cassette-mode):
+    off    - обычная работа через сеть
+    record - запросы идут в сеть, ответы дописываются в кассету
+    replay - ответы берутся из кассеты, сеть не нужна
+
+Ключ записи: sha256 от метода, схемы и имени хоста, пути, параметров и
+канонического JSON тела (порядок полей не важен). Хост в ключе - чтобы
+записи разных стендов (--targets) не смешивались; порт не входит в ключ,
+потому что локальный сервер каждый раз слушает на новом свободном порту. Один и тот же ключ может встретиться несколько раз
+(например, два одинаковых POST /booking) - ответы отдаются в том же порядке.
+
+Кассета - это два файла, в которые только дописывают:
+    <path>.data - записи: заголовок (JSON) + тело ответа
+    <path>.idx  - индекс: ключ (32 байта) + смещение + длина записи
+При воспроизведении оба файла открываются через mmap, индекс разбирается
+при первом запросе, а тела ответов читаются только когда нужны.
+
+Запись идёт во временные файлы процесса (<path>.data.<pid>.tmp), которые
+заменяют кассету только при закрытии (close_cassettes, вызывается и при
+выходе из процесса). Упавший на середине прогон не портит готовую кассету.'''
+
+import atexit
+
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import threading
+from datetime import timedelta
+from urllib.parse import urlsplit, parse_qsl
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from core.settings.config import Cassettes
+import logging
+
+logger = logging.getLogger(__name__)
+
+MODES = Cassettes.MODES.value
+DEFAULT_PATH = Cassettes.DEFAULT_PATH.value
+
+_INDEX_ENTRY = struct.Struct('>32sQI')  # ключ, смещение, длина
+_RECORD_HEADER = struct.Struct('>II')  # длина заголовка, длина тела
+
+# Тело хранится уже распакованным, поэтому эти заголовки больше не верны
+_SKIP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+def _stored_headers(headers):
+    return {name: value for name, value in headers.items() if name.lower() not in _SKIP_HEADERS}
+
+
+class CassetteMissError(requests.exceptions.ConnectionError):
+    '''В кассете нет ответа на такой запрос (в режиме replay сети нет).'''
+
+
+def request_key(method, url, body):
+    '''Ключ запроса. Зависит от схемы и хоста (без порта), не зависит от порядка полей в JSON и параметров.'''
+    parts = urlsplit(url)
+    if isinstance(body, bytes):
+        body = body.decode('utf-8')
+    try:
+        body = json.loads(body) if body else None
+    except ValueError:
+        pass  # Не JSON - хэшируем как есть
+    canonical = json.dumps(
+        [method.upper(), parts.scheme, parts.hostname, parts.path, sorted(parse_qsl(parts.query)), body],
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).digest()
+
+
+class Cassette:
+    '''Файлы кассеты: запись ответов и поиск по ключу.
+
+    Используйте get_cassette() - она отдаёт один объект на путь,
+    чтобы синхронный и асинхронный клиенты писали в одни файлы.'''
+    def __init__(self, path, mode):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f'Неподдерживаемый режим кассеты: {mode}')
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._closed = False
+
+        if mode == 'record':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            # Каждая запись начинается с чистой кассеты, но старая заменяется только в close()
+            self._data_file = open(self._temp_path('data'), 'wb')
+            self._index_file = open(self._temp_path('idx'), 'wb')
+        else:
+            self._data_map = self._open_map(f'{path}.data')
+            self._index_map = self._open_map(f'{path}.idx')
+            self._index = None
+            self._cursors = {}
+        logger.info(f"📼 Кассета {path}: режим {mode}")
+
+    def _temp_path(self, suffix):
+        return f'{self.path}.{suffix}.{os.getpid()}.tmp'
+
+    @staticmethod
+    def _open_map(path):
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b''
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def append(self, key, status, reason, headers, body):
+        '''Дописывает ответ в конец кассеты.'''
+        meta = json.dumps({
+            'status': status,
+            'reason': reason,
+            'headers': _stored_headers(headers),
+        }, separators=(',', ':')).encode('utf-8')
+        record = _RECORD_HEADER.pack(len(meta), len(body)) + meta + body
+        with self._lock:
+            offset = self._data_file.tell()
+            self._data_file.write(record)
+            self._data_file.flush()
+            self._index_file.write(_INDEX_ENTRY.pack(key, offset, len(record)))
+            self._index_file.flush()
+
+    def _load_index(self):
+        '''Ключ -> список (смещение, длина). Строится один раз, при первом запросе.'''
+        index = {}
+        for key, offset, length in _INDEX_ENTRY.iter_unpack(self._index_map):
+            index.setdefault(key, []).append((offset, length))
+        return index
+
+    def lookup(self, key, description):
+        '''Следующий записанный ответ для ключа: (status, reason, headers, body).
+
+        Ответы отдаются по порядку записи, последний - сколько угодно раз.'''
+        with self._lock:
+            if self._index is None:
+                self._index = self._load_index()
+            entries = self._index.get(key)
+            if not entries:
+                raise CassetteMissError(f'Нет записи в кассете {self.path} для {description}')
+            position = self._cursors.get(key, 0)
+            self._cursors[key] = position + 1
+            offset, length = entries[min(position, len(entries) - 1)]
+
+        meta_length, body_length = _RECORD_HEADER.unpack_from(self._data_map, offset)
+        start = offset + _RECORD_HEADER.size
+        meta = json.loads(self._data_map[start:start + meta_length])
+        body = bytes(self._data_map[start + meta_length:start + meta_length + body_length])
+        return meta['status'], meta['reason'], meta['headers'], body
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self.mode == 'record':
+            self._data_file.close()
+            self._index_file.close()
+            for suffix in ('data', 'idx'):
+                os.replace(self._temp_path(suffix), f'{self.path}.{suffix}')
+            logger.info(f"📼 Кассета {self.path} записана")
+        else:
+            for mapped in (self._data_map, self._index_map):
+                if isinstance(mapped, mmap.mmap):
+                    mapped.close()
+
+
+_cassettes = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette(path, mode):
+    '''Один объект Cassette на (путь, режим) на процесс.'''
+    with _cassettes_lock:
+        cassette = _cassettes.get((path, mode))
+        if cassette is None or cassette._closed:
+            cassette = _cassettes[(path, mode)] = Cassette(path, mode)
+        return cassette
+
+
+@atexit.register
+def close_cassettes():
+    '''Закрывает все кассеты процесса: записанные заменяют старые файлы.'''
+    with _cassettes_lock:
+        cassettes = list(_cassettes.values())
+        _cassettes.clear()
+    for cassette in cassettes:
+        cassette.close()
+
+
+def cassette_from_env():
+    '''Кассета по переменным окружения или None, если кассеты выключены:
+        CASSETTE_MODE - off / record / replay (по умолчанию off)
+        CASSETTE_PATH - путь к кассете (по умолчанию cassettes/booking)'''
+    mode = os.getenv('CASSETTE_MODE', 'off').lower()
+    if mode not in MODES:
+        raise ValueError(f'Неподдерживаемый режим кассеты: {mode}')
+    if mode == 'off':
+        return None
+    return get_cassette(os.getenv('CASSETTE_PATH', DEFAULT_PATH), mode)
+
+
+class CassetteAdapter(HTTPAdapter):
+    '''HTTPAdapter для requests с записью/воспроизведением ответов.
+
+    Аргументы:
+        cassette: Cassette
+        **kwargs: параметры HTTPAdapter (pool_connections, pool_maxsize)'''
+    def __init__(self, cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def _replay(self, key, request):
+        try:
+            status, reason, headers, body = self.cassette.lookup(key, f'{request.method} {request.url}')
+        except CassetteMissError as e:
+            e.request = request
+            raise
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(0)
+        # Тело уже целиком в памяти: и content, и iter_content (stream=True) отдают его
+        response.raw = io.BytesIO(body)
+        response._content = body
+        response._content_consumed = True
+        return response
+
+    def send(self, request, **kwargs):
+        key = request_key(request.method, request.url, request.body)
+        if self.cassette.mode == 'replay':
+            return self._replay(key, request)
+        response = super().send(request, **kwargs)
+        self.cassette.append(key, response.status_code, response.reason, response.headers, response.content)
+        return response
+
+
+def adapter_from_env(**kwargs):
+    '''Адаптер для requests: с кассетой, если она включена, иначе обычный.
+
+    Аргументы:
+        **kwargs: параметры HTTPAdapter (pool_connections, pool_maxsize)'''
+    cassette = cassette_from_env()
+    if cassette is None:
+        return HTTPAdapter(**kwargs)
+    return CassetteAdapter(cassette, **kwargs)
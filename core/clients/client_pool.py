@@ -0,0 +1,203 @@
+'''Пул клиентов для нескольких стендов (целей) в одной сессии.
+
+Цель - это окружение из Environment (URL из TEST_BASE_URL и т.д.)
+или любой базовый URL под своим именем, например реплика стенда:
+    TARGETS=TEST,PROD
+    TARGETS=TEST,staging-2=https://staging-2.example.com
+
+У каждой цели свой APIClient: свой пул соединений, свой токен и свой
+LatencyRegistry. Хук сессии requests считает статусы ответов по
+эндпоинтам, поэтому в конце можно положить цели рядом:
+    - какие статусы вернул каждый эндпоинт на каждой цели,
+    - p50/p99 по эндпоинтам и во сколько раз цель медленнее первой.
+
+Токены всех целей получаются параллельно (auth_all), а fan_out(operation)
+выполняет одну операцию на всех целях сразу - сравнение стендов занимает
+время самого медленного из них, а не сумму.'''
+
+import json
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+from core.clients.api_client import APIClient, BulkResult
+from core.metrics.latency import LatencyRegistry, endpoint_template
+from core.settings.config import Limits, Targets
+from core.settings.environments import Environment
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Target:
+    '''Цель: name - имя в отчётах и ID тестов, base_url - None для окружения из Environment.'''
+    name: str
+    base_url: Optional[str] = None
+
+
+def parse_targets(spec):
+    '''"TEST,PROD" или "TEST,replica=https://..." -> [Target].'''
+    targets = []
+    for part in spec.split(','):
+        name, has_url, url = (piece.strip() for piece in part.partition('='))
+        if not name:
+            continue
+        if has_url:
+            targets.append(Target(name, url.rstrip('/')))
+        elif name.upper() in Environment.__members__:
+            targets.append(Target(name.upper()))
+        else:
+            raise ValueError(f'Неизвестная цель: {name}. Окружения: {", ".join(Environment.__members__)} '
+                             f'или имя=URL')
+    names = [target.name for target in targets]
+    if len(set(names)) != len(names):
+        raise ValueError(f'Цели повторяются: {names}')
+    return targets
+
+
+class StatusCounter:
+    '''Статусы ответов по эндпоинтам одной цели.
+    Сам объект - хук response сессии requests, async_hook - то же для httpx.'''
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.statuses = defaultdict(Counter)
+        self._lock = threading.Lock()
+
+    def __call__(self, response, *args, **kwargs):
+        url = str(response.url)
+        endpoint = url[len(self.base_url):] if url.startswith(self.base_url) else urlsplit(url).path
+        key = f'{response.request.method} {endpoint_template(endpoint)}'
+        with self._lock:
+            self.statuses[key][response.status_code] += 1
+
+    async def async_hook(self, response):
+        self(response)
+
+
+class ClientPool:
+    '''По APIClient на каждую цель.
+
+    Аргументы:
+        targets: список Target
+        max_workers: потоки массовых операций каждого клиента'''
+    def __init__(self, targets, max_workers=Limits.BULK_WORKERS.value):
+        self.targets = list(targets)
+        self.clients = {}
+        self.latency = {}
+        self.statuses = {}
+        for target in self.targets:
+            latency = LatencyRegistry()
+            environment = target.name if target.base_url is None else None
+            client = APIClient(max_workers=max_workers, latency=latency,
+                               environment=environment, base_url=target.base_url)
+            counter = StatusCounter(client.base_url)
+            client.session.hooks['response'].append(counter)
+            self.clients[target.name] = client
+            self.latency[target.name] = latency
+            self.statuses[target.name] = counter
+        logger.info(f"🌐 Пул клиентов: {', '.join(f'{name} ({client.base_url})' for name, client in self.clients.items())}")
+
+    @property
+    def names(self):
+        return [target.name for target in self.targets]
+
+    def client(self, name):
+        return self.clients[name]
+
+    def async_client(self, name):
+        '''Новый AsyncAPIClient на ту же цель: время и статусы идут в отчёт цели.
+        Закрывать (aclose) - вызывающему.'''
+        from core.clients.async_api_client import AsyncAPIClient  # httpx - только если нужен
+        client = self.clients[name]
+        async_client = AsyncAPIClient(environment=client.environment.name, base_url=client.base_url,
+                                      latency=self.latency[name])
+        async_client.session.event_hooks['response'].append(self.statuses[name].async_hook)
+        return async_client
+
+    def fan_out(self, operation):
+        '''operation(client) на всех целях параллельно -> {имя цели: BulkResult}.'''
+        def run(name):
+            try:
+                return name, BulkResult(item=name, response=operation(self.clients[name]))
+            except Exception as e:
+                return name, BulkResult(item=name, error=e)
+
+        with ThreadPoolExecutor(max_workers=len(self.clients)) as executor:
+            return dict(executor.map(run, self.clients))
+
+    def auth_all(self):
+        '''Токены для всех целей сразу. Ошибка любой цели - исключение.'''
+        results = self.fan_out(lambda client: client.auth())
+        failed = {name: result.error for name, result in results.items() if not result.ok}
+        if failed:
+            raise failed[next(iter(failed))]
+        logger.info(f"✅ Аутентификация на {len(results)} целях")
+
+    def close(self):
+        for client in self.clients.values():
+            client.close()
+
+    # === СРАВНЕНИЕ ===
+
+    def comparison(self):
+        '''По каждому эндпоинту: статусы, count, p50 и p99 каждой цели и флаги различий.'''
+        first = self.names[0]  # Первая цель - база для "во сколько раз медленнее"
+        summaries = {name: registry.summary() for name, registry in self.latency.items()}
+        endpoints = sorted({key for name in self.names for key in summaries[name]} |
+                           {key for name in self.names for key in self.statuses[name].statuses})
+        result = {}
+        for key in endpoints:
+            row = {}
+            for name in self.names:
+                stats = summaries[name].get(key, {})
+                row[name] = {
+                    'statuses': dict(sorted(self.statuses[name].statuses.get(key, {}).items())),
+                    'count': stats.get('count', 0),
+                    'p50': stats.get('p50'),
+                    'p99': stats.get('p99'),
+                }
+            base_p50 = row[first]['p50']
+            for name in self.names:
+                p50 = row[name]['p50']
+                row[name]['slowdown'] = p50 / base_p50 if p50 and base_p50 else None
+            p50s = [row[name]['p50'] for name in self.names]
+            comparable = all(p50 and row[name]['count'] >= Targets.MIN_SAMPLES.value
+                             for name, p50 in zip(self.names, p50s))
+            result[key] = {
+                'targets': row,
+                'status_diff': len({tuple(row[name]['statuses']) for name in self.names}) > 1,
+                'latency_diff': comparable and max(p50s) / min(p50s) >= Targets.LATENCY_RATIO.value,
+            }
+        return result
+
+    def to_dict(self):
+        return {
+            'targets': {name: client.base_url for name, client in self.clients.items()},
+            'endpoints': self.comparison(),
+        }
+
+    def to_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+    def format_table(self):
+        '''Цели рядом: статусы и p50 (мс) по эндпоинтам, различия помечены.'''
+        comparison = self.comparison()
+        cells = {}
+        for key, row in comparison.items():
+            for name in self.names:
+                stats = row['targets'][name]
+                statuses = ','.join(f'{status}x{count}' for status, count in stats['statuses'].items()) or '-'
+                p50 = f"{stats['p50'] * 1000:.0f}ms" if stats['p50'] is not None else '-'
+                slowdown = f" x{stats['slowdown']:.1f}" if stats['slowdown'] and name != self.names[0] else ''
+                cells[key, name] = f'{statuses} {p50}{slowdown}'
+        width = max([len(cell) for cell in cells.values()] + [len(name) for name in self.names]) + 2
+        header = f"{'endpoint':<26}" + ''.join(f'{name:>{width}}' for name in self.names)
+        lines = [header, '-' * len(header)]
+        for key, row in comparison.items():
+            mark = (' ❌ статусы' if row['status_diff'] else '') + (' ⚠️ время' if row['latency_diff'] else '')
+            lines.append(f'{key:<26}' + ''.join(f'{cells[key, name]:>{width}}' for name in self.names) + mark)
+        return '\n'.join(lines)
@@ -0,0 +1,142 @@
+'''Кэш ответов GET с условными запросами (ETag / Last-Modified).
+
+Тесты чтения и сценарии нагрузки раз за разом запрашивают одни и те же
+бронирования. С кэшем клиент помнит последний ответ и его "версию"
+(ETag или Last-Modified) и спрашивает сервер: "изменилось ли с этой версии?"
+(If-None-Match / If-Modified-Since). Если нет - сервер отвечает 304 без тела,
+а ответ собирается из кэша: тело не качается и не распаковывается.
+
+Сервер спрашивается всегда, поэтому устаревших данных кэш не отдаёт.
+Кроме того, update_booking и delete_booking сразу выбрасывают
+бронирование из кэша, чтобы не держать в памяти заведомо старое.
+
+Память ограничена: не больше max_entries ответов и max_bytes байт,
+дольше всех не использованные вытесняются первыми (LRU).
+
+Переменная окружения HTTP_CACHE - on / off (по умолчанию off).'''
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+import requests
+from requests.structures import CaseInsensitiveDict
+from core.settings.config import HttpCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    '''Сохранённый ответ.'''
+    etag: str
+    last_modified: str
+    headers: dict
+    content: bytes
+    encoding: str
+    size: int
+
+    def conditional_headers(self):
+        '''Заголовки условного запроса: "отдай тело, только если оно изменилось".'''
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    '''LRU-кэш ответов по URL с ограничением по числу записей и байтам.
+
+    Аргументы:
+        max_bytes: сколько байт (тела и заголовки) можно держать в кэше
+        max_entries: сколько ответов можно держать в кэше'''
+    def __init__(self, max_bytes=HttpCache.MAX_BYTES.value, max_entries=HttpCache.MAX_ENTRIES.value):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.size = 0
+        self.stats = {'hits': 0, 'misses': 0, 'revalidations': 0, 'stores': 0, 'evictions': 0, 'invalidations': 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, url):
+        '''Запись для url или None. Запись становится "самой свежей" в LRU.'''
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(url)
+            self.stats['revalidations'] += 1
+            return entry
+
+    def store(self, url, response):
+        '''Сохраняет ответ 200, если у него есть ETag или Last-Modified.'''
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+        headers = dict(response.headers)
+        content = response.content
+        size = len(url) + len(content) + sum(len(name) + len(value) for name, value in headers.items())
+        if size > self.max_bytes:
+            return
+        entry = CacheEntry(etag, last_modified, headers, content, response.encoding, size)
+        with self._lock:
+            self._remove(url)
+            self._entries[url] = entry
+            self.size += size
+            self.stats['stores'] += 1
+            # Вытесняем самые старые, пока не влезем в лимиты
+            while self.size > self.max_bytes or len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+                self.stats['evictions'] += 1
+
+    def response_from(self, entry, not_modified):
+        '''Ответ 200 из кэша вместо ответа 304 not_modified.'''
+        with self._lock:
+            self.stats['hits'] += 1
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.encoding = entry.encoding
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        # Тело уже прочитано, как у обычного ответа после .content:
+        # иначе iter_content / iter_lines пойдут читать несуществующий raw
+        response._content = entry.content
+        response._content_consumed = True
+        response.raw = None
+        return response
+
+    def invalidate(self, url):
+        '''Выбрасывает url из кэша (после изменения или удаления бронирования).'''
+        with self._lock:
+            if self._remove(url):
+                self.stats['invalidations'] += 1
+
+    def _remove(self, url):
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self.size -= entry.size
+        return entry is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+def http_cache_from_env():
+    '''Кэш ответов, если HTTP_CACHE=on, иначе None.'''
+    if os.getenv('HTTP_CACHE', 'off').lower() != 'on':
+        return None
+    return ResponseCache()
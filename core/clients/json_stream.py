@@ -0,0 +1,69 @@
+'''Потоковый разбор JSON-массива.
+
+response.json() сначала скачивает весь ответ, а потом строит из него
+один огромный список. Для GET /booking на окружении с сотнями тысяч
+бронирований это лишняя память. iter_json_array читает ответ кусками
+и отдаёт элементы массива по одному - в памяти только текущий кусок.'''
+
+import codecs
+import json
+import re
+
+# Пробелы и запятые между элементами массива
+_SEPARATORS = re.compile(r'[\s,]*')
+_WHITESPACE = re.compile(r'\s*')
+# Чем может закончиться число внутри массива
+_NUMBER_END = frozenset(', \t\r\n]')
+
+
+def iter_json_array(chunks, encoding='utf-8'):
+    '''Отдаёт элементы JSON-массива по мере поступления кусков (bytes).
+
+    Бросает ValueError, если это не массив или ответ оборвался.'''
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ''
+    started = False
+
+    def parse(buffer, final):
+        '''Разбирает всё, что можно, из buffer. Возвращает (элементы, остаток, закончен ли массив).'''
+        nonlocal started
+        items = []
+        pos = 0
+        if not started:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                return items, '', False
+            if buffer[pos] != '[':
+                raise ValueError('Ожидался JSON-массив')
+            started = True
+            pos += 1
+        while True:
+            pos = _SEPARATORS.match(buffer, pos).end()
+            if pos == len(buffer):
+                return items, '', False
+            if buffer[pos] == ']':
+                return items, buffer[pos + 1:], True
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                return items, buffer[pos:], False  # Элемент ещё не пришёл целиком
+            if isinstance(item, (int, float)) and not final and (end == len(buffer) or buffer[end] not in _NUMBER_END):
+                return items, buffer[pos:], False  # Число могло оборваться: "12" из "123" или "2" из "2.5"
+            items.append(item)
+            pos = end
+
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+        items, buffer, finished = parse(buffer, final=False)
+        yield from items
+        if finished:
+            return
+
+    buffer += text_decoder.decode(b'', final=True)
+    items, buffer, finished = parse(buffer, final=True)
+    yield from items
+    if not finished:
+        raise ValueError('JSON-массив оборвался')
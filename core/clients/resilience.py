@@ -0,0 +1,331 @@
+'''Повторы, предохранитель (circuit breaker) и хеджирование запросов.
+
+Раньше первый же Timeout или ConnectionError ронял тест, а один медленный
+экземпляр сервера задерживал его на весь таймаут (5 секунд). Теперь
+между клиентом и сетью стоит слой политик:
+- повторы: идемпотентные запросы (GET, PUT, DELETE) при ошибке сети
+  или ответе 502/503/504 повторяются с экспоненциальной паузой
+  и случайным разбросом (jitter) - чтобы воркеры не повторяли хором;
+- предохранитель: после FAILURE_THRESHOLD ошибок подряд запросы к серверу
+  сразу падают с CircuitOpenError, пока не пройдёт RESET_TIMEOUT секунд.
+  Потом один пробный запрос: прошёл - работаем дальше, нет - ждём ещё;
+- хеджирование (только GET): если ответа нет дольше наблюдаемого p95,
+  отправляется вторая копия запроса и берётся тот ответ, что пришёл первым.
+
+Политику можно задать для каждого эндпоинта отдельно. Ключ - как в отчёте
+о времени ответа, "МЕТОД шаблон":
+    client.resilience.set_policy('GET /booking/{id}', hedge=True)
+    client.resilience.set_policy('PUT /booking/{id}', attempts=1)
+
+Переменные окружения:
+    RESILIENCE - on / off (off - без повторов и предохранителя)
+    HEDGE      - on / off (on - хеджировать все GET, по умолчанию off)'''
+
+import asyncio
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, replace
+from typing import Optional
+import requests
+from core.metrics.latency import endpoint_template
+from core.settings.config import Resilience
+import logging
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+# Ответы, после которых есть смысл повторить: сервер перегружен или за балансировщиком упал
+RETRY_STATUSES = frozenset({502, 503, 504})
+RETRY_ERRORS = (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    '''Предохранитель разомкнут: сервер недавно не отвечал, запрос не отправлялся.'''
+
+
+@dataclass(frozen=True)
+class EndpointPolicy:
+    '''Политика для одного эндпоинта.
+
+    attempts: сколько всего попыток (1 - без повторов)
+    backoff: пауза перед первым повтором (секунды), дальше удваивается
+    max_backoff: самая длинная пауза
+    hedge: отправлять вторую копию GET, если ответа долго нет
+    hedge_delay: через сколько секунд её отправлять (None - по p95)
+    timeout: таймаут запроса (None - таймаут клиента)'''
+    attempts: int = Resilience.RETRY_ATTEMPTS.value
+    backoff: float = Resilience.BACKOFF.value
+    max_backoff: float = Resilience.MAX_BACKOFF.value
+    hedge: bool = False
+    hedge_delay: Optional[float] = None
+    timeout: Optional[float] = None
+
+    def pause(self, retry, rng=random):
+        '''Пауза перед повтором номер retry (0, 1, ...): "full jitter" от 0 до backoff * 2^retry.'''
+        return rng.uniform(0, min(self.max_backoff, self.backoff * 2 ** retry))
+
+
+class CircuitBreaker:
+    '''Предохранитель: closed (работаем) -> open (сразу отказ) -> half-open (пробный запрос).'''
+    def __init__(self, failure_threshold=Resilience.FAILURE_THRESHOLD.value,
+                 reset_timeout=Resilience.RESET_TIMEOUT.value):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probe_at = None
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return 'open'
+            return 'half-open'
+
+    def before_call(self, key):
+        '''Бросает CircuitOpenError, если запрос отправлять нельзя.'''
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            if self._opened_at is None:
+                return
+            now = time.monotonic()
+            # Пробный запрос - один на RESET_TIMEOUT (если он завис, через RESET_TIMEOUT будет следующий)
+            if now - self._opened_at >= self.reset_timeout and (
+                    self._probe_at is None or now - self._probe_at >= self.reset_timeout):
+                self._probe_at = now
+                return
+        raise CircuitOpenError(f'Предохранитель разомкнут, запрос {key} не отправлен')
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_at = None
+
+    def record_failure(self):
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(f"🔌 Предохранитель разомкнут на {self.reset_timeout}с "
+                                   f"после {self._failures} ошибок подряд")
+                # Пробный запрос тоже не прошёл - ждём ещё RESET_TIMEOUT
+                self._opened_at = time.monotonic()
+                self._probe_at = None
+
+
+class ResiliencePolicy:
+    '''Политики по эндпоинтам + общий предохранитель для одного клиента.
+
+    Аргументы:
+        latency: LatencyRegistry - отсюда берётся p95 для хеджирования
+        enabled: False - одна попытка, предохранитель выключен
+        hedge: хеджировать все GET по умолчанию'''
+    def __init__(self, latency, enabled=True, hedge=False):
+        self.latency = latency
+        self.enabled = enabled
+        self.default = EndpointPolicy() if enabled else EndpointPolicy(attempts=1)
+        self.hedge = hedge
+        self.breaker = CircuitBreaker() if enabled else CircuitBreaker(failure_threshold=0)
+        self.policies = {}
+        self._defaults = {}
+        self._hedge_delays = {}
+        self.stats = {'retries': 0, 'hedged': 0, 'rejected': 0}
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._rng = random.Random()
+
+    def set_policy(self, key, **changes):
+        '''Меняет политику эндпоинта ("МЕТОД шаблон"), остальное - как по умолчанию.'''
+        method = key.split(' ', 1)[0]
+        self.policies[key] = replace(self._default_for(method), **changes)
+
+    def _default_for(self, method):
+        policy = self._defaults.get(method)
+        if policy is None:
+            policy = self.default
+            if method not in IDEMPOTENT_METHODS:
+                policy = replace(policy, attempts=1)  # POST может создать дубликат
+            if self.hedge and method == 'GET':
+                policy = replace(policy, hedge=True)
+            self._defaults[method] = policy
+        return policy
+
+    def policy(self, method, endpoint):
+        '''Политика для запроса (endpoint - путь с ID, например /booking/5).'''
+        key = f'{method} {endpoint_template(endpoint)}'
+        policy = self.policies.get(key)
+        return key, policy if policy is not None else self._default_for(method)
+
+    def hedge_delay(self, key, policy):
+        '''Через сколько секунд отправлять копию: заданное время или p95 по истории.'''
+        if policy.hedge_delay is not None:
+            return policy.hedge_delay
+        histogram = self.latency.histograms.get(key)
+        min_samples = Resilience.HEDGE_MIN_SAMPLES.value
+        if histogram is None or histogram.count < min_samples:
+            return None  # Пока мало данных - не хеджируем
+        # Перцентиль пересчитываем не на каждый запрос, а раз в min_samples новых ответов
+        counted, delay = self._hedge_delays.get(key, (0, None))
+        if histogram.count - counted >= min_samples:
+            delay = histogram.percentile(Resilience.HEDGE_PERCENTILE.value)
+            self._hedge_delays[key] = (histogram.count, delay)
+        return delay
+
+    def _should_retry(self, attempt, policy):
+        return attempt + 1 < policy.attempts
+
+    def _retry_pause(self, key, attempt, policy, reason):
+        self.stats['retries'] += 1
+        pause = policy.pause(attempt, self._rng)
+        logger.warning(f"🔁 {key}: {reason}, повтор {attempt + 1} из {policy.attempts - 1} через {pause:.2f}с")
+        return pause
+
+    # === СИНХРОННЫЙ КЛИЕНТ ===
+
+    def execute(self, key, policy, method, send):
+        '''Выполняет send() (одна попытка запроса) по политике. Возвращает ответ.'''
+        attempt = 0
+        while True:
+            self._before_call(key)
+            try:
+                if policy.hedge and method == 'GET':
+                    response = self._hedged(key, policy, send)
+                else:
+                    response = send()
+            except RETRY_ERRORS as e:
+                self.breaker.record_failure()
+                if not self._should_retry(attempt, policy):
+                    raise
+                time.sleep(self._retry_pause(key, attempt, policy, type(e).__name__))
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success()
+                    return response
+                self.breaker.record_failure()
+                if not self._should_retry(attempt, policy):
+                    return response
+                response.close()
+                time.sleep(self._retry_pause(key, attempt, policy, response.status_code))
+            attempt += 1
+
+    def _before_call(self, key):
+        try:
+            self.breaker.before_call(key)
+        except CircuitOpenError:
+            self.stats['rejected'] += 1
+            raise
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=Resilience.HEDGE_WORKERS.value, thread_name_prefix='hedge')
+            return self._executor
+
+    def _hedged(self, key, policy, send):
+        '''Первая копия сразу, вторая - если первая не ответила за hedge_delay.'''
+        delay = self.hedge_delay(key, policy)
+        if delay is None:
+            return send()
+        executor = self._get_executor()
+        first = executor.submit(send)
+        if wait([first], timeout=delay).done:
+            return first.result()
+
+        self.stats['hedged'] += 1
+        logger.debug(f"🪞 {key}: нет ответа за {delay * 1000:.0f}мс, отправляем копию")
+        futures = [first, executor.submit(send)]
+        error = None
+        for future in as_completed(futures):
+            try:
+                response = future.result()
+            except requests.exceptions.RequestException as e:
+                error = error or e  # Ждём вторую копию
+                continue
+            for other in futures:
+                if other is not future:
+                    other.add_done_callback(_close_response)
+            return response
+        raise error
+
+    # === АСИНХРОННЫЙ КЛИЕНТ ===
+
+    async def execute_async(self, key, policy, method, send):
+        '''То же, что execute, но send - корутинная функция.'''
+        attempt = 0
+        while True:
+            self._before_call(key)
+            try:
+                if policy.hedge and method == 'GET':
+                    response = await self._hedged_async(key, policy, send)
+                else:
+                    response = await send()
+            except RETRY_ERRORS as e:
+                self.breaker.record_failure()
+                if not self._should_retry(attempt, policy):
+                    raise
+                await asyncio.sleep(self._retry_pause(key, attempt, policy, type(e).__name__))
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success()
+                    return response
+                self.breaker.record_failure()
+                if not self._should_retry(attempt, policy):
+                    return response
+                await asyncio.sleep(self._retry_pause(key, attempt, policy, response.status_code))
+            attempt += 1
+
+    async def _hedged_async(self, key, policy, send):
+        delay = self.hedge_delay(key, policy)
+        if delay is None:
+            return await send()
+        first = asyncio.ensure_future(send())
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+
+        self.stats['hedged'] += 1
+        logger.debug(f"🪞 {key}: нет ответа за {delay * 1000:.0f}мс, отправляем копию")
+        pending = {first, asyncio.ensure_future(send())}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()  # В asyncio проигравшую копию можно просто отменить
+
+    def close(self):
+        '''Дожидается копий, которые ещё в полёте: после этого сессию клиента можно закрывать.'''
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
+def _close_response(future):
+    '''Закрывает ответ копии, которая пришла второй (соединение вернётся в пул).'''
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def resilience_from_env(latency):
+    '''Политики по переменным окружения RESILIENCE и HEDGE (см. описание модуля).'''
+    return ResiliencePolicy(
+        latency,
+        enabled=os.getenv('RESILIENCE', 'on').lower() != 'off',
+        hedge=os.getenv('HEDGE', 'off').lower() == 'on',
+    )
@@ -0,0 +1,117 @@
+'''Общий кэш токенов авторизации.
+
+Каждый воркер xdist и каждый процесс нагрузки раньше сам ходил в /auth.
+Теперь токен лежит в файле (по умолчанию во временной папке системы):
+- пока токен не истёк - его берут из файла, без запроса к /auth;
+- за REFRESH_MARGIN секунд до истечения токен считается устаревшим и обновляется;
+- файл блокируется (fcntl), поэтому при старте 32 воркеров в /auth
+  сходит только первый, остальные подождут и возьмут его токен.
+
+Ключ - базовый URL + имя пользователя (пароль в файл не пишется).
+Файл создаётся с правами 0o600 - читать его может только владелец.'''
+
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from core.settings.config import Tokens
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows - блокируем только внутри процесса
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), 'booking_api_tokens.json')
+
+
+class TokenCache:
+    '''Кэш токенов в файле с блокировкой.
+
+    Аргументы:
+        path: путь к файлу кэша
+        ttl: сколько секунд токен считается действительным
+        refresh_margin: за сколько секунд до истечения токен обновляется заранее'''
+    def __init__(self, path=DEFAULT_PATH, ttl=Tokens.TTL.value, refresh_margin=Tokens.REFRESH_MARGIN.value):
+        self.path = path
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        '''Блокировка и между потоками, и между процессами.'''
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(f'{self.path}.lock', 'a') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data):
+        # Пишем во временный файл и переименовываем - читатель не увидит половину файла.
+        # Файл в общей временной папке: права 0o600, чтобы токены не читали другие пользователи
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        try:
+            os.unlink(tmp_path)  # Остаток упавшего процесса мог быть создан с другими правами
+        except FileNotFoundError:
+            pass
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def _is_fresh(self, entry):
+        return entry is not None and entry['expires_at'] - self.refresh_margin > time.time()
+
+    def get_or_fetch(self, key, fetch):
+        '''Токен из кэша, а если его нет или он истекает - новый через fetch().
+
+        fetch() вызывается под блокировкой, поэтому одновременно
+        за токеном идёт только один процесс.'''
+        with self._locked():
+            data = self._read()
+            entry = data.get(key)
+            if self._is_fresh(entry):
+                logger.debug("🔑 Токен взят из кэша")
+                return entry['token']
+
+            token = fetch()
+            if token:
+                data = {k: v for k, v in data.items() if self._is_fresh(v)}
+                data[key] = {'token': token, 'expires_at': time.time() + self.ttl}
+                self._write(data)
+            return token
+
+    def invalidate(self, key, token):
+        '''Убирает токен из кэша, если там всё ещё он (другой процесс мог уже обновить).'''
+        with self._locked():
+            data = self._read()
+            entry = data.get(key)
+            if entry is not None and entry['token'] == token:
+                del data[key]
+                self._write(data)
+
+
+def token_cache_from_env():
+    '''Кэш токенов по переменным окружения или None, если он выключен:
+        TOKEN_CACHE      - on / off (по умолчанию on)
+        TOKEN_CACHE_PATH - путь к файлу кэша'''
+    if os.getenv('TOKEN_CACHE', 'on').lower() == 'off':
+        return None
+    return TokenCache(os.getenv('TOKEN_CACHE_PATH', DEFAULT_PATH))
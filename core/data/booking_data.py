@@ -0,0 +1,156 @@
+'''Быстрая генерация данных бронирований.
+
+Раньше каждый тест создавал свой Faker() (это дорого - загружаются все
+провайдеры) и собирал одно бронирование за раз. Здесь:
+- данные провайдеров Faker (имена, фамилии, слова) загружаются один раз на процесс;
+- значения выбираются пачками (random.choices с k=N), а не по одному;
+- генератор детерминирован: одно и то же зерно (seed) - одни и те же данные;
+- бронирования можно получать списком, лениво (stream) или сразу
+  готовыми JSON-байтами для отправки.
+
+Пример:
+    generator = BookingDataGenerator(seed=42)
+    bookings = generator.batch(1000)           # список словарей
+    payloads = generator.batch_json(1000)      # список bytes
+    for booking in generator.stream(100_000):  # лениво, пачками
+        ...'''
+
+import itertools
+import json
+import random
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+# Цена, длина предложения и даты - в тех же пределах, что давал Faker
+PRICE_RANGE = (100, 999)
+SENTENCE_WORDS = (3, 9)
+CHECKIN_DAYS = (1, 365)
+STAY_NIGHTS = (1, 14)
+DEFAULT_BATCH_SIZE = 1000
+
+
+@lru_cache(maxsize=None)
+def _provider_data():
+    '''Имена, фамилии и слова из провайдеров Faker (en_US) - один раз на процесс.'''
+    from faker.providers.lorem.en_US import Provider as LoremProvider
+    from faker.providers.person.en_US import Provider as PersonProvider
+
+    first_names = list(PersonProvider.first_names)
+    last_names = list(PersonProvider.last_names)
+    return {
+        'first_names': first_names,
+        'first_names_json': [json.dumps(name) for name in first_names],
+        'first_names_weights': list(itertools.accumulate(PersonProvider.first_names.values())),
+        'last_names': last_names,
+        'last_names_json': [json.dumps(name) for name in last_names],
+        'last_names_weights': list(itertools.accumulate(PersonProvider.last_names.values())),
+        'words': list(LoremProvider.word_list),
+    }
+
+
+class BookingDataGenerator:
+    '''Генератор данных бронирований.
+
+    Аргументы:
+        seed: зерно для воспроизводимости (None - случайное)
+        today: от какой даты считать заезд (по умолчанию - сегодня)'''
+    def __init__(self, seed=None, today=None):
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._data = _provider_data()
+        today = today or datetime.today()
+        if isinstance(today, datetime):
+            today = today.date()
+        # Все возможные даты считаем один раз - дальше только выбираем индекс
+        last_day = CHECKIN_DAYS[1] + STAY_NIGHTS[1]
+        self._days = [(today + timedelta(days=offset)).isoformat() for offset in range(last_day + 1)]
+        self._buffer = iter(())
+
+    def _columns(self, n):
+        '''Все поля для n бронирований - каждое поле одной пачкой.'''
+        rng = self._random
+        data = self._data
+        first = rng.choices(range(len(data['first_names'])), cum_weights=data['first_names_weights'], k=n)
+        last = rng.choices(range(len(data['last_names'])), cum_weights=data['last_names_weights'], k=n)
+        prices = rng.choices(range(PRICE_RANGE[0], PRICE_RANGE[1] + 1), k=n)
+        deposits = rng.choices((True, False), k=n)
+        checkins = rng.choices(range(CHECKIN_DAYS[0], CHECKIN_DAYS[1] + 1), k=n)
+        nights = rng.choices(range(STAY_NIGHTS[0], STAY_NIGHTS[1] + 1), k=n)
+        lengths = rng.choices(range(SENTENCE_WORDS[0], SENTENCE_WORDS[1] + 1), k=n)
+        words = rng.choices(data['words'], k=sum(lengths))
+        return first, last, prices, deposits, checkins, nights, lengths, words
+
+    @staticmethod
+    def _sentences(lengths, words):
+        '''Предложения как у Faker: с большой буквы и с точкой в конце.'''
+        position = 0
+        for length in lengths:
+            sentence = ' '.join(words[position:position + length])
+            position += length
+            yield sentence[0].upper() + sentence[1:] + '.'
+
+    def batch(self, n):
+        '''n бронирований в виде словарей.'''
+        first, last, prices, deposits, checkins, nights, lengths, words = self._columns(n)
+        data, days = self._data, self._days
+        return [
+            {
+                'firstname': data['first_names'][first[i]],
+                'lastname': data['last_names'][last[i]],
+                'totalprice': prices[i],
+                'depositpaid': deposits[i],
+                'bookingdates': {
+                    'checkin': days[checkins[i]],
+                    'checkout': days[checkins[i] + nights[i]],
+                },
+                'additionalneeds': sentence,
+            }
+            for i, sentence in enumerate(self._sentences(lengths, words))
+        ]
+
+    def batch_json(self, n):
+        '''n бронирований сразу в виде JSON-байтов (готовы для data=...).'''
+        first, last, prices, deposits, checkins, nights, lengths, words = self._columns(n)
+        data, days = self._data, self._days
+        return [
+            (
+                f'{{"firstname":{data["first_names_json"][first[i]]},'
+                f'"lastname":{data["last_names_json"][last[i]]},'
+                f'"totalprice":{prices[i]},'
+                f'"depositpaid":{"true" if deposits[i] else "false"},'
+                f'"bookingdates":{{"checkin":"{days[checkins[i]]}","checkout":"{days[checkins[i] + nights[i]]}"}},'
+                f'"additionalneeds":{json.dumps(sentence)}}}'
+            ).encode('utf-8')
+            for i, sentence in enumerate(self._sentences(lengths, words))
+        ]
+
+    def stream(self, count=None, batch_size=DEFAULT_BATCH_SIZE, as_json=False):
+        '''Лениво отдаёт бронирования, генерируя их пачками по batch_size.
+
+        count=None - бесконечный поток.'''
+        make_batch = self.batch_json if as_json else self.batch
+        produced = 0
+        while count is None or produced < count:
+            size = batch_size if count is None else min(batch_size, count - produced)
+            yield from make_batch(size)
+            produced += size
+
+    def __call__(self):
+        '''Одно бронирование (для payload_factory). Внутри всё равно берётся пачками.'''
+        try:
+            return next(self._buffer)
+        except StopIteration:
+            self._buffer = iter(self.batch(DEFAULT_BATCH_SIZE))
+            return next(self._buffer)
+
+
+_default_generators = {}
+
+
+def random_booking_data(today=None):
+    '''Одно случайное бронирование - как в фикстуре generate_random_booking_data.'''
+    key = today.date() if isinstance(today, datetime) else today
+    generator = _default_generators.get(key)
+    if generator is None:
+        generator = _default_generators[key] = BookingDataGenerator(today=today)
+    return generator()
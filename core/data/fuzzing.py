@@ -0,0 +1,201 @@
+'''Испорченные данные бронирований для фаззинга контракта POST /booking.
+
+Мутации строятся по JSON-схеме моделей (Booking.model_json_schema()),
+а не по списку руками: для каждого поля схемы, включая вложенные
+(bookingdates.checkin), получаем
+    missing     - обязательного поля нет
+    null        - поле равно null
+    type        - значение другого JSON-типа (строка вместо числа и т.д.)
+    boundary    - граничные значения своего типа: 0, -1, 2**31, 2**63...
+    string      - пустые, пробельные, огромные, юникод, управляющие символы
+    date        - несуществующие и неверно записанные даты (format: date)
+    extra       - лишнее поле в объекте
+и правила для пары дат: выезд раньше заезда, выезд в день заезда.
+
+generate_mutations(count) отдаёт count мутаций: сначала каждую
+одиночную мутацию по разу, потом случайные сочетания 2-3 мутаций
+разных полей. Основа - обычные данные из BookingDataGenerator,
+всё воспроизводимо по seed.'''
+
+import copy
+import random
+from dataclasses import dataclass
+from typing import Any
+from core.data.booking_data import BookingDataGenerator
+from core.settings.config import Fuzz
+
+# Значение каждого JSON-типа - для мутаций "не тот тип"
+TYPE_SAMPLES = {
+    'string': 'fuzz',
+    'integer': 12345,
+    'number': 1.5,
+    'boolean': True,
+    'array': [],
+    'object': {},
+}
+
+INTEGER_BOUNDARIES = {
+    'zero': 0,
+    'negative': -1,
+    'int32_max': 2 ** 31 - 1,
+    'int32_overflow': 2 ** 31,
+    'int53_overflow': 2 ** 53 + 1,
+    'int64_min': -2 ** 63,
+    'huge': 10 ** 30,
+}
+
+STRING_VALUES = {
+    'empty': '',
+    'whitespace': '   ',
+    'long_256': 'A' * 256,
+    'long_64k': 'A' * 64 * 1024,
+    'oversized': 'A' * Fuzz.MAX_STRING.value,
+    'unicode': 'Åsa 名前 😀',
+    'control': 'a\x00b\x1fc',
+    'markup': '<script>alert(1)</script>',
+    'quote': "O'Brien\"; --",
+}
+
+DATE_VALUES = {
+    'feb_30': '2024-02-30',
+    'month_13': '2024-13-01',
+    'day_first': '31-12-2024',
+    'slashes': '2024/01/01',
+    'datetime': '2024-01-01T00:00:00',
+    'year_0': '0000-01-01',
+    'year_9999': '9999-12-31',
+    'words': 'not-a-date',
+    'empty': '',
+}
+
+
+@dataclass
+class Mutation:
+    '''Одна мутация: name - что испорчено (для отчёта), payload - тело запроса.'''
+    name: str
+    payload: Any
+
+
+@dataclass
+class _Change:
+    '''Одиночная порча поля path (кортеж ключей) - применяется к копии основы.'''
+    name: str
+    path: tuple
+    action: str  # 'set', 'delete', 'dates' (правило пары дат) или 'replace' (заменить всё тело)
+    value: Any = None
+
+
+def _resolve(schema, root):
+    '''Раскрывает $ref и anyOf из схемы pydantic. Возвращает (схема, типы, можно ли null).'''
+    if '$ref' in schema:
+        schema = root['$defs'][schema['$ref'].rsplit('/', 1)[-1]]
+    if 'anyOf' in schema:
+        options = [_resolve(option, root)[0] for option in schema['anyOf']]
+        types = [option.get('type') for option in options]
+        concrete = [option for option in options if option.get('type') != 'null']
+        return (concrete[0] if concrete else schema), [t for t in types if t != 'null'], 'null' in types
+    return schema, [schema.get('type')], False
+
+
+def _field_changes(path, schema, required, root):
+    '''Все одиночные мутации поля path и (для объектов) его вложенных полей.'''
+    schema, types, nullable = _resolve(schema, root)
+    label = '.'.join(path)
+    changes = []
+    if required:
+        changes.append(_Change(f'{label}:missing', path, 'delete'))
+    if not nullable:
+        changes.append(_Change(f'{label}:null', path, 'set', None))
+    for type_name, sample in TYPE_SAMPLES.items():
+        if type_name not in types and not (type_name == 'integer' and 'number' in types):
+            changes.append(_Change(f'{label}:type={type_name}', path, 'set', copy.deepcopy(sample)))
+
+    if 'integer' in types:
+        changes += [_Change(f'{label}:boundary={name}', path, 'set', value)
+                    for name, value in INTEGER_BOUNDARIES.items()]
+    if 'string' in types and schema.get('format') == 'date':
+        changes += [_Change(f'{label}:date={name}', path, 'set', value) for name, value in DATE_VALUES.items()]
+    elif 'string' in types:
+        changes += [_Change(f'{label}:string={name}', path, 'set', value) for name, value in STRING_VALUES.items()]
+    if 'object' in types:
+        changes += _object_changes(path, schema, root)
+    return changes
+
+
+def _object_changes(path, schema, root):
+    '''Мутации полей объекта + лишнее поле + правила для пары дат.'''
+    properties = schema.get('properties', {})
+    required = set(schema.get('required', ()))
+    label = '.'.join(path) or 'body'
+    changes = [_Change(f'{label}:extra', path + ('fuzz_extra',), 'set', 'fuzz')]
+    for name, field_schema in properties.items():
+        changes += _field_changes(path + (name,), field_schema, name in required, root)
+
+    # Даты заезда/выезда: по отдельности корректны, вместе - нет
+    if all(properties.get(name, {}).get('format') == 'date' for name in ('checkin', 'checkout')):
+        changes.append(_Change(f'{label}:inverted_dates', path, 'dates', 'swap'))
+        changes.append(_Change(f'{label}:same_day', path, 'dates', 'same'))
+    return changes
+
+
+def schema_changes(model):
+    '''Все одиночные мутации для модели pydantic (по её JSON-схеме).'''
+    schema = model.model_json_schema()
+    changes = [_Change(f'body:type={type_name}', (), 'replace', copy.deepcopy(sample))
+               for type_name, sample in TYPE_SAMPLES.items() if type_name != 'object']
+    changes.append(_Change('body:null', (), 'replace', None))
+    changes.append(_Change('body:empty', (), 'replace', {}))
+    return changes + _object_changes((), schema, schema)
+
+
+def _apply(payload, change):
+    '''Применяет мутацию к payload (payload меняется на месте). Возвращает новое тело.'''
+    if change.action == 'replace':
+        return copy.deepcopy(change.value)
+    *parents, key = change.path
+    target = payload
+    for parent in parents:
+        target = target.get(parent) if isinstance(target, dict) else None
+    if not isinstance(target, dict):
+        return payload  # Родителя уже испортила другая мутация
+    if change.action == 'delete':
+        target.pop(key, None)
+    elif change.action == 'dates':
+        dates = target.get(key)
+        if isinstance(dates, dict) and 'checkin' in dates and 'checkout' in dates:
+            # В основе выезд всегда позже заезда: обмен даёт выезд раньше заезда
+            if change.value == 'swap':
+                dates['checkin'], dates['checkout'] = dates['checkout'], dates['checkin']
+            else:
+                dates['checkout'] = dates['checkin']
+    else:
+        target[key] = copy.deepcopy(change.value) if isinstance(change.value, (list, dict)) else change.value
+    return payload
+
+
+def generate_mutations(count=Fuzz.COUNT.value, seed=0, model=None):
+    '''count испорченных тел запроса для POST /booking.
+
+    Аргументы:
+        count: сколько мутаций отдать
+        seed: зерно (основа и сочетания воспроизводятся)
+        model: модель pydantic, по схеме которой портим (по умолчанию Booking)'''
+    if model is None:
+        from core.models.booking import Booking
+        model = Booking
+    changes = schema_changes(model)
+    rng = random.Random(seed)
+    bases = BookingDataGenerator(seed=seed)
+    for i in range(count):
+        if i < len(changes):
+            picked = [changes[i]]
+        else:
+            # Сочетание мутаций разных полей; замена всего тела - только одиночно
+            picked = []
+            for change in rng.sample(changes, k=rng.randint(2, 3)):
+                if change.action != 'replace' and all(change.path[:1] != other.path[:1] for other in picked):
+                    picked.append(change)
+        payload = bases()
+        for change in picked:
+            payload = _apply(payload, change)
+        yield Mutation('+'.join(change.name for change in picked), payload)
@@ -0,0 +1,61 @@
+'''Запуск нагрузки из командной строки.
+
+Примеры:
+    python -m core.load --scenario crud --rps 50 --duration 60
+    python -m core.load --scenario ping --concurrency 8 --json report.json
+    python -m core.load --concurrency 4 --duration 3600 --soak --soak-json soak.json'''
+
+import argparse
+import sys
+from core.clients.api_client import APIClient
+from core.logs.pipeline import enable_hot_path, setup_logging, stop_logging
+from core.load.runner import LoadRunner, default_max_workers
+from core.load.scenarios import SCENARIOS
+from core.metrics.soak import SoakSampler
+from core.settings.config import Soak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m core.load', description='Нагрузка на API бронирований')
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default='crud', help='сценарий нагрузки')
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--rps', type=float, help='итераций сценария в секунду (открытая модель)')
+    mode.add_argument('--concurrency', type=int, help='число параллельных потоков (закрытая модель)')
+    parser.add_argument('--duration', type=float, default=10, help='длительность в секундах')
+    parser.add_argument('--max-workers', type=int, help='максимум одновременных запросов в открытой модели')
+    parser.add_argument('--json', dest='json_path', help='куда сохранить отчёт в JSON')
+    parser.add_argument('--soak', action='store_true', help='замеры памяти, сокетов и пулов соединений во время прогона')
+    parser.add_argument('--soak-interval', type=float, default=Soak.INTERVAL.value, help='как часто снимать замеры (секунды)')
+    parser.add_argument('--soak-json', help='куда сохранить отчёт soak-режима в JSON')
+    parser.add_argument('--log-level', default='WARNING', help='уровень логирования (DEBUG, INFO, WARNING)')
+    args = parser.parse_args(argv)
+
+    # Логи пишет отдельный поток, строки "на каждый запрос" - не чаще Logs.HOT_PATH_MODE_RATE в секунду
+    enable_hot_path()
+    setup_logging(level=args.log_level.upper())
+
+    # Пул соединений клиента - по числу потоков нагрузки
+    workers = args.max_workers or default_max_workers(args.rps, args.concurrency)
+    client = APIClient(max_workers=workers)
+    client.auth()
+
+    runner = LoadRunner(client, scenario=args.scenario, rps=args.rps, concurrency=args.concurrency,
+                        duration=args.duration, max_workers=workers)
+    if args.soak:
+        with SoakSampler(client, interval=args.soak_interval) as sampler:
+            report = runner.run()
+    else:
+        report = runner.run()
+    stop_logging()  # Дописываем логи до таблицы отчёта
+    print(report.format_table())
+    if args.json_path:
+        report.to_json(args.json_path)
+    if args.soak:
+        print(sampler.report.format_table())
+        if args.soak_json:
+            sampler.report.to_json(args.soak_json)
+    return 0 if report.total_requests else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,192 @@
+'''Фаззинг контракта POST /booking.
+
+Тысячи испорченных тел (core/data/fuzzing.py) отправляются параллельно
+через APIClient.create_bookings. Каждый ответ попадает в класс:
+    статус         - 500, 400, 200... или имя исключения, если ответа нет
+    форма ответа   - ключи JSON-объекта или начало текста (цифры -> #)
+    полоса времени - '<100ms', '<500ms'... (границы в Fuzz.LATENCY_BANDS)
+В отчёт идёт только один представитель класса (первая мутация, которая
+в него попала) и число мутаций в классе. Тысяча одинаковых 500 на
+"нет поля" - это одна строка отчёта, а не тысяча упавших тестов.
+
+Нарушения контракта (класс целиком):
+    - статус не из Fuzz.EXPECTED_STATUSES или нет ответа вовсе
+    - ответ 2xx, который не проходит модель BookingResponse
+Созданные фаззингом бронирования удаляются после каждого захода.'''
+
+import itertools
+import json
+import re
+import requests
+from pydantic import ValidationError
+from core.data.fuzzing import generate_mutations
+from core.models.booking import Booking, BookingResponse
+from core.settings.config import Fuzz
+import logging
+
+logger = logging.getLogger(__name__)
+
+_DIGITS = re.compile(r'\d+')
+# Длинные строки в представителях обрезаются - иначе в отчёт попадёт мегабайт "AAAA"
+_REPORT_STRING_LIMIT = 80
+
+
+def latency_band(seconds, bands=Fuzz.LATENCY_BANDS.value):
+    '''Полоса времени ответа: '<100ms', '<500ms', ..., '>=2000ms'.'''
+    for bound in bands:
+        if seconds < bound:
+            return f'<{bound * 1000:.0f}ms'
+    return f'>={bands[-1] * 1000:.0f}ms'
+
+
+def response_shape(response):
+    '''Форма ответа без конкретных значений: 'json{booking,bookingid}', 'text:Internal Server Error'.'''
+    content_type = response.headers.get('Content-Type', '')
+    if 'json' in content_type:
+        try:
+            data = response.json()
+        except ValueError:
+            return 'json:invalid'
+        if isinstance(data, dict):
+            return 'json{' + ','.join(sorted(data)) + '}'
+        return f'json:{type(data).__name__}'
+    text = response.content[:60].decode('utf-8', 'replace').strip()
+    return 'text:' + _DIGITS.sub('#', text)
+
+
+def _truncate(value):
+    '''Копия payload для отчёта: длинные строки обрезаны.'''
+    if isinstance(value, dict):
+        return {key: _truncate(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_truncate(item) for item in value]
+    if isinstance(value, str) and len(value) > _REPORT_STRING_LIMIT:
+        return f'{value[:20]}...(+{len(value) - 20} символов)'
+    return value
+
+
+def _body(payload):
+    '''Тело запроса: словарь - как есть, остальное (null, список, строка) - готовым JSON.
+
+    requests с json=None не отправляет тело вовсе, поэтому мутация body:null
+    проверяла бы пустой запрос, а не "null".'''
+    if isinstance(payload, dict):
+        return payload
+    return json.dumps(payload).encode('utf-8')
+
+
+def _model_accepts(payload):
+    '''Проходит ли тело нашу модель Booking (сервер может быть мягче или строже).'''
+    try:
+        Booking.model_validate(payload)
+        return True
+    except ValidationError:
+        return False
+
+
+class FuzzReport:
+    '''Итог фаззинга: классы ответов с одним представителем в каждом.'''
+    def __init__(self, classes, total):
+        self.classes = classes
+        self.total = total
+
+    @property
+    def violations(self):
+        '''Классы, нарушающие контракт.'''
+        return [cls for cls in self.classes.values() if cls['violation']]
+
+    def to_dict(self):
+        return {
+            'total': self.total,
+            'classes': len(self.classes),
+            'violations': len(self.violations),
+            'responses': sorted(self.classes.values(), key=lambda cls: -cls['count']),
+        }
+
+    def to_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+    def format_table(self):
+        '''Таблица классов для вывода в консоль.'''
+        header = f"{'status':<22}{'shape':<36}{'latency':>10}{'count':>8}{'model ok':>10}  пример"
+        lines = [header, '-' * len(header)]
+        for cls in sorted(self.classes.values(), key=lambda cls: -cls['count']):
+            mark = '❌ ' if cls['violation'] else ''
+            lines.append(f"{mark + str(cls['status']):<22}{cls['shape'][:35]:<36}{cls['latency']:>10}"
+                         f"{cls['count']:>8}{cls['model_accepts']:>10}  {cls['example']}")
+        lines.append(f"Мутаций: {self.total}, классов ответов: {len(self.classes)}, "
+                     f"нарушений контракта: {len(self.violations)}")
+        return '\n'.join(lines)
+
+
+class FuzzRunner:
+    '''Гоняет мутации POST /booking через APIClient и собирает классы ответов.
+
+    Аргументы:
+        client: APIClient (массовые запросы идут в его пуле потоков)
+        count: сколько мутаций отправить
+        seed: зерно мутаций
+        batch: сколько запросов в одном заходе create_bookings'''
+    def __init__(self, client, count=Fuzz.COUNT.value, seed=0, batch=Fuzz.BATCH.value):
+        self.client = client
+        self.count = count
+        self.seed = seed
+        self.batch = batch
+        self.classes = {}
+
+    def _classify(self, mutation, result):
+        '''Кладёт результат в класс. Возвращает ID, если бронирование создалось.'''
+        response = result.response
+        if response is None and isinstance(result.error, requests.exceptions.HTTPError):
+            response = result.error.response
+        if response is None:
+            status, shape, latency = type(result.error).__name__, str(result.error)[:60], '-'
+        else:
+            status, shape = response.status_code, response_shape(response)
+            latency = latency_band(response.elapsed.total_seconds())
+
+        key = (status, shape, latency)
+        cls = self.classes.get(key)
+        if cls is None:
+            violation = response is None or status not in Fuzz.EXPECTED_STATUSES.value
+            if response is not None and 200 <= status < 300:
+                try:
+                    BookingResponse.model_validate_json(response.content)
+                except ValidationError:
+                    violation = True
+            cls = self.classes[key] = {
+                'status': status, 'shape': shape, 'latency': latency, 'violation': violation,
+                'count': 0, 'model_accepts': 0,
+                'example': mutation.name, 'payload': _truncate(mutation.payload),
+            }
+            logger.info(f"🧬 Новый класс ответа {key}: {mutation.name}")
+        cls['count'] += 1
+        cls['model_accepts'] += _model_accepts(mutation.payload)
+
+        if response is not None and response.status_code == 200:
+            try:
+                return response.json()['bookingid']
+            except (ValueError, KeyError, TypeError):
+                return None
+        return None
+
+    def run(self):
+        '''Отправляет все мутации и возвращает FuzzReport.'''
+        logger.info(f"🧬 Фаззинг POST /booking: {self.count} мутаций, заходы по {self.batch}")
+        mutations = generate_mutations(self.count, seed=self.seed)
+        total = 0
+        while True:
+            chunk = list(itertools.islice(mutations, self.batch))
+            if not chunk:
+                break
+            results = self.client.create_bookings([_body(mutation.payload) for mutation in chunk])
+            created = [self._classify(mutation, result) for mutation, result in zip(chunk, results)]
+            created = [booking_id for booking_id in created if booking_id is not None]
+            if created:
+                self.client.delete_bookings(created)
+            total += len(chunk)
+        report = FuzzReport(self.classes, total)
+        logger.info(f"🏁 Фаззинг: {total} мутаций, {len(self.classes)} классов, "
+                    f"нарушений: {len(report.violations)}")
+        return report
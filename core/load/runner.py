@@ -0,0 +1,232 @@
+'''Генератор нагрузки на основе APIClient.
+
+Два режима:
+- открытая модель (rps): новые итерации сценария стартуют по расписанию,
+  независимо от того, ответил ли сервер на предыдущие. Время ответа
+  считается от ЗАПЛАНИРОВАННОГО старта, поэтому очередь не прячется
+  за медленными ответами (нет "coordinated omission").
+- закрытая модель (concurrency): N потоков крутят сценарий по кругу.
+
+В отчёте для каждого эндпоинта: пропускная способность, доля ошибок
+и перцентили времени ответа.'''
+
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from core.data.booking_data import random_booking_data
+from core.load.scenarios import SCENARIOS
+from core.metrics.latency import LatencyHistogram
+from core.settings.config import Timeouts
+import logging
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def default_max_workers(rps=None, concurrency=None):
+    '''Сколько потоков нужно: в открытой модели - чтобы хватило на все запросы, ждущие таймаута.'''
+    return concurrency or max(4, math.ceil(rps * Timeouts.DEFAULT.value))
+
+
+class _StepFailed(Exception):
+    '''Шаг сценария упал - остальные шаги итерации не выполняем.'''
+
+
+class LoadStats:
+    '''Потокобезопасный сборщик результатов по эндпоинтам.
+
+    Время ответа хранится в гистограммах - память не растёт
+    с длительностью прогона.'''
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = defaultdict(LatencyHistogram)
+        self._errors = defaultdict(int)
+
+    def record(self, key, latency, ok):
+        with self._lock:
+            histogram = self._histograms[key]
+            if not ok:
+                self._errors[key] += 1
+        histogram.record(latency)
+
+    def report(self, elapsed):
+        '''Собирает итоговый отчёт за elapsed секунд.'''
+        with self._lock:
+            endpoints = {}
+            for key, histogram in self._histograms.items():
+                count = histogram.count
+                errors = self._errors[key]
+                endpoints[key] = {
+                    'count': count,
+                    'errors': errors,
+                    'error_rate': errors / count,
+                    'throughput': count / elapsed if elapsed else 0.0,
+                    **{f'p{p}': histogram.percentile(p) for p in PERCENTILES},
+                    'max': histogram.max,
+                }
+        return LoadReport(elapsed, endpoints)
+
+
+class LoadReport:
+    '''Итог прогона нагрузки.'''
+    def __init__(self, elapsed, endpoints):
+        self.elapsed = elapsed
+        self.endpoints = endpoints
+
+    @property
+    def total_requests(self):
+        return sum(stats['count'] for stats in self.endpoints.values())
+
+    @property
+    def error_rate(self):
+        total = self.total_requests
+        errors = sum(stats['errors'] for stats in self.endpoints.values())
+        return errors / total if total else 0.0
+
+    def to_dict(self):
+        return {
+            'elapsed': self.elapsed,
+            'total_requests': self.total_requests,
+            'error_rate': self.error_rate,
+            'endpoints': self.endpoints,
+        }
+
+    def to_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+    def format_table(self):
+        '''Таблица для вывода в консоль (время в миллисекундах).'''
+        header = f"{'endpoint':<26}{'count':>8}{'rps':>9}{'err%':>7}" + \
+            ''.join(f"{f'p{p}':>9}" for p in PERCENTILES) + f"{'max':>9}"
+        lines = [header, '-' * len(header)]
+        for key in sorted(self.endpoints):
+            stats = self.endpoints[key]
+            lines.append(
+                f"{key:<26}{stats['count']:>8}{stats['throughput']:>9.1f}{stats['error_rate'] * 100:>7.1f}" +
+                ''.join(f"{stats[f'p{p}'] * 1000:>9.1f}" for p in PERCENTILES) +
+                f"{stats['max'] * 1000:>9.1f}"
+            )
+        lines.append(
+            f"Всего: {self.total_requests} запросов за {self.elapsed:.1f}с, "
+            f"ошибок: {self.error_rate * 100:.2f}%"
+        )
+        return '\n'.join(lines)
+
+
+class LoadRunner:
+    '''Запускает сценарий против APIClient.
+
+    Аргументы:
+        client: APIClient (уже аутентифицированный, если сценарий меняет данные)
+        scenario: имя сценария из SCENARIOS ('ping', 'auth', 'crud')
+        rps: итераций сценария в секунду (открытая модель)
+        concurrency: число потоков (закрытая модель), если rps не задан
+        duration: сколько секунд давать нагрузку
+        max_workers: сколько потоков может одновременно ждать ответа в открытой модели
+        payload_factory: функция, возвращающая данные нового бронирования'''
+    def __init__(self, client, scenario='crud', rps=None, concurrency=None, duration=10,
+                 max_workers=None, payload_factory=random_booking_data):
+        if scenario not in SCENARIOS:
+            raise ValueError(f'Неизвестный сценарий: {scenario}. Доступны: {", ".join(SCENARIOS)}')
+        if not rps and not concurrency:
+            raise ValueError('Нужно задать rps или concurrency')
+        self.client = client
+        self.scenario = SCENARIOS[scenario]
+        self.scenario_name = scenario
+        self.rps = rps
+        self.concurrency = concurrency
+        self.duration = duration
+        self.max_workers = max_workers or default_max_workers(rps, concurrency)
+        self.payload_factory = payload_factory
+        self.stats = LoadStats()
+        # Ошибки самого сценария (не запроса) - отдельной строкой отчёта
+        self.scenario_key = f'scenario {scenario}'
+        self._scenario_errors = 0
+        self._scenario_errors_lock = threading.Lock()
+
+    def _iteration(self, scheduled_at=None):
+        '''Одна итерация сценария.
+
+        Первый шаг считается от запланированного времени старта,
+        остальные - от фактического.'''
+        iteration_start = scheduled_at if scheduled_at is not None else time.perf_counter()
+        next_start = [scheduled_at]
+
+        def step(key, func, *args):
+            start = next_start[0] if next_start[0] is not None else time.perf_counter()
+            next_start[0] = None
+            try:
+                result = func(*args)
+            except Exception as e:
+                self.stats.record(key, time.perf_counter() - start, ok=False)
+                logger.debug(f"💥 {key}: {e}")
+                raise _StepFailed() from e
+            self.stats.record(key, time.perf_counter() - start, ok=True)
+            return result
+
+        try:
+            self.scenario(self.client, step, self.payload_factory)
+        except _StepFailed:
+            pass
+        except Exception as e:
+            # Упал сам сценарий, а не запрос (например, в ответе нет bookingid).
+            # Без этого закрытая модель теряла поток, а открытая - молча глотала ошибку в future
+            self.stats.record(self.scenario_key, time.perf_counter() - iteration_start, ok=False)
+            self._scenario_failed(e)
+
+    def _scenario_failed(self, error):
+        '''Логирует только первую ошибку сценария, остальные видны в отчёте.'''
+        with self._scenario_errors_lock:
+            self._scenario_errors += 1
+            first = self._scenario_errors == 1
+        if first:
+            logger.error(f"💥 Сценарий '{self.scenario_name}' упал: {error!r}, "
+                         f"следующие ошибки - в отчёте ({self.scenario_key})", exc_info=error)
+
+    def _run_open(self):
+        '''Открытая модель: старт итераций строго по расписанию.'''
+        interval = 1 / self.rps
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            started = time.perf_counter()
+            i = 0
+            while True:
+                scheduled_at = started + i * interval
+                if scheduled_at - started >= self.duration:
+                    break
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self._iteration, scheduled_at)
+                i += 1
+        return time.perf_counter() - started
+
+    def _run_closed(self):
+        '''Закрытая модель: concurrency потоков без пауз.'''
+        started = time.perf_counter()
+        deadline = started + self.duration
+
+        def worker():
+            while time.perf_counter() < deadline:
+                self._iteration()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started
+
+    def run(self):
+        '''Даёт нагрузку и возвращает LoadReport.'''
+        mode = f'{self.rps} rps' if self.rps else f'{self.concurrency} потоков'
+        logger.info(f"🚀 Нагрузка: сценарий '{self.scenario_name}', {mode}, {self.duration}с")
+        elapsed = self._run_open() if self.rps else self._run_closed()
+        report = self.stats.report(elapsed)
+        logger.info(f"🏁 Нагрузка завершена: {report.total_requests} запросов, "
+                    f"ошибок {report.error_rate * 100:.2f}%")
+        return report
@@ -0,0 +1,41 @@
+'''Сценарии нагрузки.
+
+Каждый сценарий - это обычная функция, которая делает те же вызовы
+APIClient, что и тесты. Ключ каждого шага - "МЕТОД эндпоинт" из Endpoints,
+например "GET /booking/{id}" (один ключ на все ID).'''
+
+from core.clients.endpoints import Endpoints
+from core.data.booking_data import random_booking_data
+
+PING = f"GET {Endpoints.PING_ENDPOINT.value}"
+AUTH = f"POST {Endpoints.AUTH_ENDPOINT.value}"
+CREATE_BOOKING = f"POST {Endpoints.BOOKING_ENDPOINT.value}"
+GET_BOOKING = f"GET {Endpoints.BOOKING_ENDPOINT.value}/{{id}}"
+UPDATE_BOOKING = f"PUT {Endpoints.BOOKING_ENDPOINT.value}/{{id}}"
+DELETE_BOOKING = f"DELETE {Endpoints.BOOKING_ENDPOINT.value}/{{id}}"
+
+
+def ping_flow(client, step, payload_factory):
+    '''Проверка доступности сервера.'''
+    step(PING, client.ping)
+
+
+def auth_flow(client, step, payload_factory):
+    '''Получение токена (всегда через /auth, мимо кэша токенов).'''
+    step(AUTH, client.auth, False)
+
+
+def crud_flow(client, step, payload_factory):
+    '''Полный цикл: создание -> получение -> обновление -> удаление.'''
+    response = step(CREATE_BOOKING, client.create_booking, payload_factory())
+    booking_id = response.json()['bookingid']
+    step(GET_BOOKING, client.get_booking_by_id, booking_id)
+    step(UPDATE_BOOKING, client.update_booking, booking_id, payload_factory())
+    step(DELETE_BOOKING, client.delete_booking, booking_id)
+
+
+SCENARIOS = {
+    'ping': ping_flow,
+    'auth': auth_flow,
+    'crud': crud_flow,
+}
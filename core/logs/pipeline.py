@@ -0,0 +1,175 @@
+'''Настройка логирования с минимальной ценой для "горячего пути".
+
+Раньше logging.basicConfig писал в stdout прямо из потока запроса,
+а APIClient на каждый запрос собирал f-строки (даже для выключенного DEBUG).
+При тысячах запросов в секунду логирование съедало больше CPU, чем сам
+HTTP-клиент. Здесь:
+- записи кладутся в очередь (QueueHandler), а форматирует и пишет их
+  отдельный поток (QueueListener) - поток запроса не ждёт вывода.
+  Под pytest очередь не используется (use_queue=False): запись
+  выводится сразу, пока pytest перехватывает вывод теста. Поток очереди
+  писал бы позже, мимо перехвата - между точками прогресса;
+- в режиме горячего пути (enable_hot_path: нагрузка, soak, фаззинг) строки
+  "по одной на запрос" (см. hot_path_enabled) выводятся не чаще
+  Logs.HOT_PATH_MODE_RATE раз в секунду, остальные только считаются.
+  В обычных прогонах тестов выводятся все строки;
+- LOG_FORMAT=json - записи в виде JSON (метод, эндпоинт, статус, время).
+
+Переменные окружения:
+    LOG_QUEUE         - on / off (по умолчанию use_queue: on, под pytest off)
+    LOG_HOT_PATH_RATE - сколько строк горячего пути в секунду (0 - без ограничения),
+                        задаёт частоту для любого прогона, в том числе обычного
+    LOG_FORMAT        - text / json (по умолчанию text)'''
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from core.settings.config import Logs
+
+FORMAT = '%(asctime)s | %(name)-25s | %(levelname)-8s | %(message)s'
+
+# Поля, которые клиенты передают через extra (попадают в LOG_FORMAT=json)
+STRUCTURED_FIELDS = ('method', 'endpoint', 'status', 'duration')
+
+_listener = None
+_handler = None
+_hot_path_mode = False
+
+
+class HotPathLimiter:
+    '''Пропускает не больше rate строк горячего пути в секунду (0 - без ограничения).
+
+    Решение принимается ДО вызова logger.info, поэтому для пропущенной
+    строки не создаётся даже LogRecord - остаётся только счётчик suppressed.'''
+    def __init__(self, rate):
+        self.rate = rate
+        self.suppressed = 0
+        self._window = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        if not self.rate:
+            return True
+        window = int(time.monotonic())
+        with self._lock:
+            if window != self._window:
+                self._window, self._count = window, 0
+            if self._count >= self.rate:
+                self.suppressed += 1
+                return False
+            self._count += 1
+            return True
+
+
+hot_path = HotPathLimiter(Logs.HOT_PATH_RATE.value)
+
+
+def _hot_path_rate():
+    '''Частота строк горячего пути: LOG_HOT_PATH_RATE или значение по умолчанию для режима.'''
+    default = Logs.HOT_PATH_MODE_RATE.value if _hot_path_mode else Logs.HOT_PATH_RATE.value
+    return float(os.getenv('LOG_HOT_PATH_RATE', default))
+
+
+def enable_hot_path():
+    '''Режим горячего пути: строки "по одной на запрос" ограничены по частоте.
+    Включают точки входа нагрузки, soak и фаззинга - там тысячи запросов в секунду.'''
+    global _hot_path_mode
+    _hot_path_mode = True
+    hot_path.rate = _hot_path_rate()
+    return hot_path
+
+
+def hot_path_enabled(logger, level=logging.INFO):
+    '''Нужно ли писать строку горячего пути (по строке на запрос).
+
+    Пример:
+        if hot_path_enabled(logger):
+            logger.info("✅ %s %s", method, url)'''
+    return logger.isEnabledFor(level) and hot_path.allow()
+
+
+class JsonFormatter(logging.Formatter):
+    '''Одна запись - одна строка JSON.'''
+    def format(self, record):
+        data = {
+            'time': record.created,
+            'logger': record.name,
+            'level': record.levelname,
+            'message': record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            if hasattr(record, field):
+                data[field] = getattr(record, field)
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    '''QueueHandler, который не форматирует запись сам.
+
+    Стандартный prepare() форматирует сообщение ещё в потоке запроса.
+    Очередь у нас внутри процесса (ничего не нужно сериализовать),
+    поэтому отдаём запись как есть - её отформатирует поток QueueListener.'''
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(level=logging.INFO, stream=None, fmt=FORMAT, use_queue=True):
+    '''Настраивает корневой логгер по переменным окружения (см. описание модуля).
+
+    Аргументы:
+        stream: куда писать (по умолчанию sys.stdout)
+        use_queue: выводить через очередь и отдельный поток (LOG_QUEUE важнее)
+
+    Возвращает ограничитель горячего пути (в нём счётчик пропущенных строк).'''
+    global _listener, _handler
+    stop_logging()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    if os.getenv('LOG_FORMAT', 'text').lower() == 'json':
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(fmt))
+
+    hot_path.rate = _hot_path_rate()
+
+    if os.getenv('LOG_QUEUE', 'on' if use_queue else 'off').lower() == 'off':
+        handler = output
+    else:
+        handler = _DeferredQueueHandler(queue.SimpleQueue())
+        _listener = QueueListener(handler.queue, output)
+        _listener.start()
+        atexit.register(stop_logging)
+
+    root = logging.getLogger()
+    if _handler is not None:
+        root.removeHandler(_handler)  # Повторная настройка заменяет прежний обработчик
+    _handler = handler
+    root.setLevel(level)
+    root.addHandler(handler)
+    return hot_path
+
+
+def queue_size():
+    '''Сколько записей ждёт вывода в очереди (0, если очередь выключена).'''
+    listener = _listener
+    return listener.queue.qsize() if listener is not None else 0
+
+
+def stop_logging():
+    '''Дописывает всё, что осталось в очереди, и останавливает поток вывода.'''
+    global _listener
+    if hot_path.suppressed:
+        logging.getLogger(__name__).info(f"📉 Пропущено строк горячего пути: {hot_path.suppressed}")
+        hot_path.suppressed = 0
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
@@ -0,0 +1,142 @@
+'''Гистограммы времени ответа по эндпоинтам.
+
+Хранить каждое измерение в списке дорого: за длинный прогон их миллионы.
+Гистограмма хранит только счётчики по "корзинам" (как HdrHistogram):
+- до 128 мкс - точное значение,
+- дальше корзины растут вместе со значением, ошибка не больше ~1.6%.
+Вся гистограмма до часа занимает не больше ~3500 корзин.
+
+Ключ - "МЕТОД шаблон", например "GET /booking/{id}": все ID попадают
+в одну гистограмму.'''
+
+import json
+import math
+import re
+import threading
+
+PERCENTILES = (50, 90, 99)
+
+# Сегменты пути из одних цифр - это ID
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_template(endpoint):
+    '''/booking/123 -> /booking/{id}'''
+    return _ID_SEGMENT.sub('/{id}', endpoint.split('?', 1)[0])
+
+
+class LatencyHistogram:
+    '''Гистограмма времени ответа с ограниченной памятью.'''
+    SUB_BUCKET_BITS = 7  # 128 корзин на каждую степень двойки
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    @classmethod
+    def _index(cls, micros):
+        shift = micros.bit_length() - cls.SUB_BUCKET_BITS
+        if shift <= 0:
+            return micros
+        return (shift << cls.SUB_BUCKET_BITS) + (micros >> shift)
+
+    @classmethod
+    def _upper_value(cls, index):
+        '''Наибольшее значение (мкс), которое попадает в корзину index.'''
+        shift = index >> cls.SUB_BUCKET_BITS
+        if shift == 0:
+            return index
+        top = index - (shift << cls.SUB_BUCKET_BITS)
+        return ((top + 1) << shift) - 1
+
+    def record(self, seconds):
+        '''Записывает одно измерение (в секундах).'''
+        index = self._index(int(seconds * 1_000_000))
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + 1
+            self.count += 1
+            self.total += seconds
+            if self.min is None or seconds < self.min:
+                self.min = seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def merge(self, other):
+        '''Добавляет к этой гистограмме все измерения из other.'''
+        with self._lock:
+            for index, count in other.counts.items():
+                self.counts[index] = self.counts.get(index, 0) + count
+            self.count += other.count
+            self.total += other.total
+            if other.min is not None and (self.min is None or other.min < self.min):
+                self.min = other.min
+            self.max = max(self.max, other.max)
+
+    def percentile(self, p):
+        '''Значение p-го перцентиля (0-100) в секундах.'''
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = max(1, math.ceil(p / 100 * self.count))
+            seen = 0
+            for index in sorted(self.counts):
+                seen += self.counts[index]
+                if seen >= target:
+                    # Не больше реального максимума - верхняя граница корзины может его превышать
+                    return min(self._upper_value(index) / 1_000_000, self.max)
+        return self.max
+
+    def summary(self):
+        '''Сводка: количество, среднее, перцентили и максимум (в секундах).'''
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            **{f'p{p}': self.percentile(p) for p in PERCENTILES},
+            'max': self.max,
+        }
+
+
+class LatencyRegistry:
+    '''Набор гистограмм по ключам "МЕТОД шаблон".'''
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+
+    def record(self, method, endpoint, seconds):
+        key = f'{method} {endpoint_template(endpoint)}'
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, LatencyHistogram())
+        histogram.record(seconds)
+
+    def clear(self):
+        with self._lock:
+            self.histograms.clear()
+
+    def summary(self):
+        return {key: self.histograms[key].summary() for key in sorted(self.histograms)}
+
+    def to_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2, sort_keys=True)
+
+    def format_table(self):
+        '''Таблица для вывода в консоль (время в миллисекундах).'''
+        header = f"{'endpoint':<26}{'count':>8}" + ''.join(f"{f'p{p}':>9}" for p in PERCENTILES) + f"{'max':>9}"
+        lines = [header, '-' * len(header)]
+        for key, stats in self.summary().items():
+            lines.append(
+                f"{key:<26}{stats['count']:>8}" +
+                ''.join(f"{stats[f'p{p}'] * 1000:>9.1f}" for p in PERCENTILES) +
+                f"{stats['max'] * 1000:>9.1f}"
+            )
+        return '\n'.join(lines)
+
+
+# Общий реестр: сюда пишут все клиенты, если не передан свой
+registry = LatencyRegistry()
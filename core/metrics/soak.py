@@ -0,0 +1,249 @@
+'''Soak-режим: следим за памятью и соединениями клиента во время долгой нагрузки.
+
+Если процесс с одним APIClient медленно растёт в памяти, по одному RSS
+не понять, кто виноват. SoakSampler раз в interval секунд снимает:
+    rss           - резидентная память процесса (/proc/self/statm)
+    traced        - память Python по tracemalloc (текущая и пик)
+    sockets       - открытые сокеты процесса (/proc/self/fd)
+    pools         - пулы urllib3 во всех адаптерах сессии: сколько
+                    соединений создано, сколько простаивает, сколько запросов
+    responses     - живые requests.Response (их держат, например,
+                    HTTPError.response в сохранённых исключениях)
+    log_queue     - записи, ждущие вывода в очереди логирования
+
+В отчёте - рост каждого показателя за прогон и во второй половине
+(первая половина - прогрев: пулы, кэши, гистограммы), "текучесть"
+соединений (новых соединений на запрос, в норме ~0 при keep-alive)
+и места в коде с наибольшим ростом памяти (tracemalloc, по строкам) -
+от первого фонового замера (после одного interval прогрева) до конца.
+
+Пример:
+    with SoakSampler(client, interval=5) as sampler:
+        LoadRunner(client, scenario='crud', concurrency=4, duration=3600).run()
+    print(sampler.report.format_table())'''
+
+import gc
+import json
+import os
+import threading
+import time
+import tracemalloc
+import requests
+from core.logs.pipeline import queue_size
+from core.settings.config import Soak
+import logging
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+# Показатели, для которых считается рост (последний замер минус первый)
+TRACKED = ('rss', 'traced', 'sockets', 'connections_created', 'idle_connections', 'responses', 'log_queue')
+
+
+def rss_bytes():
+    '''Резидентная память процесса в байтах (None, если /proc недоступен).'''
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def open_sockets():
+    '''Число открытых сокетов процесса (None, если /proc недоступен).'''
+    try:
+        fds = os.listdir('/proc/self/fd')
+    except OSError:
+        return None
+    count = 0
+    for fd in fds:
+        try:
+            if os.readlink(f'/proc/self/fd/{fd}').startswith('socket:'):
+                count += 1
+        except OSError:
+            pass  # Дескриптор закрылся, пока мы смотрели
+    return count
+
+
+def pool_stats(session):
+    '''Сводка по пулам соединений urllib3 во всех адаптерах сессии.'''
+    stats = {'pools': 0, 'connections_created': 0, 'idle_connections': 0, 'pool_requests': 0}
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    for adapter in adapters.values():
+        pools = getattr(getattr(adapter, 'poolmanager', None), 'pools', None)
+        if pools is None:
+            continue
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue  # Пул вытеснили, пока мы смотрели
+            stats['pools'] += 1
+            stats['connections_created'] += pool.num_connections
+            stats['pool_requests'] += pool.num_requests
+            stats['idle_connections'] += pool.pool.qsize() if pool.pool is not None else 0
+    return stats
+
+
+def live_responses():
+    '''Сколько объектов requests.Response сейчас живо.'''
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, requests.Response))
+
+
+class SoakReport:
+    '''Итог soak-прогона.
+
+    Аргументы:
+        samples: замеры (dict) в порядке времени
+        top_growth: места с наибольшим ростом памяти [{'site', 'size_diff', 'count_diff'}]'''
+    def __init__(self, samples, top_growth):
+        self.samples = samples
+        self.top_growth = top_growth
+
+    @property
+    def duration(self):
+        return self.samples[-1]['elapsed'] if self.samples else 0.0
+
+    def growth(self, since=0):
+        '''Рост показателей TRACKED от замера since до последнего.'''
+        if not self.samples:
+            return {}
+        first, last = self.samples[since], self.samples[-1]
+        return {name: last[name] - first[name] for name in TRACKED
+                if first[name] is not None and last[name] is not None}
+
+    @property
+    def second_half_growth(self):
+        '''Рост во второй половине прогона - без прогрева пулов и кэшей.'''
+        return self.growth(since=len(self.samples) // 2)
+
+    @property
+    def churn(self):
+        '''Новых соединений на один запрос за прогон (0 - все запросы по keep-alive).'''
+        growth = self.growth()
+        requests_made = self.samples[-1]['pool_requests'] - self.samples[0]['pool_requests'] if self.samples else 0
+        return growth.get('connections_created', 0) / requests_made if requests_made else 0.0
+
+    def to_dict(self):
+        return {
+            'duration': self.duration,
+            'growth': self.growth(),
+            'second_half_growth': self.second_half_growth,
+            'churn': self.churn,
+            'top_growth': self.top_growth,
+            'samples': self.samples,
+        }
+
+    def to_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+    def format_table(self):
+        '''Таблица для вывода в консоль.'''
+        growth, second_half = self.growth(), self.second_half_growth
+        header = f"{'metric':<22}{'first':>14}{'last':>14}{'growth':>14}{'2nd half':>14}"
+        lines = [header, '-' * len(header)]
+        for name in TRACKED:
+            if name not in growth:
+                continue
+            lines.append(f"{name:<22}{self.samples[0][name]:>14}{self.samples[-1][name]:>14}"
+                         f"{growth[name]:>+14}{second_half[name]:>+14}")
+        lines.append(f"Замеров: {len(self.samples)} за {self.duration:.0f}с, "
+                     f"новых соединений на запрос: {self.churn:.4f}")
+        if self.top_growth:
+            lines.append('Наибольший рост памяти:')
+            lines.extend(f"  {site['size_diff']:>+12} B {site['count_diff']:>+8} блоков  {site['site']}"
+                         for site in self.top_growth)
+        return '\n'.join(lines)
+
+
+class SoakSampler:
+    '''Фоновые замеры памяти, сокетов и пулов клиента.
+
+    Аргументы:
+        client: APIClient, чьи пулы соединений смотрим
+        interval: как часто снимать замеры (секунды)
+        top: сколько мест с наибольшим ростом памяти сохранить в отчёт
+        frames: глубина стека tracemalloc'''
+    def __init__(self, client, interval=Soak.INTERVAL.value, top=Soak.TOP_SITES.value,
+                 frames=Soak.TRACE_FRAMES.value):
+        self.client = client
+        self.interval = interval
+        self.top = top
+        self.frames = frames
+        self.samples = []
+        self.report = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._baseline = None
+        self._started = None
+        self._started_tracing = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        '''Первый замер и запуск фонового потока.'''
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._started = time.perf_counter()
+        self._baseline = self._snapshot()
+        self._sample()
+        self._thread = threading.Thread(target=self._loop, name='soak-sampler', daemon=True)
+        self._thread.start()
+        logger.info(f"🧪 Soak: замеры каждые {self.interval}с")
+
+    def stop(self):
+        '''Последний замер, сравнение памяти с началом. Возвращает SoakReport.'''
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        stats = self._snapshot().compare_to(self._baseline, 'lineno')
+        top_growth = [
+            {'site': str(stat.traceback), 'size_diff': stat.size_diff, 'count_diff': stat.count_diff}
+            for stat in stats[:self.top] if stat.size_diff > 0
+        ]
+        self._baseline = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.report = SoakReport(self.samples, top_growth)
+        logger.info(f"🏁 Soak: {len(self.samples)} замеров, рост во второй половине: {self.report.second_half_growth}")
+        return self.report
+
+    def _loop(self):
+        warmed_up = False
+        while not self._stop.wait(self.interval):
+            self._sample()
+            if not warmed_up:
+                # Рост за первый interval - прогрев (данные Faker, пулы), его не показываем
+                self._baseline = self._snapshot()
+                warmed_up = True
+
+    def _snapshot(self):
+        '''Снимок tracemalloc без памяти самих замеров.'''
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ))
+
+    def _sample(self):
+        traced, traced_peak = tracemalloc.get_traced_memory()
+        sample = {
+            'elapsed': round(time.perf_counter() - self._started, 3),
+            'rss': rss_bytes(),
+            'traced': traced,
+            'traced_peak': traced_peak,
+            'sockets': open_sockets(),
+            **pool_stats(self.client.session),
+            'responses': live_responses(),
+            'log_queue': queue_size(),
+        }
+        self.samples.append(sample)
+        logger.debug(f"🧪 Soak: {sample}")
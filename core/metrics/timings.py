@@ -0,0 +1,93 @@
+'''База длительностей тестов и распределение тестов по воркерам.
+
+После каждого прогона для каждого теста сохраняется (SQLite, один файл):
+- сколько он шёл (скользящее среднее по прогонам),
+- упал ли он в последний раз,
+- какие эндпоинты API он вызывал.
+
+По этим данным тесты делятся между воркерами "сначала самые долгие"
+(LPT - longest processing time first): каждый следующий тест достаётся
+самому свободному воркеру. Так ни один воркер не получает все медленные
+тесты сразу, и прогон заканчивается, когда заканчивается самый
+загруженный воркер - а он загружен не сильно больше остальных.'''
+
+import heapq
+import json
+import sqlite3
+import time
+
+# Вес нового измерения в скользящем среднем
+SMOOTHING = 0.5
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS timings (
+    nodeid TEXT PRIMARY KEY,
+    duration REAL NOT NULL,
+    runs INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    endpoints TEXT NOT NULL
+)'''
+
+
+class TimingDatabase:
+    '''Длительности тестов в SQLite.
+
+    Аргументы:
+        path: путь к файлу базы'''
+    def __init__(self, path):
+        self.path = path
+        # timeout - если базу одновременно пишет другой процесс, подождём
+        self._connection = sqlite3.connect(path, timeout=30)
+        self._connection.execute(_SCHEMA)
+
+    def load(self):
+        '''Все записи: {nodeid: {'duration', 'runs', 'failed', 'endpoints'}}.'''
+        rows = self._connection.execute('SELECT nodeid, duration, runs, failed, endpoints FROM timings')
+        return {
+            nodeid: {'duration': duration, 'runs': runs, 'failed': bool(failed), 'endpoints': json.loads(endpoints)}
+            for nodeid, duration, runs, failed, endpoints in rows
+        }
+
+    def update(self, results):
+        '''Сохраняет результаты прогона.
+
+        Аргументы:
+            results: {nodeid: {'duration': секунды, 'failed': bool, 'endpoints': [...]}}'''
+        now = time.time()
+        with self._connection:  # Одна транзакция на весь прогон
+            known = {
+                nodeid: (duration, runs)
+                for nodeid, duration, runs in self._connection.execute('SELECT nodeid, duration, runs FROM timings')
+            }
+            rows = []
+            for nodeid, result in results.items():
+                duration, runs = known.get(nodeid, (result['duration'], 0))
+                duration += SMOOTHING * (result['duration'] - duration)
+                rows.append((nodeid, duration, runs + 1, int(result['failed']), now,
+                             json.dumps(sorted(result['endpoints']))))
+            self._connection.executemany('INSERT OR REPLACE INTO timings VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+    def close(self):
+        self._connection.close()
+
+
+def lpt_partition(durations, workers):
+    '''Делит тесты между воркерами: самые долгие - первыми, каждому самому свободному.
+
+    Аргументы:
+        durations: {nodeid: ожидаемая длительность}
+        workers: число воркеров
+
+    Возвращает список из workers списков nodeid (внутри - от долгих к коротким)
+    и ожидаемую загрузку каждого воркера.'''
+    buckets = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    heap = [(0.0, index) for index in range(workers)]
+    # Сортировка ещё и по nodeid - чтобы на всех машинах CI разбиение совпало
+    for nodeid in sorted(durations, key=lambda nodeid: (-durations[nodeid], nodeid)):
+        load, index = heapq.heappop(heap)
+        buckets[index].append(nodeid)
+        loads[index] = load + durations[nodeid]
+        heapq.heappush(heap, (loads[index], index))
+    return buckets, loads
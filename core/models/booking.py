@@ -5,7 +5,7 @@ Pydantic автоматически проверяет данные.
 Это быстрее, чем ждать ответ от сервера.'''
 
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from datetime import date
 
 class BookingDates(BaseModel):
@@ -25,4 +25,27 @@ class Booking(BaseModel):
 
 class BookingResponse(BaseModel):
     bookingid: int
-    booking: Booking
\ No newline at end of file
+    booking: Booking
+
+
+class BookingId(BaseModel):
+    '''Элемент списка GET /booking.'''
+    bookingid: int
+
+
+# TypeAdapter-ы проверяют ответ прямо из байтов (validate_json),
+# без промежуточного dict из response.json().
+# Сборка адаптера не бесплатная, поэтому он создаётся при первом обращении
+# (booking_adapter и т.д. - обычные атрибуты модуля) и дальше переиспользуется.
+_ADAPTER_TYPES = {
+    'booking_adapter': Booking,
+    'booking_response_adapter': BookingResponse,
+    'booking_ids_adapter': list[BookingId],
+}
+
+
+def __getattr__(name):
+    if name not in _ADAPTER_TYPES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    adapter = globals()[name] = TypeAdapter(_ADAPTER_TYPES[name])
+    return adapter
@@ -0,0 +1,46 @@
+'''Плагин pytest для кассет (запись/воспроизведение ответов API).
+
+Опции:
+    --cassette-mode off|record|replay
+    --cassette-path cassettes/booking
+
+Опции просто выставляют CASSETTE_MODE/CASSETTE_PATH, которые читает APIClient.
+С включённой кассетой зерно тестовых данных (BOOKING_DATA_SEED) фиксируется,
+чтобы случайные данные совпадали с записанными.
+
+Запись - только без xdist: кассета одна, и воркеры заменяли бы записи друг друга.'''
+
+import os
+import sys
+import pytest
+from core.settings.config import Cassettes
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('cassette', 'запись/воспроизведение ответов API')
+    group.addoption('--cassette-mode', choices=Cassettes.MODES.value, default=None,
+                    help='off - сеть, record - записать кассету, replay - ответы из кассеты')
+    group.addoption('--cassette-path', default=None,
+                    help=f'путь к кассете без расширения (по умолчанию {Cassettes.DEFAULT_PATH.value})')
+
+
+def pytest_configure(config):
+    mode = config.getoption('--cassette-mode')
+    path = config.getoption('--cassette-path')
+    if mode:
+        os.environ['CASSETTE_MODE'] = mode
+    if path:
+        os.environ['CASSETTE_PATH'] = path
+    mode = os.getenv('CASSETTE_MODE', 'off').lower()
+    if mode == 'record' and hasattr(config, 'workerinput'):
+        raise pytest.UsageError('Кассета записывается без xdist: запустите запись без -n')
+    if mode != 'off':
+        os.environ.setdefault('BOOKING_DATA_SEED', '0')
+
+
+def pytest_unconfigure(config):
+    # Записанная кассета заменяет старую при закрытии.
+    # Модуль не импортируем: если его нет, кассеты не открывались
+    cassette = sys.modules.get('core.clients.cassette')
+    if cassette is not None:
+        cassette.close_cassettes()
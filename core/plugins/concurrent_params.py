@@ -0,0 +1,107 @@
+'''Плагин pytest: маркер concurrent_params.
+
+Параметризованные тесты вроде test_create_booking_negative - это N
+независимых запросов, и каждый ждёт полный ответ сервера по очереди.
+С маркером запросы всех параметризаций отправляются сразу, параллельно,
+когда запускается первая из них. Сам тест остаётся отдельным для каждой
+параметризации (свои шаги Allure, свои проверки) - он просто получает
+уже готовый (или почти готовый) ответ через фикстуру concurrent_response.
+
+Пример:
+    @pytest.mark.concurrent_params(lambda client, booking_data: client.create_booking(booking_data))
+    @pytest.mark.parametrize('booking_data', [...])
+    def test_something(concurrent_response, booking_data):
+        response = concurrent_response.result()  # исключение запроса бросится здесь
+
+Функция в маркере получает api_client и параметры теста по именам
+(только те, что есть у неё в сигнатуре). С --targets (core/plugins/targets.py)
+запросы уходят сразу на все цели - каждый через клиент своей цели.
+
+Под xdist запросы заранее не отправляются: у воркера в session.items вся
+коллекция, а какие тесты ему достанутся, планировщик решает по ходу прогона.
+Каждый тест на воркере отправляет только свой запрос.'''
+
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from core.settings.config import Limits
+
+_futures = pytest.StashKey[dict]()
+_dispatched = pytest.StashKey[set]()
+_executor = pytest.StashKey[ThreadPoolExecutor]()
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'concurrent_params(request_phase): запросы всех параметризаций теста отправляются параллельно'
+    )
+    config.stash[_futures] = {}
+    config.stash[_dispatched] = set()
+
+
+def pytest_unconfigure(config):
+    executor = config.stash.get(_executor, None)
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def _group_key(item):
+    '''Параметризации одного теста: один родитель (модуль/класс) и одно имя функции.'''
+    return item.parent.nodeid, getattr(item, 'originalname', item.name)
+
+
+def _submit(config, item, client, client_pool, request_phase):
+    '''Отправляет запрос одной параметризации item в пул и возвращает Future.'''
+    executor = config.stash.get(_executor, None)
+    if executor is None:
+        executor = config.stash[_executor] = ThreadPoolExecutor(
+            max_workers=Limits.BULK_WORKERS.value, thread_name_prefix='concurrent-params')
+
+    names = list(inspect.signature(request_phase).parameters)[1:]
+    params = getattr(item, 'callspec', None)
+    params = params.params if params is not None else {}
+    missing = [name for name in names if name not in params]
+    if missing:
+        raise pytest.UsageError(
+            f'concurrent_params: у {item.nodeid} нет параметров {missing} для функции запроса')
+    kwargs = {name: params[name] for name in names}
+    target = params.get('target')
+    item_client = client_pool.client(target) if target is not None else client
+    return executor.submit(request_phase, item_client, **kwargs)
+
+
+def _dispatch(session, item, client, client_pool, request_phase):
+    '''Отправляет запросы всех параметризаций группы item - один раз за сессию.'''
+    config = session.config
+    futures = config.stash[_futures]
+    key = _group_key(item)
+    config.stash[_dispatched].add(key)
+    for other in session.items:
+        if _group_key(other) == key and other.nodeid not in futures:
+            futures[other.nodeid] = _submit(config, other, client, client_pool, request_phase)
+
+
+def _response_future(session, item, client, client_pool, request_phase):
+    '''Future запроса параметризации item: из уже отправленной группы или новый.'''
+    config = session.config
+    if hasattr(config, 'workerinput'):
+        # Воркер xdist: чужие параметризации он может и не запустить - их ответы
+        # никто бы не забрал, а POST создал бы лишние бронирования
+        return _submit(config, item, client, client_pool, request_phase)
+    if _group_key(item) not in config.stash[_dispatched]:
+        _dispatch(session, item, client, client_pool, request_phase)
+    future = config.stash[_futures].pop(item.nodeid, None)
+    if future is None:
+        # Группа уже отправлена, а своего ответа нет (повторный запуск теста) - только свой запрос
+        future = _submit(config, item, client, client_pool, request_phase)
+    return future
+
+
+@pytest.fixture
+def concurrent_response(request, api_client, client_pool):
+    '''Future с результатом запроса этой параметризации (см. маркер concurrent_params).'''
+    marker = request.node.get_closest_marker('concurrent_params')
+    if marker is None or not marker.args:
+        raise pytest.UsageError('concurrent_response нужен маркер @pytest.mark.concurrent_params(функция)')
+    return _response_future(request.session, request.node, api_client, client_pool, marker.args[0])
@@ -0,0 +1,58 @@
+'''Плагин pytest для фаззинга контракта POST /booking.
+
+Опции:
+    --fuzz-count N    сколько испорченных тел отправить (без опции тест пропускается)
+    --fuzz-seed S     зерно мутаций (тот же S - те же тела)
+    --fuzz-json PATH  куда сохранить классы ответов в JSON
+
+Таблица классов ответов печатается в конце прогона.'''
+
+import pytest
+from core.logs.pipeline import enable_hot_path
+
+_reports = pytest.StashKey[list]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('fuzz', 'фаззинг контракта API')
+    group.addoption('--fuzz-count', type=int, default=None,
+                    help='сколько испорченных тел POST /booking отправить')
+    group.addoption('--fuzz-seed', type=int, default=0,
+                    help='зерно мутаций')
+    group.addoption('--fuzz-json', default=None,
+                    help='куда сохранить классы ответов фаззинга в JSON')
+
+
+def pytest_configure(config):
+    config.stash[_reports] = []
+    if config.getoption('--fuzz-count'):
+        enable_hot_path()  # Строки "на каждый запрос" - с ограничением частоты
+
+
+@pytest.fixture(scope='session')
+def fuzz_options(request):
+    '''Настройки фаззинга. Пропускает тест, если --fuzz-count не задан.'''
+    count = request.config.getoption('--fuzz-count')
+    if not count:
+        pytest.skip('Фаззинг не включён (--fuzz-count)')
+    return {'count': count, 'seed': request.config.getoption('--fuzz-seed')}
+
+
+@pytest.fixture(scope='session')
+def fuzz_reports(request):
+    '''Сюда тесты складывают FuzzReport для итоговой таблицы и --fuzz-json.'''
+    return request.config.stash[_reports]
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    reports = config.stash[_reports]
+    if not reports:
+        return
+    terminalreporter.section('fuzz report')
+    for report in reports:
+        terminalreporter.write_line(report.format_table())
+
+    json_path = config.getoption('--fuzz-json')
+    if json_path:
+        reports[-1].to_json(json_path)
+        terminalreporter.write_line(f'Отчёт сохранён: {json_path}')
@@ -0,0 +1,27 @@
+'''Плагин pytest: отчёт о времени ответа API.
+
+Каждый запрос APIClient/AsyncAPIClient записывается в гистограмму
+по ключу "МЕТОД шаблон". В конце прогона:
+- в консоль печатается таблица p50/p90/p99/max по эндпоинтам,
+- с опцией --latency-json то же самое сохраняется в JSON-файл,
+  чтобы сравнивать сборки между собой (по умолчанию файл не пишется).'''
+
+from core.metrics.latency import registry
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('latency', 'время ответа API')
+    group.addoption('--latency-json', default=None,
+                    help='куда сохранить отчёт о времени ответа в JSON (по умолчанию не сохраняется)')
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not registry.histograms:
+        return
+    terminalreporter.section('latency report (ms)')
+    terminalreporter.write_line(registry.format_table())
+
+    json_path = config.getoption('--latency-json')
+    if json_path:
+        registry.to_json(json_path)
+        terminalreporter.write_line(f'Отчёт сохранён: {json_path}')
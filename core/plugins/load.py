@@ -0,0 +1,142 @@
+'''Плагин pytest для нагрузки.
+
+Добавляет опции:
+    --load-rps, --load-concurrency, --load-duration, --load-scenario, --load-json
+    --soak-duration, --soak-interval, --soak-json
+
+Без этих опций нагрузочные тесты пропускаются. С ними тест
+tests/test_load.py гоняет сценарий через load_client (тот же стенд,
+что у api_client, но пул соединений по числу потоков нагрузки),
+а итоговая таблица печатается в конце прогона.
+С --soak-duration CRUD крутится заданное время под SoakSampler
+(core/metrics/soak.py): память, сокеты и пулы соединений клиента.'''
+
+import json
+import pytest
+from core.logs.pipeline import enable_hot_path
+from core.settings.config import Soak
+
+_reports = pytest.StashKey[list]()
+_soak_reports = pytest.StashKey[list]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('load', 'нагрузка на API')
+    group.addoption('--load-rps', type=float, default=None,
+                    help='итераций сценария в секунду (открытая модель)')
+    group.addoption('--load-concurrency', type=int, default=None,
+                    help='число параллельных потоков (закрытая модель)')
+    group.addoption('--load-duration', type=float, default=10,
+                    help='длительность нагрузки в секундах')
+    group.addoption('--load-scenario', action='append', default=None,
+                    help='сценарий (ping, auth, crud), можно указать несколько раз')
+    group.addoption('--load-json', default=None,
+                    help='куда сохранить отчёт нагрузки в JSON')
+    group.addoption('--soak-duration', type=float, default=None,
+                    help='soak-режим: сколько секунд крутить CRUD с замерами памяти и соединений')
+    group.addoption('--soak-interval', type=float, default=Soak.INTERVAL.value,
+                    help='как часто снимать замеры в soak-режиме (секунды)')
+    group.addoption('--soak-json', default=None,
+                    help='куда сохранить отчёт soak-режима в JSON')
+
+
+def pytest_configure(config):
+    config.stash[_reports] = []
+    config.stash[_soak_reports] = []
+    if any(config.getoption(name) for name in ('--load-rps', '--load-concurrency', '--soak-duration')):
+        enable_hot_path()  # Строки "на каждый запрос" - с ограничением частоты
+
+
+@pytest.fixture(scope='session')
+def load_options(request):
+    '''Настройки нагрузки из командной строки. Пропускает тест, если нагрузка не включена.'''
+    config = request.config
+    rps = config.getoption('--load-rps')
+    concurrency = config.getoption('--load-concurrency')
+    if not rps and not concurrency:
+        pytest.skip('Нагрузка не включена (--load-rps или --load-concurrency)')
+    return {
+        'rps': rps,
+        'concurrency': concurrency,
+        'duration': config.getoption('--load-duration'),
+    }
+
+
+@pytest.fixture(scope='session')
+def load_client(request, api_client):
+    '''APIClient для нагрузки и soak на тот же стенд, что и api_client.
+
+    У api_client пул соединений на Limits.BULK_WORKERS, а открытая модель
+    держит до ceil(rps * таймаут) потоков: лишние соединения выбрасывались бы
+    ("Connection pool is full") и открывались заново. Здесь пул - по числу
+    потоков нагрузки, как в python -m core.load.'''
+    from core.clients.api_client import APIClient
+    from core.load.runner import default_max_workers
+    config = request.config
+    rps = config.getoption('--load-rps')
+    concurrency = config.getoption('--load-concurrency') or (None if rps else Soak.CONCURRENCY.value)
+    client = APIClient(max_workers=default_max_workers(rps, concurrency), latency=api_client.latency,
+                       environment=api_client.environment.name, base_url=api_client.base_url)
+    client.auth()
+    yield client
+    client.resilience.close()
+    client.session.close()
+
+
+@pytest.fixture(scope='session')
+def load_reports(request):
+    '''Сюда тесты складывают отчёты (scenario, LoadReport) для итоговой таблицы.'''
+    return request.config.stash[_reports]
+
+
+@pytest.fixture(scope='session')
+def soak_options(request):
+    '''Настройки soak-режима. Пропускает тест, если --soak-duration не задан.'''
+    config = request.config
+    duration = config.getoption('--soak-duration')
+    if not duration:
+        pytest.skip('Soak-режим не включён (--soak-duration)')
+    return {
+        'duration': duration,
+        'interval': config.getoption('--soak-interval'),
+        'concurrency': config.getoption('--load-concurrency') or Soak.CONCURRENCY.value,
+    }
+
+
+@pytest.fixture(scope='session')
+def soak_reports(request):
+    '''Сюда тесты складывают SoakReport для итоговой таблицы и --soak-json.'''
+    return request.config.stash[_soak_reports]
+
+
+def pytest_generate_tests(metafunc):
+    if 'load_scenario' in metafunc.fixturenames:
+        scenarios = metafunc.config.getoption('--load-scenario') or ['crud']
+        metafunc.parametrize('load_scenario', scenarios)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    soak_reports = config.stash[_soak_reports]
+    if soak_reports:
+        terminalreporter.section('soak report')
+        for report in soak_reports:
+            terminalreporter.write_line(report.format_table())
+        soak_json = config.getoption('--soak-json')
+        if soak_json:
+            # Один прогон - один отчёт; если их несколько, в файле последний
+            soak_reports[-1].to_json(soak_json)
+            terminalreporter.write_line(f'Отчёт сохранён: {soak_json}')
+
+    reports = config.stash[_reports]
+    if not reports:
+        return
+    terminalreporter.section('load report')
+    for scenario, report in reports:
+        terminalreporter.write_line(f'Сценарий: {scenario}')
+        terminalreporter.write_line(report.format_table())
+
+    json_path = config.getoption('--load-json')
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({scenario: report.to_dict() for scenario, report in reports}, f, indent=2, ensure_ascii=False)
+        terminalreporter.write_line(f'Отчёт сохранён: {json_path}')
@@ -0,0 +1,171 @@
+'''Плагин pytest: база длительностей тестов и балансировка по воркерам.
+
+После каждого прогона длительность каждого теста, его результат и
+эндпоинты, которые он вызывал, сохраняются в SQLite: по умолчанию в кэше
+pytest (.pytest_cache/d/timings/timings.sqlite), или в файл --timing-db.
+По этой базе следующий прогон может:
+    --schedule lpt   запускать тесты от долгих к коротким
+                     (так xdist --dist load раздаёт их воркерам ровнее:
+                     в конце остаются только короткие тесты)
+    --shard K/N      запустить только K-ю часть из N. Части собраны
+                     по принципу "самый долгий - самому свободному", поэтому
+                     все N машин CI заканчивают примерно одновременно
+    --failed-first-db  сначала тесты, упавшие в прошлом прогоне
+
+Пример для CI на 4 машинах (.pytest_cache кэшируется между сборками):
+    pytest --shard 1/4 ... pytest --shard 4/4'''
+
+import argparse
+import statistics
+import pytest
+from core.metrics.latency import registry
+from core.metrics.timings import TimingDatabase, lpt_partition
+
+# Ожидаемая длительность теста, о котором в базе ещё ничего нет
+UNKNOWN_DURATION = 1.0
+
+_shard_loads = pytest.StashKey[list]()
+_counts_before = pytest.StashKey[dict]()
+
+# Имя user_property, в котором отчёт теста несёт вызванные эндпоинты
+ENDPOINTS_PROPERTY = 'api_endpoints'
+
+
+def _shard(value):
+    '''"2/4" -> (2, 4)'''
+    try:
+        index, total = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'ожидалось K/N, например 1/4, получено: {value}')
+    if not 1 <= index <= total:
+        raise argparse.ArgumentTypeError(f'номер части должен быть от 1 до {total}: {value}')
+    return index, total
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('scheduling', 'порядок и распределение тестов')
+    group.addoption('--timing-db', default=None,
+                    help='база длительностей тестов (по умолчанию в кэше pytest, пустая строка - не вести)')
+    group.addoption('--schedule', choices=('off', 'lpt'), default='off',
+                    help='lpt - запускать тесты от долгих к коротким')
+    group.addoption('--shard', type=_shard, default=None,
+                    help='K/N - запустить K-ю из N частей, сбалансированных по длительности')
+    group.addoption('--failed-first-db', action='store_true', default=False,
+                    help='сначала тесты, упавшие в прошлом прогоне (по базе длительностей)')
+
+
+def _timing_db_path(config):
+    '''Путь к базе: --timing-db или файл в кэше pytest (None - база не ведётся).'''
+    path = config.getoption('--timing-db')
+    if path is not None:
+        return path or None
+    # Без кэша (-p no:cacheprovider) базу не ведём, а не пишем в корень проекта
+    cache = getattr(config, 'cache', None)
+    if cache is None:
+        return None
+    return str(cache.mkdir('timings') / 'timings.sqlite')
+
+
+def pytest_configure(config):
+    path = _timing_db_path(config)
+    # Воркер xdist базу не пишет, но эндпоинты своих тестов собирает и отправляет в отчётах
+    if path or hasattr(config, 'workerinput'):
+        config.pluginmanager.register(TimingRecorder(config, path), 'timing-recorder')
+
+
+def _expected_durations(items, timings):
+    known = [timings[item.nodeid]['duration'] for item in items if item.nodeid in timings]
+    default = statistics.median(known) if known else UNKNOWN_DURATION
+    return {item.nodeid: timings[item.nodeid]['duration'] if item.nodeid in timings else default
+            for item in items}
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    path = _timing_db_path(config)
+    schedule = config.getoption('--schedule')
+    shard = config.getoption('--shard')
+    failed_first = config.getoption('--failed-first-db')
+    if not path or not (schedule == 'lpt' or shard or failed_first):
+        return
+
+    database = TimingDatabase(path)
+    timings = database.load()
+    database.close()
+    durations = _expected_durations(items, timings)
+
+    if shard:
+        index, total = shard
+        buckets, loads = lpt_partition(durations, total)
+        selected = set(buckets[index - 1])
+        deselected = [item for item in items if item.nodeid not in selected]
+        items[:] = [item for item in items if item.nodeid in selected]
+        config.hook.pytest_deselected(items=deselected)
+        config.stash[_shard_loads] = loads
+
+    # sort устойчивая: при равных значениях порядок сбора сохраняется
+    if schedule == 'lpt':
+        items.sort(key=lambda item: -durations[item.nodeid])
+    if failed_first:
+        items.sort(key=lambda item: not timings.get(item.nodeid, {}).get('failed', False))
+
+
+def _endpoint_counts():
+    return {key: histogram.count for key, histogram in list(registry.histograms.items())}
+
+
+class TimingRecorder:
+    '''Собирает длительности, результаты и эндпоинты тестов и пишет их в базу.
+
+    Под xdist тесты идут на воркерах, а база пишется в главном процессе.
+    Поэтому всё берётся из отчётов (они приходят с воркеров): длительность
+    и результат - из самих отчётов, эндпоинты - из user_properties отчёта teardown.'''
+    def __init__(self, config, path):
+        self.config = config
+        self.path = path
+        self.results = {}
+
+    def _result(self, nodeid):
+        return self.results.setdefault(nodeid, {'duration': 0.0, 'failed': False, 'endpoints': []})
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        item.stash[_counts_before] = _endpoint_counts()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        '''Какие эндпоинты вызывал тест: разница счётчиков гистограмм до setup и перед отчётом teardown.'''
+        before = item.stash.get(_counts_before, None)
+        if call.when == 'teardown' and before is not None:
+            used = [key for key, count in _endpoint_counts().items() if count > before.get(key, 0)]
+            item.user_properties.append((ENDPOINTS_PROPERTY, used))
+        yield
+
+    def pytest_runtest_logreport(self, report):
+        # Отчёты приходят и с воркеров xdist, поэтому всё берём из них
+        result = self._result(report.nodeid)
+        result['duration'] += report.duration
+        result['failed'] = result['failed'] or report.failed
+        for name, value in report.user_properties:
+            if name == ENDPOINTS_PROPERTY:
+                result['endpoints'] = list(value)
+
+    def pytest_sessionfinish(self, session):
+        # На воркерах xdist не пишем - всё запишет главный процесс
+        if not self.results or not self.path or hasattr(self.config, 'workerinput'):
+            return
+        database = TimingDatabase(self.path)
+        database.update(self.results)
+        database.close()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    loads = config.stash.get(_shard_loads, None)
+    if not loads:
+        return
+    index, total = config.getoption('--shard')
+    terminalreporter.section('shard')
+    terminalreporter.write_line(
+        f'Часть {index}/{total}: ожидаемо {loads[index - 1]:.1f}с, '
+        f'части: ' + ', '.join(f'{load:.1f}с' for load in loads)
+    )
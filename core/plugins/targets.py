@@ -0,0 +1,129 @@
+'''Плагин pytest: один прогон на нескольких стендах (целях).
+
+Опции:
+    --targets SPEC       цели через запятую: окружения (TEST,PROD) и/или
+                         имя=URL (replica=https://...); по умолчанию - TARGETS
+    --targets-json PATH  куда сохранить сравнение целей в JSON
+
+С целями каждый тест, которому нужен api_client или async_api_client,
+параметризуется по целям: test_get_booking[TEST], test_get_booking[PROD].
+Параметр сессионный, поэтому pytest группирует тесты по целям, а клиенты
+берутся из ClientPool (core/clients/client_pool.py): у каждой цели свой
+пул соединений и свой токен, токены получаются параллельно. Запросы
+concurrent_params уходят сразу на все цели.
+
+В конце прогона - таблица статусов и p50 по эндпоинтам для всех целей
+рядом и список тестов, которые прошли на одной цели и упали на другой.'''
+
+import json
+import os
+from collections import defaultdict
+import pytest
+
+_targets = pytest.StashKey[list]()
+_pool = pytest.StashKey[object]()
+_nodes = pytest.StashKey[dict]()
+_outcomes = pytest.StashKey[dict]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('targets', 'несколько стендов в одном прогоне')
+    group.addoption('--targets', default=os.getenv('TARGETS'),
+                    help='цели через запятую: TEST,PROD или имя=URL')
+    group.addoption('--targets-json', default=None,
+                    help='куда сохранить сравнение целей в JSON')
+
+
+def pytest_configure(config):
+    spec = config.getoption('--targets')
+    targets = []
+    if spec:
+        # Импорт здесь - без --targets requests не загружается (tests/test_startup.py)
+        from core.clients.client_pool import parse_targets
+        try:
+            targets = parse_targets(spec)
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+    config.stash[_targets] = targets
+    config.stash[_nodes] = {}
+    config.stash[_outcomes] = defaultdict(dict)
+
+
+def pytest_generate_tests(metafunc):
+    targets = metafunc.config.stash[_targets]
+    if targets and 'target' in metafunc.fixturenames:
+        names = [target.name for target in targets]
+        metafunc.parametrize('target', names, ids=names, indirect=True, scope='session')
+
+
+@pytest.fixture(scope='session')
+def target(request):
+    '''Имя цели этого теста (None - прогон без --targets).'''
+    return getattr(request, 'param', None)
+
+
+@pytest.fixture(scope='session')
+def client_pool(request, local_server):
+    '''ClientPool со всеми целями (None - прогон без --targets).'''
+    targets = request.config.stash[_targets]
+    if not targets:
+        yield None
+        return
+
+    from core.clients.client_pool import ClientPool
+    pool = ClientPool(targets)
+    pool.auth_all()
+    request.config.stash[_pool] = pool
+    yield pool
+    pool.close()
+
+
+def pytest_collection_modifyitems(config, items):
+    '''Запоминаем для каждого теста: какой он без цели и на какой цели идёт.'''
+    nodes = config.stash[_nodes]
+    for item in items:
+        callspec = getattr(item, 'callspec', None)
+        name = callspec.params.get('target') if callspec is not None else None
+        if name is None:
+            continue
+        ids = '-'.join(part for part in callspec.id.split('-') if part != name)
+        base = f'{item.parent.nodeid}::{item.originalname}' + (f'[{ids}]' if ids else '')
+        nodes[item.nodeid] = (base, name)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+    '''Результат теста на цели: первая неудачная фаза или итог вызова.'''
+    report = yield
+    node = item.config.stash[_nodes].get(item.nodeid)
+    if node is not None and (report.when == 'call' or report.outcome != 'passed'):
+        base, name = node
+        item.config.stash[_outcomes][base].setdefault(name, report.outcome)
+    return report
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    pool = config.stash.get(_pool, None)
+    if pool is None:
+        return
+    terminalreporter.section('targets report')
+    terminalreporter.write_line(pool.format_table())
+
+    outcomes = config.stash[_outcomes]
+    differing = {base: by_target for base, by_target in outcomes.items()
+                 if len(set(by_target.values())) > 1}
+    if differing:
+        terminalreporter.write_line('Тесты с разным результатом на целях:')
+        for base, by_target in sorted(differing.items()):
+            results = ', '.join(f'{name}={by_target.get(name, "-")}' for name in pool.names)
+            terminalreporter.write_line(f'  {base}: {results}')
+    else:
+        terminalreporter.write_line(f'Результаты тестов совпадают на всех целях ({len(outcomes)} тестов)')
+
+    json_path = config.getoption('--targets-json')
+    if json_path:
+        data = pool.to_dict()
+        data['differing_tests'] = differing
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        terminalreporter.write_line(f'Отчёт сохранён: {json_path}')
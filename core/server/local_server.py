@@ -0,0 +1,438 @@
+'''Локальная замена Restful-Booker для быстрых и стабильных прогонов.
+
+Поднимается в том же процессе, в отдельном потоке, и умеет всё,
+что нужно нашим тестам:
+    GET    /ping                 -> 201
+    POST   /auth                 -> {"token": ...} или {"reason": "Bad credentials"}
+    GET    /booking              -> [{"bookingid": 1}, ...] + фильтры
+                                    firstname, lastname, checkin, checkout
+    GET    /booking/{id}         -> бронирование (с ETag, на If-None-Match - 304) или 404
+    POST   /booking              -> {"bookingid": ..., "booking": {...}}, 500 если не хватает полей
+    PUT    /booking/{id}         -> нужен токен или Basic auth, иначе 403
+    PATCH  /booking/{id}         -> частичное обновление
+    DELETE /booking/{id}         -> 201
+
+Хранилище компактное: каждое бронирование - кортеж, даты - числа (ordinal).
+Для фильтров есть вторичные индексы, поэтому выборка по имени
+не перебирает миллион записей.'''
+
+import base64
+import bisect
+import hashlib
+import json
+import secrets
+import threading
+from collections import defaultdict
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from core.settings.config import LocalServer
+import logging
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ('firstname', 'lastname', 'totalprice', 'depositpaid', 'bookingdates')
+
+# Позиции полей в кортеже бронирования
+FIRSTNAME, LASTNAME, TOTALPRICE, DEPOSITPAID, CHECKIN, CHECKOUT, ADDITIONALNEEDS = range(7)
+
+
+class InvalidBooking(ValueError):
+    '''Данные бронирования не прошли проверку.'''
+
+
+def parse_booking(data, partial_of=None):
+    '''Проверяет данные и превращает их в компактный кортеж.
+
+    Как и настоящий сервер: нет обязательного поля или оно null -> ошибка.
+    partial_of - старый кортеж для PATCH (недостающие поля берутся из него).'''
+    if not isinstance(data, dict):
+        raise InvalidBooking('ожидался JSON-объект')
+    if partial_of is not None:
+        data = {**booking_to_dict(partial_of), **data}
+    for field in FIELDS:
+        if data.get(field) is None:
+            raise InvalidBooking(f'нет поля {field}')
+
+    dates = data['bookingdates']
+    if not isinstance(dates, dict) or dates.get('checkin') is None or dates.get('checkout') is None:
+        raise InvalidBooking('нет дат бронирования')
+    try:
+        checkin = date.fromisoformat(str(dates['checkin'])).toordinal()
+        checkout = date.fromisoformat(str(dates['checkout'])).toordinal()
+        totalprice = int(data['totalprice'])
+    except (TypeError, ValueError) as e:
+        raise InvalidBooking(str(e))
+    if isinstance(data['totalprice'], bool) or not isinstance(data['depositpaid'], bool):
+        raise InvalidBooking('неверный тип поля')
+    if not isinstance(data['firstname'], str) or not isinstance(data['lastname'], str):
+        raise InvalidBooking('неверный тип поля')
+
+    additionalneeds = data.get('additionalneeds')
+    return (data['firstname'], data['lastname'], totalprice, data['depositpaid'],
+            checkin, checkout, None if additionalneeds is None else str(additionalneeds))
+
+
+def booking_to_dict(booking):
+    '''Кортеж -> JSON-объект в формате Restful-Booker.'''
+    result = {
+        'firstname': booking[FIRSTNAME],
+        'lastname': booking[LASTNAME],
+        'totalprice': booking[TOTALPRICE],
+        'depositpaid': booking[DEPOSITPAID],
+        'bookingdates': {
+            'checkin': date.fromordinal(booking[CHECKIN]).isoformat(),
+            'checkout': date.fromordinal(booking[CHECKOUT]).isoformat(),
+        },
+    }
+    if booking[ADDITIONALNEEDS] is not None:
+        result['additionalneeds'] = booking[ADDITIONALNEEDS]
+    return result
+
+
+class _DateIndex:
+    '''Индекс по дате: дата -> множество ID + отсортированный список дат.
+
+    Разных дат намного меньше, чем бронирований, поэтому запрос
+    "дата >= X" - это bisect по датам и объединение нескольких множеств.'''
+    def __init__(self):
+        self.ids_by_day = {}
+        self.days = []
+
+    def add(self, day, booking_id):
+        ids = self.ids_by_day.get(day)
+        if ids is None:
+            ids = self.ids_by_day[day] = set()
+            bisect.insort(self.days, day)
+        ids.add(booking_id)
+
+    def remove(self, day, booking_id):
+        ids = self.ids_by_day[day]
+        ids.discard(booking_id)
+        if not ids:
+            del self.ids_by_day[day]
+            del self.days[bisect.bisect_left(self.days, day)]
+
+    def count_from(self, day):
+        start = bisect.bisect_left(self.days, day)
+        return sum(len(self.ids_by_day[d]) for d in self.days[start:])
+
+    def ids_from(self, day):
+        start = bisect.bisect_left(self.days, day)
+        result = set()
+        for d in self.days[start:]:
+            result |= self.ids_by_day[d]
+        return result
+
+
+class BookingStore:
+    '''Потокобезопасное хранилище бронирований с индексами.'''
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bookings = {}
+        self._next_id = 1
+        self._by_firstname = defaultdict(set)
+        self._by_lastname = defaultdict(set)
+        self._by_checkin = _DateIndex()
+        self._by_checkout = _DateIndex()
+
+    def __len__(self):
+        return len(self._bookings)
+
+    def _index(self, booking_id, booking):
+        self._by_firstname[booking[FIRSTNAME]].add(booking_id)
+        self._by_lastname[booking[LASTNAME]].add(booking_id)
+        self._by_checkin.add(booking[CHECKIN], booking_id)
+        self._by_checkout.add(booking[CHECKOUT], booking_id)
+
+    def _unindex(self, booking_id, booking):
+        for index, key in ((self._by_firstname, booking[FIRSTNAME]), (self._by_lastname, booking[LASTNAME])):
+            ids = index[key]
+            ids.discard(booking_id)
+            if not ids:
+                del index[key]
+        self._by_checkin.remove(booking[CHECKIN], booking_id)
+        self._by_checkout.remove(booking[CHECKOUT], booking_id)
+
+    def create(self, booking):
+        with self._lock:
+            booking_id = self._next_id
+            self._next_id += 1
+            self._bookings[booking_id] = booking
+            self._index(booking_id, booking)
+        return booking_id
+
+    def get(self, booking_id):
+        return self._bookings.get(booking_id)
+
+    def replace(self, booking_id, booking):
+        '''Заменяет бронирование. False, если его нет.'''
+        with self._lock:
+            old = self._bookings.get(booking_id)
+            if old is None:
+                return False
+            self._unindex(booking_id, old)
+            self._bookings[booking_id] = booking
+            self._index(booking_id, booking)
+        return True
+
+    def delete(self, booking_id):
+        '''Удаляет бронирование. False, если его нет.'''
+        with self._lock:
+            old = self._bookings.pop(booking_id, None)
+            if old is None:
+                return False
+            self._unindex(booking_id, old)
+        return True
+
+    def search(self, firstname=None, lastname=None, checkin=None, checkout=None):
+        '''ID бронирований, подходящих под все фильтры (по возрастанию).
+
+        checkin/checkout - даты (date): бронирования с датой >= заданной.'''
+        with self._lock:
+            if firstname is None and lastname is None and checkin is None and checkout is None:
+                # ID выдаются по возрастанию, словарь хранит порядок вставки
+                return list(self._bookings)
+
+            # Кандидаты берём из самого маленького индекса,
+            # остальные фильтры проверяем по самим записям
+            candidates = []
+            if firstname is not None:
+                candidates.append((len(self._by_firstname.get(firstname, ())), lambda: self._by_firstname.get(firstname, set())))
+            if lastname is not None:
+                candidates.append((len(self._by_lastname.get(lastname, ())), lambda: self._by_lastname.get(lastname, set())))
+            if checkin is not None:
+                checkin = checkin.toordinal()
+                candidates.append((self._by_checkin.count_from(checkin), lambda: self._by_checkin.ids_from(checkin)))
+            if checkout is not None:
+                checkout = checkout.toordinal()
+                candidates.append((self._by_checkout.count_from(checkout), lambda: self._by_checkout.ids_from(checkout)))
+            ids = min(candidates, key=lambda c: c[0])[1]()
+
+            result = []
+            for booking_id in ids:
+                booking = self._bookings[booking_id]
+                if firstname is not None and booking[FIRSTNAME] != firstname:
+                    continue
+                if lastname is not None and booking[LASTNAME] != lastname:
+                    continue
+                if checkin is not None and booking[CHECKIN] < checkin:
+                    continue
+                if checkout is not None and booking[CHECKOUT] < checkout:
+                    continue
+                result.append(booking_id)
+        result.sort()
+        return result
+
+
+def _etag(body):
+    '''Слабый ETag в формате Express: W/"длина-хэш".'''
+    digest = base64.b64encode(hashlib.sha1(body).digest()).decode('ascii')[:27]
+    return f'W/"{len(body):x}-{digest}"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    '''Обработчик запросов. Сервер (self.server) хранит store, токены и учётные данные.'''
+    protocol_version = 'HTTP/1.1'
+    # Без этого ответ уходит двумя пакетами и ждёт delayed ACK (~40 мс на запрос)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # Вызывается на каждый запрос: строка собирается, только если debug включён
+        logger.debug('🖥️ %s ' + format, self.address_string(), *args)
+
+    # --- ответы ---
+
+    def _send(self, status, body=b'', content_type='text/plain; charset=utf-8', headers=None):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.send_response(status)
+        if status != 304:  # У 304 тела нет
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, data):
+        self._send(status, json.dumps(data, separators=(',', ':')), 'application/json; charset=utf-8')
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            return json.loads(raw) if raw else None
+        except ValueError:
+            return None
+
+    # --- авторизация ---
+
+    def _authorized(self):
+        server = self.server
+        if server.username is None:
+            return True
+        cookie = self.headers.get('Cookie') or ''
+        for part in cookie.split(';'):
+            name, _, value = part.strip().partition('=')
+            if name == 'token' and value in server.tokens:
+                return True
+        header = self.headers.get('Authorization') or ''
+        if header.startswith('Basic '):
+            try:
+                credentials = base64.b64decode(header[6:]).decode('utf-8')
+            except ValueError:
+                return False
+            return credentials == f'{server.username}:{server.password}'
+        return False
+
+    # --- маршрутизация ---
+
+    def _booking_id(self, path):
+        '''/booking/12 -> 12, иначе None.'''
+        prefix, _, tail = path.rpartition('/')
+        if prefix == '/booking' and tail.isdigit():
+            return int(tail)
+        return None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/ping':
+            return self._send(201, 'Created')
+        if url.path == '/booking':
+            return self._list(parse_qs(url.query))
+        booking_id = self._booking_id(url.path)
+        if booking_id is None:
+            return self._send(404, 'Not Found')
+        booking = self.server.store.get(booking_id)
+        if booking is None:
+            return self._send(404, 'Not Found')
+        body = json.dumps(booking_to_dict(booking), separators=(',', ':')).encode('utf-8')
+        # ETag как у Express (на нём работает Restful-Booker): на If-None-Match отвечаем 304
+        etag = _etag(body)
+        if self.headers.get('If-None-Match') == etag:
+            return self._send(304, headers={'ETag': etag})
+        self._send(200, body, 'application/json; charset=utf-8', headers={'ETag': etag})
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        data = self._read_json()
+        if path == '/auth':
+            server = self.server
+            data = data if isinstance(data, dict) else {}
+            if server.username is None or (
+                    data.get('username') == server.username and data.get('password') == server.password):
+                token = secrets.token_hex(8)[:15]
+                server.tokens.add(token)
+                return self._send_json(200, {'token': token})
+            return self._send_json(200, {'reason': 'Bad credentials'})
+        if path != '/booking':
+            return self._send(404, 'Not Found')
+        try:
+            booking = parse_booking(data)
+        except InvalidBooking:
+            return self._send(500, 'Internal Server Error')
+        booking_id = self.server.store.create(booking)
+        self._send_json(200, {'bookingid': booking_id, 'booking': booking_to_dict(booking)})
+
+    def _update(self, partial):
+        booking_id = self._booking_id(urlsplit(self.path).path)
+        data = self._read_json()
+        if booking_id is None:
+            return self._send(404, 'Not Found')
+        if not self._authorized():
+            return self._send(403, 'Forbidden')
+        store = self.server.store
+        old = store.get(booking_id)
+        if old is None:
+            return self._send(405, 'Method Not Allowed')
+        try:
+            booking = parse_booking(data, partial_of=old if partial else None)
+        except InvalidBooking:
+            return self._send(400, 'Bad Request')
+        if not store.replace(booking_id, booking):
+            return self._send(405, 'Method Not Allowed')
+        self._send_json(200, booking_to_dict(booking))
+
+    def do_PUT(self):
+        self._update(partial=False)
+
+    def do_PATCH(self):
+        self._update(partial=True)
+
+    def do_DELETE(self):
+        booking_id = self._booking_id(urlsplit(self.path).path)
+        if booking_id is None:
+            return self._send(404, 'Not Found')
+        if not self._authorized():
+            return self._send(403, 'Forbidden')
+        if not self.server.store.delete(booking_id):
+            return self._send(405, 'Method Not Allowed')
+        self._send(201, 'Created')
+
+    def _list(self, query):
+        filters = {}
+        for name in ('firstname', 'lastname'):
+            if name in query:
+                filters[name] = query[name][0]
+        for name in ('checkin', 'checkout'):
+            if name in query:
+                try:
+                    filters[name] = date.fromisoformat(query[name][0])
+                except ValueError:
+                    return self._send(500, 'Internal Server Error')
+        ids = self.server.store.search(**filters)
+        self._send_json(200, [{'bookingid': booking_id} for booking_id in ids])
+
+
+class _Server(ThreadingHTTPServer):
+    '''ThreadingHTTPServer с длинной очередью входящих соединений.
+
+    По умолчанию socketserver слушает с очередью 5: при 64 одновременных
+    клиентах лишние SYN отбрасываются, и соединение ждёт повтора ~1с.'''
+    request_queue_size = LocalServer.LISTEN_BACKLOG.value
+
+
+class LocalBookingServer:
+    '''Локальный сервер бронирований в отдельном потоке.
+
+    Аргументы:
+        host, port: где слушать (port=0 - любой свободный порт)
+        username, password: учётные данные для /auth и Basic auth.
+                            Если username=None - авторизация не проверяется.'''
+    def __init__(self, host='127.0.0.1', port=0, username=None, password=None):
+        self.httpd = _Server((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.store = BookingStore()
+        self.httpd.tokens = set()
+        self.httpd.username = username
+        self.httpd.password = password
+        self._thread = None
+
+    @property
+    def store(self):
+        return self.httpd.store
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='local-booking-server', daemon=True)
+        self._thread.start()
+        logger.info(f"🖥️ Локальный сервер запущен: {self.url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        logger.info("🖥️ Локальный сервер остановлен")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -9,4 +9,79 @@ class Users(Enum):
 
 class Timeouts(Enum):
     DEFAULT = 5
-    LONG = 10
\ No newline at end of file
+    LONG = 10
+
+class Limits(Enum):
+    MAX_CONCURRENCY = 100  # Сколько запросов асинхронный клиент держит "в полёте"
+    BULK_WORKERS = 32  # Сколько потоков выполняют массовые операции APIClient
+
+
+class Tokens(Enum):
+    TTL = 600  # Сколько секунд токен из кэша считается действительным
+    REFRESH_MARGIN = 30  # За сколько секунд до истечения токен обновляется заранее
+
+
+class Pool(Enum):
+    SIZE = 20  # Сколько бронирований пул создаёт заранее
+    MAX_SHARED = 5  # Сколько бронирований делят между собой тесты "только для чтения"
+
+
+class Streaming(Enum):
+    CHUNK_SIZE = 64 * 1024  # Размер куска при потоковом чтении ответа (байт)
+    FETCH_BATCH = 32  # Сколько полных записей загружается одновременно в list_bookings(fetch=True)
+
+
+class LocalServer(Enum):
+    LISTEN_BACKLOG = 1024  # Очередь входящих соединений локального сервера (по умолчанию в socketserver - 5)
+
+
+class Cassettes(Enum):
+    MODES = ('off', 'record', 'replay')  # Режимы CASSETTE_MODE / --cassette-mode
+    DEFAULT_PATH = 'cassettes/booking'  # Путь к кассете без расширения (.data / .idx)
+
+
+class Startup(Enum):
+    IMPORT_BUDGET_MS = 150  # Сколько мс можно тратить на импорт conftest и плагинов (без самого pytest)
+    HEAVY_MODULES = ('requests', 'httpx', 'pydantic', 'dotenv', 'faker')  # Только по первому обращению
+
+
+class Logs(Enum):
+    HOT_PATH_RATE = 0  # Сколько строк "горячего пути" (по строке на запрос) в секунду в обычном прогоне (0 - все)
+    HOT_PATH_MODE_RATE = 20  # То же в режиме горячего пути (нагрузка, soak, фаззинг)
+
+
+class Resilience(Enum):
+    RETRY_ATTEMPTS = 3  # Сколько всего попыток у идемпотентного запроса (GET, PUT, DELETE)
+    BACKOFF = 0.05  # Пауза перед первым повтором (секунды), дальше удваивается
+    MAX_BACKOFF = 1.0  # Самая длинная пауза между повторами (секунды)
+    FAILURE_THRESHOLD = 5  # После скольких ошибок подряд предохранитель размыкается
+    RESET_TIMEOUT = 5  # Через сколько секунд после размыкания пробуем снова
+    HEDGE_PERCENTILE = 95  # Копия GET отправляется, если ответа нет дольше этого перцентиля
+    HEDGE_MIN_SAMPLES = 20  # Сколько ответов нужно увидеть, чтобы доверять перцентилю
+    HEDGE_WORKERS = 64  # Потоки для хеджированных запросов синхронного клиента
+
+
+class Soak(Enum):
+    INTERVAL = 5  # Как часто (секунды) снимаются замеры памяти, сокетов и пулов
+    TOP_SITES = 10  # Сколько мест с наибольшим ростом памяти попадает в отчёт
+    TRACE_FRAMES = 1  # Глубина стека tracemalloc (больше - точнее, но медленнее)
+    MAX_GROWTH = 5 * 1024 * 1024  # Допустимый рост памяти (байт) во второй половине прогона
+    CONCURRENCY = 4  # Потоков CRUD в soak-режиме, если не задан --load-concurrency
+
+
+class Fuzz(Enum):
+    COUNT = 2000  # Сколько испорченных тел отправляет фаззинг POST /booking
+    BATCH = 256  # Сколько запросов фаззинга в полёте за один заход (память на ответы)
+    MAX_STRING = 1024 * 1024  # Длина "огромной" строки (символов)
+    LATENCY_BANDS = (0.1, 0.5, 2.0)  # Границы полос времени ответа (секунды) для классов ответов
+    EXPECTED_STATUSES = (200, 400, 500)  # Статусы, которые POST /booking может вернуть на любые данные
+
+
+class HttpCache(Enum):
+    MAX_BYTES = 8 * 1024 * 1024  # Сколько байт ответов держит кэш GET (HTTP_CACHE=on)
+    MAX_ENTRIES = 10_000  # Сколько ответов держит кэш GET
+
+
+class Targets(Enum):
+    LATENCY_RATIO = 1.5  # Во сколько раз p50 эндпоинта на целях может различаться без пометки в отчёте
+    MIN_SAMPLES = 5  # Меньше ответов на какой-то цели - время эндпоинта не сравниваем (шум)
@@ -4,4 +4,22 @@ from enum import Enum
 
 class Environment(Enum):
     TEST = 'test'
-    PROD = 'production'
\ No newline at end of file
+    PROD = 'production'
+    LOCAL = 'local'  # Локальный сервер из core/server/local_server.py
+
+
+_env_loaded = False
+
+
+def load_env():
+    '''Загружает переменные из .env (один раз на процесс).
+
+    Вызывается при создании клиента, а не при импорте модуля:
+    сбор тестов и тесты без клиента не тратят на это время.
+    Уже заданные переменные окружения .env не перезаписывает.'''
+    global _env_loaded
+    if _env_loaded:
+        return
+    from dotenv import load_dotenv
+    load_dotenv()
+    _env_loaded = True
@@ -0,0 +1,57 @@
+'''Тесты для асинхронного клиента.'''
+
+import asyncio
+import allure
+import pytest
+import requests
+from core.models.booking import BookingResponse, Booking
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@allure.feature('Async client')
+@allure.story('Ping: Server is available')
+@pytest.mark.asyncio
+async def test_async_ping_success(async_api_client):
+    '''Проверка, что сервер доступен через асинхронный клиент.'''
+    response = await async_api_client.ping()
+    assert response.status_code == 201, f'❌ Ожидали 201, получили {response.status_code}'
+
+
+@allure.feature('Async client')
+@allure.story('Positive: Create bookings concurrently')
+@pytest.mark.asyncio
+async def test_async_create_bookings_concurrently(async_api_client, generate_random_booking_data):
+    '''Несколько бронирований создаются одновременно, каждое - корректно.'''
+    booking_data = generate_random_booking_data
+
+    with allure.step('1. Отправка 10 запросов одновременно'):
+        responses = await asyncio.gather(
+            *(async_api_client.create_booking(booking_data) for _ in range(10))
+        )
+
+    with allure.step('2. Проверка ответов'):
+        expected_booking = Booking(**booking_data)
+        booking_ids = set()
+        for response in responses:
+            assert response.status_code == 200, f'❌ Получили {response.status_code}, ожидали 200'
+            response_model = BookingResponse(**response.json())
+            assert response_model.booking == expected_booking
+            booking_ids.add(response_model.bookingid)
+        assert len(booking_ids) == 10, '❌ ID бронирований должны быть уникальными'
+        logger.info(f"✅ Создано бронирований: {len(booking_ids)}")
+
+    with allure.step('3. Удаление созданных бронирований'):
+        await asyncio.gather(*(async_api_client.delete_booking(i) for i in booking_ids))
+
+
+@allure.feature('Async client')
+@allure.story('Negative: Create booking with invalid data')
+@pytest.mark.asyncio
+async def test_async_create_booking_negative(async_api_client):
+    '''Ошибка сервера превращается в requests.exceptions.HTTPError, как у APIClient.'''
+    with pytest.raises(requests.exceptions.HTTPError) as e:
+        await async_api_client.create_booking({"lastname": "Brown"})
+
+    assert e.value.response.status_code == 500
@@ -0,0 +1,51 @@
+'''Тесты для сравнения отчётов бенчмарков.'''
+
+import allure
+from benchmarks.compare import compare
+from benchmarks.suite import crud_scaling
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _report(**results):
+    return {'results': {name: {'value': value, 'unit': unit, 'higher_is_better': higher}
+                        for name, (value, unit, higher) in results.items()}}
+
+
+@allure.feature('Benchmarks')
+@allure.story('Compare: Regressions respect the direction of the metric')
+def test_compare_flags_regressions():
+    '''Падение ops/s и рост us/request больше порога - регрессии, остальное - нет.'''
+    baseline = _report(throughput=(1000, 'ops/s', True), overhead=(100, 'us/request', False),
+                       stable=(500, 'ops/s', True), removed=(1, 'ops/s', True))
+    current = _report(throughput=(800, 'ops/s', True), overhead=(130, 'us/request', False),
+                      stable=(480, 'ops/s', True), added=(1, 'ops/s', True))
+
+    rows = {row['name']: row for row in compare(baseline, current, threshold=0.1)}
+
+    assert set(rows) == {'throughput', 'overhead', 'stable'}, f'❌ Сравнены не те бенчмарки: {set(rows)}'
+    assert rows['throughput']['regression'] and rows['overhead']['regression']
+    assert not rows['stable']['regression'], f"❌ Изменение {rows['stable']['change']:.1%} в пределах порога"
+    logger.info(f"✅ Регрессии: {[name for name, row in rows.items() if row['regression']]}")
+
+
+@allure.feature('Benchmarks')
+@allure.story('Compare: Throughput scaling with threads has a baseline')
+def test_crud_scaling_is_compared():
+    '''crud_scaling - отношение c64 к c1; его падение относительно базового отчёта - регрессия.'''
+    def results(c1, c8, c64):
+        return _report(crud_c1=(c1, 'iterations/s', True), crud_c8=(c8, 'iterations/s', True),
+                       crud_c64=(c64, 'iterations/s', True))['results']
+
+    assert crud_scaling({'crud_c8': {'value': 100}}) is None, '❌ Отношение из одного измерения'
+    baseline_results = results(188, 190, 150)
+    current_results = results(188, 190, 120)
+    scaling = crud_scaling(baseline_results)
+    assert scaling.value == 150 / 188 and scaling.unit == 'x c64/c1'
+
+    baseline = {'results': {'crud_scaling': vars(scaling)}}
+    current = {'results': {'crud_scaling': vars(crud_scaling(current_results))}}
+    row, = compare(baseline, current, threshold=0.1)
+    assert row['regression'], f"❌ Падение масштабирования на {row['change']:.1%} не замечено"
+    logger.info(f"✅ Масштабирование: {row['baseline']:.2f} -> {row['current']:.2f}")
@@ -0,0 +1,47 @@
+'''Тесты для генератора данных бронирований.'''
+
+import json
+from datetime import datetime
+import allure
+from core.data.booking_data import BookingDataGenerator
+import logging
+
+logger = logging.getLogger(__name__)
+
+TODAY = datetime(2030, 1, 1)
+
+
+@allure.feature('Test data')
+@allure.story('Generator: Same seed gives the same data')
+def test_generator_is_reproducible_by_seed():
+    '''Одно зерно - одинаковые batch и batch_json, другое зерно - другие данные.'''
+    first, second = BookingDataGenerator(seed=42, today=TODAY), BookingDataGenerator(seed=42, today=TODAY)
+    assert first.batch(200) == second.batch(200)
+    assert first.batch_json(200) == second.batch_json(200)
+    assert [first() for _ in range(5)] == [second() for _ in range(5)]
+
+    other = BookingDataGenerator(seed=43, today=TODAY)
+    assert BookingDataGenerator(seed=42, today=TODAY).batch(200) != other.batch(200)
+    assert BookingDataGenerator(seed=42, today=TODAY).batch_json(200) != other.batch_json(200)
+
+    # batch_json - те же бронирования, что batch, только сразу в байтах
+    as_dicts = BookingDataGenerator(seed=7, today=TODAY).batch(50)
+    as_json = BookingDataGenerator(seed=7, today=TODAY).batch_json(50)
+    assert [json.loads(payload) for payload in as_json] == as_dicts
+    logger.info("✅ Данные воспроизводятся по зерну")
+
+
+@allure.feature('Test data')
+@allure.story('Generator: Pre-serialized payloads are posted as is')
+def test_create_booking_from_json_bytes(api_client):
+    '''Байты из batch_json отправляются без повторной сериализации и создают те же бронирования.'''
+    payloads = BookingDataGenerator(seed=11).batch_json(3)
+    results = api_client.create_bookings(payloads)
+    try:
+        for payload, result in zip(payloads, results):
+            assert result.ok, f'❌ Бронирование не создано: {result.error}'
+            created = result.response.json()
+            assert created['booking'] == json.loads(payload), f'❌ Сервер сохранил {created["booking"]}'
+    finally:
+        api_client.delete_bookings([result.response.json()['bookingid'] for result in results if result.ok])
+    logger.info("✅ Бронирования созданы из готовых JSON-байтов")
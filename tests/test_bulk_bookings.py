@@ -0,0 +1,48 @@
+'''Тесты для массовых операций с бронированиями.'''
+
+import allure
+import requests
+from core.models.booking import BookingResponse, Booking
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@allure.feature('Bulk bookings')
+@allure.story('Positive: Create, get and delete bookings in bulk')
+def test_bulk_create_get_delete(api_client, generate_random_booking_data):
+    '''Массовые операции возвращают результаты в порядке входных данных.'''
+    bookings_data = [dict(generate_random_booking_data, totalprice=100 + i) for i in range(20)]
+
+    with allure.step('1. Массовое создание'):
+        created = api_client.create_bookings(bookings_data)
+        assert all(result.ok for result in created), '❌ Не все бронирования созданы'
+        booking_ids = [BookingResponse(**result.response.json()).bookingid for result in created]
+
+    with allure.step('2. Массовое получение - порядок совпадает с ID'):
+        fetched = api_client.get_bookings(booking_ids)
+        for booking_data, result in zip(bookings_data, fetched):
+            assert result.ok
+            assert Booking(**result.response.json()) == Booking(**booking_data)
+
+    with allure.step('3. Массовое удаление'):
+        deleted = api_client.delete_bookings(booking_ids)
+        assert all(result.ok for result in deleted), '❌ Не все бронирования удалены'
+        logger.info(f"✅ Удалено бронирований: {len(deleted)}")
+
+
+@allure.feature('Bulk bookings')
+@allure.story('Negative: One invalid booking does not stop the others')
+def test_bulk_create_partial_failure(api_client, generate_random_booking_data):
+    '''Ошибка одного запроса попадает в результат, остальные выполняются.'''
+    results = api_client.create_bookings([
+        generate_random_booking_data,
+        {"lastname": "Brown"},
+        generate_random_booking_data,
+    ])
+
+    assert [result.ok for result in results] == [True, False, True]
+    assert isinstance(results[1].error, requests.exceptions.HTTPError)
+    assert results[1].error.response.status_code == 500
+
+    api_client.delete_bookings(r.response.json()['bookingid'] for r in results if r.ok)
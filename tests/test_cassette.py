@@ -0,0 +1,110 @@
+'''Тесты для кассет: запись ответов и воспроизведение без сети.'''
+
+from types import SimpleNamespace
+import allure
+import pytest
+from core.clients.api_client import APIClient
+from core.clients.cassette import Cassette, CassetteMissError, request_key
+from core.metrics.latency import LatencyRegistry
+from core.plugins import cassette as cassette_plugin
+from core.server.local_server import LocalBookingServer
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _client(server_url, monkeypatch, mode, path):
+    '''Клиент с кассетой в режиме mode (отдельный реестр времени, без кэша токенов).'''
+    monkeypatch.setenv('CASSETTE_MODE', mode)
+    monkeypatch.setenv('CASSETTE_PATH', str(path))
+    return APIClient(max_workers=4, latency=LatencyRegistry(), base_url=server_url)
+
+
+def _calls(client, booking_data):
+    '''Одинаковая серия запросов для записи и воспроизведения, в том числе потоковый список.'''
+    booking_id = client.create_booking(booking_data).json()['bookingid']
+    booking = client.get_booking_by_id(booking_id).json()
+    ids = list(client.list_bookings())  # stream=True
+    return booking_id, booking, ids
+
+
+@allure.feature('Cassette')
+@allure.story('Record and replay: Replay answers without the server')
+def test_cassette_record_replay_round_trip(generate_random_booking_data, monkeypatch, tmp_path):
+    '''Записанная серия запросов воспроизводится при остановленном сервере, включая stream=True.'''
+    path = tmp_path / 'booking'
+    server = LocalBookingServer().start()
+    try:
+        recorder = _client(server.url, monkeypatch, 'record', path)
+        recorded = _calls(recorder, generate_random_booking_data)
+        recorder.session.get_adapter(server.url).cassette.close()
+    finally:
+        server.stop()
+
+    player = _client(server.url, monkeypatch, 'replay', path)
+    replayed = _calls(player, generate_random_booking_data)
+
+    assert replayed == recorded, f'❌ Воспроизведено {replayed}, записано {recorded}'
+    assert recorded[2] == [recorded[0]], '❌ Потоковый список не совпал с созданным бронированием'
+
+    with pytest.raises(CassetteMissError):
+        player.ping()  # Этого запроса не записывали
+    logger.info(f"✅ Воспроизведено без сервера: {replayed}")
+
+
+@allure.feature('Cassette')
+@allure.story('Record and replay: Keys separate hosts')
+def test_request_key_separates_hosts():
+    '''Разные хосты (и схемы) - разные ключи; порт и порядок полей JSON ключ не меняют.'''
+    body = b'{"firstname": "Anna", "totalprice": 1}'
+    key = request_key('POST', 'http://127.0.0.1:8001/booking', body)
+
+    assert key == request_key('post', 'http://127.0.0.1:9002/booking', b'{"totalprice":1,"firstname":"Anna"}')
+    assert key != request_key('POST', 'http://staging.example.com/booking', body)
+    assert key != request_key('POST', 'https://127.0.0.1:8001/booking', body)
+    assert key != request_key('POST', 'http://127.0.0.1:8001/booking?x=1', body)
+
+
+def _record(path, body):
+    '''Кассета с одним ответом body на GET /ping (ещё не закрытая).'''
+    cassette = Cassette(str(path), 'record')
+    cassette.append(request_key('GET', 'http://127.0.0.1/ping', None), 201, 'Created', {}, body)
+    return cassette
+
+
+@allure.feature('Cassette')
+@allure.story('Record and replay: An unfinished recording keeps the old cassette')
+def test_recording_replaces_cassette_on_close(tmp_path):
+    '''Пока запись не закрыта, на диске старая кассета; close() подменяет её целиком.'''
+    path = tmp_path / 'booking'
+    _record(path, b'old').close()
+    recorded = (path.with_suffix('.data').read_bytes(), path.with_suffix('.idx').read_bytes())
+
+    recorder = _record(path, b'new')
+    assert (path.with_suffix('.data').read_bytes(), path.with_suffix('.idx').read_bytes()) == recorded, \
+        '❌ Незаконченная запись испортила готовую кассету'
+    recorder.close()
+    recorder.close()  # Повторное закрытие (при выходе из процесса) ничего не ломает
+
+    assert sorted(file.name for file in tmp_path.iterdir()) == ['booking.data', 'booking.idx'], \
+        f'❌ Остались временные файлы: {list(tmp_path.iterdir())}'
+    player = Cassette(str(path), 'replay')
+    try:
+        *_, body = player.lookup(request_key('GET', 'http://127.0.0.1/ping', None), 'GET /ping')
+    finally:
+        player.close()
+    assert body == b'new'
+    logger.info("✅ Кассета заменена только при закрытии записи")
+
+
+@allure.feature('Cassette')
+@allure.story('Record and replay: Recording is refused on xdist workers')
+def test_record_refused_on_worker(monkeypatch):
+    '''Воркеры xdist не пишут кассету: они заменяли бы записи друг друга.'''
+    monkeypatch.setenv('CASSETTE_MODE', 'off')
+    options = {'--cassette-mode': 'record', '--cassette-path': None}
+    config = SimpleNamespace(getoption=options.get, workerinput={'workerid': 'gw0'})
+
+    with pytest.raises(pytest.UsageError):
+        cassette_plugin.pytest_configure(config)
+    logger.info("✅ Запись на воркере отклонена")
@@ -0,0 +1,70 @@
+'''Тесты для пула клиентов на несколько стендов.'''
+
+import allure
+import pytest
+from core.clients.client_pool import ClientPool, Target, parse_targets
+from core.server.local_server import LocalBookingServer
+from core.settings.config import Users
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def two_servers():
+    '''Два локальных сервера - как два стенда.'''
+    servers = [LocalBookingServer(username=Users.USERNAME.value, password=Users.PASSWORD.value).start()
+               for _ in range(2)]
+    yield servers
+    for server in servers:
+        server.stop()
+
+
+@allure.feature('Targets')
+@allure.story('Client pool: Each target gets its own client and a side-by-side report')
+def test_client_pool_compares_targets(two_servers, generate_random_booking_data, monkeypatch):
+    '''Одна операция на двух стендах сразу, отличие статусов видно в сравнении.'''
+    # Оба стенда - 127.0.0.1 на разных портах, а порт в ключ кассеты не входит:
+    # с кассетой ответы целей смешались бы. Пулу нужны живые серверы
+    monkeypatch.setenv('CASSETTE_MODE', 'off')
+    first, second = two_servers
+    targets = parse_targets(f'a={first.url}, b={second.url}/')
+    assert targets == [Target('a', first.url), Target('b', second.url)]
+
+    pool = ClientPool(targets, max_workers=4)
+    try:
+        pool.auth_all()
+        assert pool.client('a').token and pool.client('b').token
+        assert pool.client('a').session is not pool.client('b').session, '❌ У целей общий пул соединений'
+
+        created = pool.fan_out(lambda client: client.create_booking(generate_random_booking_data))
+        ids = {name: result.response.json()['bookingid'] for name, result in created.items()}
+        assert all(result.ok for result in created.values()), f'❌ Создание упало: {created}'
+        assert all(pool.statuses[name].statuses['POST /booking'] == {200: 1} for name in pool.names)
+
+        # На стенде b бронирования уже нет - GET вернёт 404 только там
+        pool.client('b').delete_booking(ids['b'])
+        by_client = {id(pool.client(name)): booking_id for name, booking_id in ids.items()}
+        fetched = pool.fan_out(lambda client: client.get_booking_by_id(by_client[id(client)]))
+        assert fetched['a'].ok and not fetched['b'].ok
+
+        comparison = pool.comparison()
+        row = comparison['GET /booking/{id}']
+        assert row['status_diff'], f'❌ Разные статусы не замечены: {row}'
+        assert row['targets']['a']['statuses'] == {200: 1}
+        assert row['targets']['b']['statuses'] == {404: 1}
+        assert not comparison['POST /booking']['status_diff']
+        logger.info(f"✅ Сравнение целей:\n{pool.format_table()}")
+    finally:
+        pool.close()
+
+
+@allure.feature('Targets')
+@allure.story('Client pool: Unknown environment names are rejected')
+def test_parse_targets_rejects_unknown_names():
+    '''Имя без URL должно быть окружением из Environment, имена не повторяются.'''
+    assert parse_targets('test,PROD') == [Target('TEST'), Target('PROD')]
+    with pytest.raises(ValueError):
+        parse_targets('STAGING')
+    with pytest.raises(ValueError):
+        parse_targets('TEST,test')
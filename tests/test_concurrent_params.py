@@ -0,0 +1,82 @@
+'''Тесты для маркера concurrent_params: сколько запросов уходит на группу.'''
+
+import threading
+from types import SimpleNamespace
+import allure
+import pytest
+from core.plugins import concurrent_params
+import logging
+
+logger = logging.getLogger(__name__)
+
+MODULE = 'tests/test_fake.py'
+
+
+def _item(name, value):
+    '''Параметризация теста name со значением value (только то, что читает плагин).'''
+    return SimpleNamespace(nodeid=f'{MODULE}::{name}[{value}]', name=f'{name}[{value}]', originalname=name,
+                           parent=SimpleNamespace(nodeid=MODULE), callspec=SimpleNamespace(params={'value': value}))
+
+
+class _Requests:
+    '''Функция запроса для маркера: запоминает, для каких значений запрос ушёл.'''
+    def __init__(self):
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def __call__(self, client, value):
+        with self._lock:
+            self.sent.append(value)
+        return value
+
+
+def _session(**config_attrs):
+    config = SimpleNamespace(stash=pytest.Stash(), addinivalue_line=lambda *args: None, **config_attrs)
+    concurrent_params.pytest_configure(config)
+    items = [_item('test_one', value) for value in (1, 2, 3)] + [_item('test_two', value) for value in (4, 5)]
+    return SimpleNamespace(config=config, items=items)
+
+
+def _run(session, item, request_phase):
+    '''То, что делает фикстура concurrent_response для item, и результат запроса.'''
+    return concurrent_params._response_future(session, item, None, None, request_phase).result()
+
+
+@allure.feature('Concurrent params')
+@allure.story('Dispatch: One request per parametrization, reruns send only their own')
+def test_group_is_dispatched_once():
+    '''Первая параметризация отправляет запросы всей своей группы, остальные берут готовые;
+    повторный запуск теста отправляет только свой запрос.'''
+    session = _session()
+    request_phase = _Requests()
+    try:
+        first = session.items[0]
+        assert _run(session, first, request_phase) == 1
+        waiting = set(session.config.stash[concurrent_params._futures])
+        assert waiting == {item.nodeid for item in session.items[1:3]}, f'❌ Ждут ответа: {waiting}'
+
+        for item in session.items[1:]:
+            assert _run(session, item, request_phase) == item.callspec.params['value']
+        assert sorted(request_phase.sent) == [1, 2, 3, 4, 5], f'❌ Отправлено: {request_phase.sent}'
+
+        assert _run(session, first, request_phase) == 1  # Повторный запуск
+        assert sorted(request_phase.sent) == [1, 1, 2, 3, 4, 5], f'❌ Повтор отправил: {request_phase.sent}'
+    finally:
+        concurrent_params.pytest_unconfigure(session.config)
+    logger.info("✅ По запросу на параметризацию")
+
+
+@allure.feature('Concurrent params')
+@allure.story('Dispatch: xdist workers send only their own requests')
+def test_worker_does_not_prefetch():
+    '''На воркере xdist session.items - вся коллекция: заранее ничего не отправляется.'''
+    session = _session(workerinput={'workerid': 'gw0'})
+    request_phase = _Requests()
+    try:
+        assert _run(session, session.items[0], request_phase) == 1
+        assert _run(session, session.items[4], request_phase) == 5
+        assert request_phase.sent == [1, 5], f'❌ Воркер отправил чужие запросы: {request_phase.sent}'
+        assert not session.config.stash[concurrent_params._futures]
+    finally:
+        concurrent_params.pytest_unconfigure(session.config)
+    logger.info("✅ Воркер отправляет только свои запросы")
@@ -43,6 +43,8 @@ def test_create_booking_positive(api_client, generate_random_booking_data):
 
 @allure.feature('Create booking')
 @allure.story('Negative: Create booking with invalid data')
+# Запросы всех семи случаев уходят параллельно, проверки - в каждом тесте отдельно
+@pytest.mark.concurrent_params(lambda client, booking_data: client.create_booking(booking_data))
 @pytest.mark.parametrize('booking_data, expected_status', [
     # Тест 1: нет firstname
     (
@@ -139,7 +141,7 @@ def test_create_booking_positive(api_client, generate_random_booking_data):
                 500
     )
     ])
-def test_create_booking_negative(api_client, booking_data, expected_status):
+def test_create_booking_negative(concurrent_response, booking_data, expected_status):
     '''Негативные тесты создания бронирования.'''
     logger.info("=" * 50)
     logger.info(f"❌ ТЕСТ: Создание бронирования (негативный)")
@@ -148,7 +150,7 @@ def test_create_booking_negative(api_client, booking_data, expected_status):
     with allure.step('1. Отправка запроса с невалидными данными'):
         # Ожидаем, что запрос вызовет ошибку
         with pytest.raises(requests.exceptions.HTTPError) as e:
-            api_client.create_booking(booking_data)
+            concurrent_response.result()
 
         error_response = e.value.response
         logger.debug(f"Получен статус: {error_response.status_code}")
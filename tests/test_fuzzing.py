@@ -0,0 +1,68 @@
+'''Фаззинг контракта POST /booking.
+
+Генератор мутаций проверяется всегда, сам фаззинг - только с опцией:
+    pytest tests/test_fuzzing.py --fuzz-count 2000 --fuzz-json fuzz.json'''
+
+import json
+import allure
+import requests
+from core.data.fuzzing import Mutation, generate_mutations
+from core.load import fuzz
+from core.load.fuzz import FuzzRunner
+from core.models.booking import Booking
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@allure.feature('Fuzzing')
+@allure.story('Mutations: Every schema field is broken in every way')
+def test_mutations_follow_model_schema():
+    '''Мутации покрывают все поля схемы, воспроизводимы по seed и ломают модель.'''
+    mutations = list(generate_mutations(500, seed=7))
+    names = {part for mutation in mutations for part in mutation.name.split('+')}
+
+    required = Booking.model_json_schema()['required'] + ['bookingdates.checkin', 'bookingdates.checkout']
+    for field in required:
+        assert {f'{field}:missing', f'{field}:null'} <= names, f'❌ Нет мутаций поля {field}'
+    assert 'totalprice:boundary=int32_overflow' in names and 'bookingdates:inverted_dates' in names
+
+    assert len(mutations) == 500
+    assert [m.payload for m in generate_mutations(500, seed=7)] == [m.payload for m in mutations], \
+        '❌ Тот же seed дал другие мутации'
+    logger.info(f"✅ Одиночных мутаций: {len(names)}")
+
+
+@allure.feature('Fuzzing')
+@allure.story('Mutations: Non-object bodies are sent as JSON')
+def test_non_object_bodies_are_sent(api_client, monkeypatch, mocker):
+    '''body:null уходит телом "null", а не пустым запросом; списки и строки - тоже готовым JSON.'''
+    mutations = [Mutation('body:null', None), Mutation('body:list', [1, 2]), Mutation('body:string', 'x')]
+    monkeypatch.setattr(fuzz, 'generate_mutations', lambda count, seed: iter(mutations))
+    send = mocker.spy(requests.Session, 'send')
+
+    report = FuzzRunner(api_client, count=len(mutations)).run()
+
+    bodies = [call.args[1].body for call in send.call_args_list if call.args[1].method == 'POST']
+    assert sorted(bodies) == [b'"x"', b'[1, 2]', b'null'], f'❌ Отправлены тела {bodies}'
+    assert report.total == len(mutations)
+
+
+@allure.feature('Fuzzing')
+@allure.story('Contract: Broken payloads get expected responses')
+def test_create_booking_fuzz(api_client, fuzz_options, fuzz_reports):
+    '''Тысячи испорченных тел: ответы группируются в классы, в отчёте по одному примеру на класс.'''
+    with allure.step(f"1. Отправка {fuzz_options['count']} мутаций"):
+        report = FuzzRunner(api_client, **fuzz_options).run()
+        fuzz_reports.append(report)
+
+    allure.attach(report.format_table(), name='fuzz-classes', attachment_type=allure.attachment_type.TEXT)
+    for cls in report.to_dict()['responses']:
+        allure.attach(json.dumps(cls, indent=2, ensure_ascii=False),
+                      name=f"{cls['status']} {cls['shape']} {cls['latency']} x{cls['count']}",
+                      attachment_type=allure.attachment_type.JSON)
+
+    with allure.step('2. Проверка контракта'):
+        violations = [f"{cls['status']} {cls['shape']} (пример: {cls['example']})" for cls in report.violations]
+        assert not violations, f'❌ Нарушения контракта: {violations}'
+        logger.info(f"✅ {report.total} мутаций, {len(report.classes)} классов ответов")
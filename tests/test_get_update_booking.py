@@ -0,0 +1,118 @@
+'''Тесты для получения и обновления бронирований.'''
+
+import allure
+import pytest
+import requests
+from core.clients.http_cache import ResponseCache
+from core.models.booking import Booking, BookingResponse
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@allure.feature('Get booking')
+@allure.story('Positive: Get existing booking by id')
+def test_get_booking_by_id(api_client, shared_booking):
+    '''Бронирование из пула возвращается с теми же данными.'''
+    with allure.step('1. Получение бронирования'):
+        response = api_client.get_booking_by_id(shared_booking.booking_id)
+        assert response.status_code == 200, f'❌ Получили {response.status_code}, ожидали 200'
+
+    with allure.step('2. Проверка данных'):
+        assert Booking(**response.json()) == Booking(**shared_booking.booking_data)
+        logger.info(f"✅ Данные бронирования {shared_booking.booking_id} совпадают")
+
+
+@allure.feature('Get booking')
+@allure.story('Positive: Typed methods validate responses into models')
+def test_typed_methods(api_client, generate_random_booking_data):
+    '''Типизированные методы возвращают модели pydantic.'''
+    booking_data = generate_random_booking_data
+
+    with allure.step('1. Создание бронирования'):
+        created = api_client.create_booking_typed(booking_data)
+        assert isinstance(created, BookingResponse)
+        assert created.booking == Booking(**booking_data)
+
+    with allure.step('2. Получение бронирования и списка'):
+        assert api_client.get_booking_typed(created.bookingid) == created.booking
+        booking_ids = api_client.get_booking_ids_typed(
+            firstname=booking_data['firstname'], lastname=booking_data['lastname'])
+        assert created.bookingid in [item.bookingid for item in booking_ids]
+
+    api_client.delete_booking(created.bookingid)
+
+
+@allure.feature('Get booking')
+@allure.story('Positive: Stream filtered booking list')
+def test_list_bookings_filtered(api_client, booking_pool):
+    '''Потоковый список с фильтрами находит бронирования из пула.'''
+    lease = booking_pool.lease_shared()
+    filters = {
+        'firstname': lease.booking_data['firstname'],
+        'lastname': lease.booking_data['lastname'],
+    }
+
+    with allure.step('1. Список ID с фильтрами'):
+        booking_ids = list(api_client.list_bookings(**filters))
+        assert lease.booking_id in booking_ids
+
+    with allure.step('2. Список с полными записями'):
+        bookings = dict(api_client.list_bookings(fetch=True, **filters))
+        assert bookings[lease.booking_id] == Booking(**lease.booking_data)
+
+
+@allure.feature('Update booking')
+@allure.story('Positive: Update booking')
+def test_update_booking(api_client, exclusive_booking, generate_random_booking_data):
+    '''Полное обновление бронирования из пула.'''
+    booking_data = generate_random_booking_data
+
+    with allure.step('1. Обновление бронирования'):
+        response = api_client.update_booking(exclusive_booking.booking_id, booking_data)
+        assert response.status_code == 200, f'❌ Получили {response.status_code}, ожидали 200'
+
+    with allure.step('2. Проверка, что данные обновились'):
+        response = api_client.get_booking_by_id(exclusive_booking.booking_id)
+        assert Booking(**response.json()) == Booking(**booking_data)
+
+
+@allure.feature('Get booking')
+@allure.story('Cache: Repeated reads are revalidated, updates invalidate')
+def test_cached_get_booking(api_client, exclusive_booking, generate_random_booking_data, monkeypatch):
+    '''Повторное чтение - из кэша по 304, после обновления - снова с сервера.'''
+    cache = ResponseCache()
+    monkeypatch.setattr(api_client, 'http_cache', cache)
+    booking_id = exclusive_booking.booking_id
+
+    with allure.step('1. Два чтения подряд: второе - условный запрос и ответ из кэша'):
+        first = api_client.get_booking_by_id(booking_id)
+        second = api_client.get_booking_by_id(booking_id)
+        assert cache.stats['misses'] == 1
+        assert cache.stats['hits'] == 1, f'❌ Ответ не взят из кэша: {cache.stats}'
+        # Поток - до обращения к .content, которое само помечает тело прочитанным
+        assert b''.join(second.iter_content(chunk_size=16)) == first.content, '❌ Тело из кэша не читается потоком'
+        assert list(second.iter_lines()) == list(first.iter_lines())
+        assert second.content == first.content
+
+    with allure.step('2. После обновления - новые данные с сервера'):
+        booking_data = generate_random_booking_data
+        api_client.update_booking(booking_id, booking_data)
+        assert len(cache) == 0, '❌ Бронирование осталось в кэше после обновления'
+        response = api_client.get_booking_by_id(booking_id)
+        assert Booking(**response.json()) == Booking(**booking_data)
+        logger.info(f"✅ Счётчики кэша: {cache.stats}")
+
+
+@allure.feature('Delete booking')
+@allure.story('Positive: Delete booking')
+def test_delete_booking(api_client, exclusive_booking):
+    '''Удалённое бронирование больше не находится.'''
+    with allure.step('1. Удаление бронирования'):
+        response = api_client.delete_booking(exclusive_booking.booking_id)
+        assert response.status_code == 201, f'❌ Получили {response.status_code}, ожидали 201'
+
+    with allure.step('2. Бронирование больше не находится'):
+        with pytest.raises(requests.exceptions.HTTPError) as e:
+            api_client.get_booking_by_id(exclusive_booking.booking_id)
+        assert e.value.response.status_code == 404
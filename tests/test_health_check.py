@@ -1,9 +1,12 @@
 '''Тесты для проверки доступности сервера.'''
 
+import os
 import allure
 import pytest
 import requests
 import logging
+from core.logs import pipeline
+from core.logs.pipeline import HotPathLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -59,3 +62,53 @@ def test_ping_timeout(api_client, mocker):
         api_client.ping()
 
     logger.info("✅ Клиент правильно выбросил Timeout")
+
+
+@allure.feature('Health Check')
+@allure.story('Ping: Per-request log lines are rate limited')
+def test_ping_burst_log_rate_limited(api_client, monkeypatch):
+    '''Серия ping: строки "на каждый запрос" выводятся не чаще заданной частоты.'''
+    logger.info("=" * 50)
+    logger.info("📉 ТЕСТ: Ограничение частоты логов горячего пути")
+    logger.info("=" * 50)
+
+    rate = 5
+    limiter = HotPathLimiter(rate)
+    monkeypatch.setattr(pipeline, 'hot_path', limiter)
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    client_logger = logging.getLogger('core.clients.api_client')
+    client_logger.addHandler(handler)
+    try:
+        for _ in range(50):
+            api_client.ping()
+    finally:
+        client_logger.removeHandler(handler)
+
+    # На каждый ping две строки горячего пути: "Проверка соединения" и строка ответа
+    # Серия могла попасть на границу секунды - тогда окон два
+    assert rate <= len(records) <= 2 * rate, f'❌ Выведено {len(records)} строк горячего пути'
+    assert limiter.suppressed == 100 - len(records), '❌ Пропущенные строки не посчитаны'
+    statuses = [record.status for record in records if hasattr(record, 'status')]
+    assert all(status == 201 for status in statuses), f'❌ Неожиданные статусы: {statuses}'
+
+    logger.info(f"✅ Выведено {len(records)} строк, пропущено {limiter.suppressed}")
+
+
+@allure.feature('Health Check')
+@allure.story('Ping: Ordinary runs log every request')
+def test_ping_logs_every_request_by_default(api_client, caplog):
+    '''Без режима горячего пути каждая строка запроса выводится, а у записи есть файл и строка вызова.'''
+    if pipeline._hot_path_mode or 'LOG_HOT_PATH_RATE' in os.environ:
+        pytest.skip('Прогон в режиме горячего пути')
+
+    with caplog.at_level(logging.INFO, logger='core.clients.api_client'):
+        for _ in range(30):
+            api_client.ping()
+
+    responses = [record for record in caplog.records if hasattr(record, 'status')]
+    assert len(responses) == 30, f'❌ Выведено {len(responses)} строк ответа из 30'
+    assert all(record.filename == 'api_client.py' and record.lineno for record in responses), \
+        '❌ У записей нет файла и строки вызова'
+    logger.info("✅ Все строки запросов выведены")
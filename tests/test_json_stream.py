@@ -0,0 +1,104 @@
+'''Тесты для потокового разбора JSON-массива.'''
+
+import json
+import random
+import allure
+import pytest
+from core.clients.json_stream import iter_json_array
+import logging
+
+logger = logging.getLogger(__name__)
+
+DOCUMENTS = {
+    'bookings': '[{"bookingid": 1}, {"bookingid": 22}, {"bookingid": 333}]',
+    'numbers': '[0, -1, 12345, 2.5, -0.125, 1e5, 6.02E+23, 7e-3, 123456789012345678901234567890]',
+    'numbers_no_spaces': '[1,22,333,4444,-55555,6.5e10]',
+    'literals': '[true, false, null, true]',
+    'strings': '["", "plain", "with, comma ] and [", "quote \\" inside", "esc \\\\ \\n \\t \\u00e9 \\ud83d\\ude00"]',
+    'unicode': '["Åsa", "名前", "😀", {"имя": "Ёж"}]',
+    'nested': '[[1, [2, [3]]], {"a": {"b": [1.5, {"c": null}]}}, []]',
+    'whitespace': ' \n\t[ \r\n 1 ,\n\n 2 , "x" \t ] \n',
+    'empty': '[]',
+    'empty_with_spaces': '  [  ]  ',
+}
+
+# Экранирование, суррогатные пары и многобайтовые символы - граница куска может прийти на любой их байт
+ESCAPES = ('["quote \\" inside", "back \\\\ slash \\/", "\\u00e9\\u0416\\u20ac", "\\ud83d\\ude00 pair",'
+           ' "\\"\\\\\\"", "é😀Ё", {"k\\"ey": "\\n\\t\\r\\b\\f"}, "\\\\u00e9 - не escape"]')
+
+
+def _one_byte_chunks(data):
+    return (data[i:i + 1] for i in range(len(data)))
+
+
+@allure.feature('Streaming')
+@allure.story('Incremental JSON: One-byte chunks match json.loads')
+@pytest.mark.parametrize('name', list(DOCUMENTS))
+def test_iter_json_array_one_byte_chunks(name):
+    '''Каждый байт - отдельный кусок: числа, строки и многобайтовые символы режутся на любой границе.'''
+    document = DOCUMENTS[name]
+    data = document.encode('utf-8')
+    assert list(iter_json_array(_one_byte_chunks(data))) == json.loads(document)
+
+
+@allure.feature('Streaming')
+@allure.story('Incremental JSON: Random chunk boundaries match json.loads')
+def test_iter_json_array_random_chunks():
+    '''Случайные границы кусков (воспроизводимо по зерну) на большом массиве разных элементов.'''
+    rng = random.Random(0)
+    items = [rng.choice([
+        rng.randint(-10 ** 12, 10 ** 12),
+        rng.random() * 10 ** rng.randint(-5, 5),
+        ''.join(rng.choice('ab,]["\\ é😀') for _ in range(rng.randint(0, 8))),
+        {'bookingid': rng.randint(1, 10 ** 6), 'flag': rng.random() < 0.5},
+        None,
+    ]) for _ in range(500)]
+    data = json.dumps(items, ensure_ascii=False).encode('utf-8')
+
+    for _ in range(20):
+        cuts = sorted(rng.sample(range(1, len(data)), rng.randint(1, 200)))
+        chunks = [data[start:end] for start, end in zip([0] + cuts, cuts + [len(data)])]
+        assert list(iter_json_array(chunks)) == items, f'❌ Границы кусков: {cuts[:10]}...'
+
+
+@allure.feature('Streaming')
+@allure.story('Incremental JSON: Truncated or non-array input is rejected')
+@pytest.mark.parametrize('document', ['[1, 2', '[1, "abc', '[{"a": 1}', '{"a": 1}', '[1, 2.', '[tru'])
+def test_iter_json_array_rejects_broken_input(document):
+    '''Оборванный массив или не массив - ValueError, даже если куски по одному байту.'''
+    with pytest.raises(ValueError):
+        list(iter_json_array(_one_byte_chunks(document.encode('utf-8'))))
+
+
+@allure.feature('Streaming')
+@allure.story('Incremental JSON: Chunk boundaries inside strings and escapes')
+def test_iter_json_array_split_inside_escapes():
+    '''Два куска с границей на каждом байте: внутри \\", \\\\, \\uXXXX, суррогатной пары и UTF-8 символа.'''
+    expected = json.loads(ESCAPES)
+    data = ESCAPES.encode('utf-8')
+    for cut in range(1, len(data)):
+        assert list(iter_json_array([data[:cut], data[cut:]])) == expected, \
+            f'❌ Граница после {data[:cut][-12:]!r}'
+    assert list(iter_json_array(_one_byte_chunks(data))) == expected
+    logger.info(f"✅ {len(data) - 1} границ внутри строк и escape-последовательностей")
+
+
+@allure.feature('Streaming')
+@allure.story('Incremental JSON: Every truncation is rejected')
+@pytest.mark.parametrize('name', ['escapes', 'nested', 'numbers'])
+def test_iter_json_array_rejects_every_truncation(name):
+    '''Ответ, оборванный на любом байте (в том числе посреди escape и UTF-8 символа), - ValueError.'''
+    document = ESCAPES if name == 'escapes' else DOCUMENTS[name]
+    data = document.encode('utf-8').rstrip()
+    for cut in range(len(data)):
+        with pytest.raises(ValueError):
+            list(iter_json_array(_one_byte_chunks(data[:cut])))
+
+
+@allure.feature('Streaming')
+@allure.story('Incremental JSON: Invalid escapes are rejected')
+@pytest.mark.parametrize('document', ['["\\x"]', '["\\u12"]', '["\\u12G4"]', '["tab\tinside"]'])
+def test_iter_json_array_rejects_invalid_escapes(document):
+    '''Неверное экранирование или управляющий символ в строке - ValueError, а не пропуск элемента.'''
+    with pytest.raises(ValueError):
+        list(iter_json_array(_one_byte_chunks(document.encode('utf-8'))))
@@ -0,0 +1,111 @@
+'''Тесты для гистограмм времени ответа.'''
+
+import math
+import random
+import allure
+import pytest
+from core.metrics.latency import LatencyHistogram, LatencyRegistry, endpoint_template
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Верхняя граница корзины отличается от значения не больше чем на 1/64
+MAX_RELATIVE_ERROR = 1 / 64
+
+
+@allure.feature('Latency')
+@allure.story('Templates: IDs and query strings are folded')
+@pytest.mark.parametrize('endpoint, expected', [
+    ('/booking', '/booking'),
+    ('/booking/123', '/booking/{id}'),
+    ('/booking/123?firstname=Anna', '/booking/{id}'),
+    ('/booking?checkin=2030-01-01', '/booking'),
+    ('/booking/1/extra/22', '/booking/{id}/extra/{id}'),
+    ('/booking/12abc', '/booking/12abc'),
+    ('/ping', '/ping'),
+])
+def test_endpoint_template(endpoint, expected):
+    '''Цифровые сегменты пути - {id}, query-строка отбрасывается, смешанные сегменты не трогаются.'''
+    assert endpoint_template(endpoint) == expected
+
+
+@allure.feature('Latency')
+@allure.story('Histogram: Bucket bounds hold every value')
+def test_bucket_bounds():
+    '''До 128 мкс корзина точная; дальше значение лежит в своей корзине с ошибкой не больше 1/64.'''
+    for micros in range(128):
+        assert LatencyHistogram._index(micros) == micros
+        assert LatencyHistogram._upper_value(micros) == micros
+
+    rng = random.Random(0)
+    values = list(range(128, 5000)) + [rng.randint(5000, 3_600_000_000) for _ in range(5000)]
+    previous_index = LatencyHistogram._index(127)
+    for micros in sorted(values):
+        index = LatencyHistogram._index(micros)
+        upper = LatencyHistogram._upper_value(index)
+        assert index >= previous_index, f'❌ Корзины не монотонны на {micros} мкс'
+        assert micros <= upper <= micros * (1 + MAX_RELATIVE_ERROR), f'❌ {micros} мкс -> граница {upper}'
+        # Следующее значение после границы - уже в следующей корзине
+        assert LatencyHistogram._index(upper + 1) > index
+        previous_index = index
+
+    hour_index = LatencyHistogram._index(3_600_000_000)
+    assert hour_index < 3500, f'❌ За час до {hour_index} корзин'
+
+
+@allure.feature('Latency')
+@allure.story('Histogram: Percentiles are within the error bound')
+def test_percentiles_match_exact_values():
+    '''Перцентили по гистограмме совпадают с точными по отсортированному списку с ошибкой до 1/64.'''
+    rng = random.Random(1)
+    samples = [rng.lognormvariate(-4, 1) for _ in range(10_000)]
+    histogram = LatencyHistogram()
+    for seconds in samples:
+        histogram.record(seconds)
+
+    ordered = sorted(samples)
+    for p in (1, 50, 90, 99, 99.9, 100):
+        exact = ordered[max(1, math.ceil(p / 100 * len(ordered))) - 1]
+        estimate = histogram.percentile(p)
+        # 1 мкс - шаг округления при записи
+        assert exact - 1e-6 <= estimate <= exact * (1 + MAX_RELATIVE_ERROR) + 1e-6, \
+            f'❌ p{p}: точное {exact}, по гистограмме {estimate}'
+
+    summary = histogram.summary()
+    assert summary['count'] == len(samples)
+    assert summary['max'] == max(samples) and histogram.min == min(samples)
+    assert summary['mean'] == pytest.approx(sum(samples) / len(samples))
+    assert LatencyHistogram().percentile(99) == 0.0
+
+
+@allure.feature('Latency')
+@allure.story('Histogram: Merging equals recording into one histogram')
+def test_merge_and_registry():
+    '''Слияние двух гистограмм даёт то же, что запись всех значений в одну; реестр группирует по шаблону.'''
+    rng = random.Random(2)
+    first_samples = [rng.uniform(0.001, 0.05) for _ in range(1000)]
+    second_samples = [rng.uniform(0.02, 2.0) for _ in range(500)]
+    first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for seconds in first_samples:
+        first.record(seconds)
+        combined.record(seconds)
+    for seconds in second_samples:
+        second.record(seconds)
+        combined.record(seconds)
+
+    first.merge(second)
+    assert first.counts == combined.counts
+    assert first.summary() == pytest.approx(combined.summary())
+    assert first.min == combined.min and first.max == combined.max
+
+    empty = LatencyHistogram()
+    empty.merge(LatencyHistogram())
+    assert empty.min is None and empty.count == 0
+
+    registry = LatencyRegistry()
+    registry.record('GET', '/booking/1', 0.01)
+    registry.record('GET', '/booking/2?x=1', 0.02)
+    registry.record('DELETE', '/booking/3', 0.03)
+    assert sorted(registry.summary()) == ['DELETE /booking/{id}', 'GET /booking/{id}']
+    assert registry.summary()['GET /booking/{id}']['count'] == 2
+    logger.info("✅ Гистограммы сливаются без потерь")
@@ -0,0 +1,88 @@
+'''Нагрузочные тесты.
+
+Запускаются только с опциями нагрузки, например:
+    pytest tests/test_load.py --load-rps 20 --load-duration 30 --load-scenario crud
+    pytest tests/test_load.py --soak-duration 3600 --soak-json soak.json
+
+Проверка самого генератора (test_scenario_errors_are_counted) идёт всегда.'''
+
+import json
+from types import SimpleNamespace
+import allure
+import pytest
+from core.load.runner import LoadRunner
+from core.metrics.soak import SoakSampler
+from core.settings.config import Soak
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Допустимая доля ошибок под нагрузкой
+MAX_ERROR_RATE = 0.01
+
+
+@allure.feature('Load')
+@allure.story('Scenario under load')
+def test_load_scenario(load_options, load_scenario, load_client, load_reports):
+    '''Сценарий под нагрузкой не даёт больше MAX_ERROR_RATE ошибок.'''
+    with allure.step(f'1. Нагрузка: {load_scenario}'):
+        report = LoadRunner(load_client, scenario=load_scenario, **load_options).run()
+        load_reports.append((load_scenario, report))
+
+    allure.attach(json.dumps(report.to_dict(), indent=2, ensure_ascii=False),
+                  name=f'load-{load_scenario}', attachment_type=allure.attachment_type.JSON)
+
+    with allure.step('2. Проверка доли ошибок'):
+        assert report.total_requests > 0, '❌ Не выполнено ни одного запроса'
+        assert report.error_rate <= MAX_ERROR_RATE, \
+            f'❌ Ошибок {report.error_rate * 100:.2f}%, допустимо {MAX_ERROR_RATE * 100:.0f}%'
+
+
+@allure.feature('Load')
+@allure.story('Soak: Client footprint does not creep')
+def test_soak_footprint(soak_options, load_client, soak_reports):
+    '''Долгий CRUD: во второй половине прогона память и число живых ответов не растут.'''
+    with allure.step(f"1. CRUD {soak_options['duration']:.0f}с с замерами каждые {soak_options['interval']}с"):
+        with SoakSampler(load_client, interval=soak_options['interval']) as sampler:
+            load = LoadRunner(load_client, scenario='crud', concurrency=soak_options['concurrency'],
+                              duration=soak_options['duration']).run()
+        report = sampler.report
+        soak_reports.append(report)
+
+    allure.attach(json.dumps(report.to_dict(), indent=2, ensure_ascii=False),
+                  name='soak', attachment_type=allure.attachment_type.JSON)
+    allure.attach(report.format_table(), name='soak-summary', attachment_type=allure.attachment_type.TEXT)
+
+    with allure.step('2. Проверка роста'):
+        assert load.total_requests > 0, '❌ Не выполнено ни одного запроса'
+        growth = report.second_half_growth
+        assert growth.get('traced', 0) <= Soak.MAX_GROWTH.value, \
+            f"❌ Память выросла на {growth['traced']} байт во второй половине прогона"
+        assert growth.get('responses', 0) <= soak_options['concurrency'], \
+            f"❌ Копятся объекты Response: +{growth['responses']}"
+        logger.info(f"✅ Рост во второй половине: {growth}, новых соединений на запрос: {report.churn:.4f}")
+
+
+class _BrokenClient:
+    '''Клиент, на котором падает сам сценарий crud: в ответе на создание нет bookingid.'''
+    def create_booking(self, booking_data):
+        return SimpleNamespace(json=lambda: {})
+
+
+@allure.feature('Load')
+@allure.story('Runner: Scenario errors are counted, not lost')
+@pytest.mark.parametrize('mode', [{'concurrency': 2}, {'rps': 100}], ids=['closed', 'open'])
+def test_scenario_errors_are_counted(mode, caplog):
+    '''Ошибка вне запроса - неудачная итерация в строке сценария; поток не умирает, лог - один раз.'''
+    runner = LoadRunner(_BrokenClient(), scenario='crud', duration=0.2, payload_factory=dict, **mode)
+    with caplog.at_level(logging.ERROR, logger='core.load.runner'):
+        report = runner.run()
+
+    stats = report.endpoints[runner.scenario_key]
+    # Потоки закрытой модели продолжают крутить сценарий после ошибки
+    assert stats['count'] > 2, f'❌ Итераций после ошибки: {stats["count"]}'
+    assert stats['errors'] == stats['count'], f'❌ Не все итерации неудачные: {stats}'
+    assert report.endpoints['POST /booking']['errors'] == 0
+    failures = [record for record in caplog.records if '💥' in record.getMessage()]
+    assert len(failures) == 1, f'❌ Ошибка сценария залогирована {len(failures)} раз'
+    logger.info(f"✅ Неудачных итераций: {stats['count']}")
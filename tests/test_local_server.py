@@ -0,0 +1,87 @@
+'''Тесты для хранилища локального сервера: поиск и индексы.'''
+
+from datetime import date
+import allure
+import pytest
+from core.server.local_server import BookingStore, InvalidBooking, parse_booking
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _booking(firstname, lastname, checkin, checkout):
+    return parse_booking({
+        'firstname': firstname, 'lastname': lastname, 'totalprice': 100, 'depositpaid': True,
+        'bookingdates': {'checkin': checkin, 'checkout': checkout},
+    })
+
+
+@pytest.fixture
+def store():
+    '''Хранилище с пятью бронированиями: ID 1-5 по порядку.'''
+    store = BookingStore()
+    for booking in (
+        _booking('Anna', 'Smith', '2030-01-10', '2030-01-15'),
+        _booking('Anna', 'Brown', '2030-02-01', '2030-02-03'),
+        _booking('Boris', 'Smith', '2030-01-20', '2030-01-25'),
+        _booking('Clara', 'White', '2029-12-30', '2030-01-02'),
+        _booking('Anna', 'Smith', '2030-03-01', '2030-03-05'),
+    ):
+        store.create(booking)
+    return store
+
+
+@allure.feature('Local server')
+@allure.story('Search: Name and date filters match a full scan')
+@pytest.mark.parametrize('filters, expected', [
+    ({}, [1, 2, 3, 4, 5]),
+    ({'firstname': 'Anna'}, [1, 2, 5]),
+    ({'lastname': 'Smith'}, [1, 3, 5]),
+    ({'firstname': 'Anna', 'lastname': 'Smith'}, [1, 5]),
+    ({'firstname': 'Nobody'}, []),
+    ({'checkin': date(2030, 1, 20)}, [2, 3, 5]),
+    ({'checkin': date(2030, 1, 10)}, [1, 2, 3, 5]),
+    ({'checkout': date(2030, 2, 3)}, [2, 5]),
+    ({'checkin': date(2030, 1, 1), 'checkout': date(2030, 1, 20)}, [2, 3, 5]),
+    ({'lastname': 'Smith', 'checkin': date(2030, 1, 15)}, [3, 5]),
+    ({'checkin': date(2031, 1, 1)}, []),
+], ids=['all', 'firstname', 'lastname', 'both_names', 'unknown_name', 'checkin_from', 'checkin_exact_day',
+        'checkout_from', 'both_dates', 'name_and_date', 'after_everything'])
+def test_search_filters(store, filters, expected):
+    '''Фильтры: имена - точное совпадение, даты - "не раньше", всё вместе - пересечение.'''
+    assert store.search(**filters) == expected, f'❌ Фильтр {filters}'
+
+
+@allure.feature('Local server')
+@allure.story('Search: Indexes follow replace and delete')
+def test_search_after_replace_and_delete(store):
+    '''После замены и удаления старые ключи индексов не находят записи.'''
+    assert store.replace(1, _booking('Dmitry', 'Smith', '2031-05-01', '2031-05-02'))
+    assert store.delete(5)
+    assert not store.delete(5), '❌ Повторное удаление должно вернуть False'
+    assert not store.replace(42, _booking('X', 'Y', '2030-01-01', '2030-01-02'))
+
+    assert store.search(firstname='Anna') == [2]
+    assert store.search(firstname='Dmitry') == [1]
+    assert store.search(lastname='Smith') == [1, 3]
+    assert store.search(checkin=date(2030, 3, 1)) == [1]
+    assert store.search(checkout=date(2030, 1, 15)) == [1, 2, 3]
+    assert len(store) == 4
+
+    # Последнее бронирование с датой удалено - дата пропадает из индекса
+    assert store.delete(4)
+    assert date(2029, 12, 30).toordinal() not in store._by_checkin.ids_by_day
+    assert store.search(checkin=date(2029, 1, 1)) == [1, 2, 3]
+    logger.info("✅ Индексы обновляются при замене и удалении")
+
+
+@allure.feature('Local server')
+@allure.story('Validation: Missing fields are rejected')
+@pytest.mark.parametrize('field', ['firstname', 'totalprice', 'bookingdates'])
+def test_parse_booking_rejects_missing_field(field):
+    '''Нет обязательного поля - InvalidBooking (сервер отвечает 500, как Restful-Booker).'''
+    data = {'firstname': 'Anna', 'lastname': 'Smith', 'totalprice': 1, 'depositpaid': False,
+            'bookingdates': {'checkin': '2030-01-01', 'checkout': '2030-01-02'}}
+    del data[field]
+    with pytest.raises(InvalidBooking):
+        parse_booking(data)
@@ -0,0 +1,34 @@
+'''Тесты для вывода логов под pytest.'''
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+import allure
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Тесты, которые пишут логи и из потока теста, и из фоновых потоков
+# (concurrent_params, хеджирование GET)
+NOISY_TESTS = ['tests/test_create_booking.py', 'tests/test_resilience.py']
+
+
+@allure.feature('Logging')
+@allure.story('Capture: Log lines stay out of the progress output')
+def test_logs_do_not_leak_into_progress_output():
+    '''Строки логов попадают только в перехваченный вывод тестов, а не между точками прогресса.'''
+    env = {**os.environ, 'ENVIRONMENT': 'LOCAL', 'CASSETTE_MODE': 'off'}
+    # -rP печатает перехваченный вывод прошедших тестов в отдельной секции в конце
+    result = subprocess.run(
+        [sys.executable, '-m', 'pytest', '-q', '-rP', '-p', 'no:cacheprovider', *NOISY_TESTS],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, f'❌ Вложенный прогон упал:\n{result.stdout[-2000:]}'
+
+    progress, _, sections = result.stdout.partition('=====')
+    leaked = [line for line in progress.splitlines() if ' | INFO ' in line or ' | WARNING ' in line]
+    assert not leaked, f'❌ Логи в строке прогресса: {leaked[:5]}'
+    assert ' | INFO ' in sections, '❌ Логи не попали в перехваченный вывод тестов'
+    logger.info("✅ Логи только в перехваченном выводе")
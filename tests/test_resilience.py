@@ -0,0 +1,92 @@
+'''Тесты для повторов, предохранителя и хеджирования запросов.'''
+
+import time
+import allure
+import pytest
+import requests
+from core.clients.api_client import APIClient
+from core.clients.resilience import CircuitOpenError
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def fresh_client(api_client):
+    '''Отдельный клиент: у него свой предохранитель, общий клиент сессии не затрагивается.
+    Ходит на тот же стенд, что и api_client (с --targets - на цель теста).'''
+    client = APIClient(environment=api_client.environment.name, base_url=api_client.base_url)
+    yield client
+    client.close()
+
+
+@allure.feature('Resilience')
+@allure.story('Retry: Idempotent request survives connection errors')
+def test_retry_after_connection_errors(fresh_client, mocker):
+    '''Два обрыва соединения подряд, третья попытка проходит.'''
+    real_request = fresh_client.session.request
+    calls = []
+
+    def flaky_request(*args, **kwargs):
+        calls.append(args)
+        if len(calls) <= 2:
+            raise requests.ConnectionError('Соединение сброшено')
+        return real_request(*args, **kwargs)
+
+    mocker.patch.object(fresh_client.session, 'request', side_effect=flaky_request)
+
+    response = fresh_client.ping()
+
+    assert response.status_code == 201, f'❌ Ожидали 201, получили {response.status_code}'
+    assert len(calls) == 3
+    assert fresh_client.resilience.stats['retries'] == 2
+    logger.info("✅ Запрос прошёл с третьей попытки")
+
+
+@allure.feature('Resilience')
+@allure.story('Circuit breaker: Fail fast while the target is down')
+def test_circuit_breaker_fails_fast(api_client, fresh_client, mocker):
+    '''После FAILURE_THRESHOLD ошибок подряд запросы не отправляются.'''
+    fresh_client.resilience.set_policy('GET /ping', attempts=1)
+    request = mocker.patch.object(fresh_client.session, 'request',
+                                  side_effect=requests.ConnectionError('Сервер недоступен'))
+    threshold = fresh_client.resilience.breaker.failure_threshold
+
+    for _ in range(threshold):
+        with pytest.raises(requests.ConnectionError):
+            fresh_client.ping()
+
+    with pytest.raises(CircuitOpenError):
+        fresh_client.ping()
+
+    assert request.call_count == threshold, '❌ Запрос ушёл в сеть при разомкнутом предохранителе'
+    assert fresh_client.resilience.breaker.state == 'open'
+    # Предохранитель у каждого клиента свой: остальные тесты его не видят
+    assert api_client.resilience.breaker.state == 'closed', '❌ Разомкнулся предохранитель общего клиента'
+    logger.info("✅ Предохранитель разомкнут, запросы падают сразу")
+
+
+@allure.feature('Resilience')
+@allure.story('Hedging: A slow GET is answered by its copy')
+def test_hedged_get_beats_slow_response(fresh_client, shared_booking, mocker):
+    '''Первая копия "зависает" на секунду - отвечает вторая.'''
+    fresh_client.resilience.set_policy('GET /booking/{id}', hedge=True, hedge_delay=0.05)
+    real_request = fresh_client.session.request
+    calls = []
+
+    def slow_first_request(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            time.sleep(1)
+        return real_request(*args, **kwargs)
+
+    mocker.patch.object(fresh_client.session, 'request', side_effect=slow_first_request)
+
+    start = time.perf_counter()
+    response = fresh_client.get_booking_by_id(shared_booking.booking_id)
+    elapsed = time.perf_counter() - start
+
+    assert response.json()['firstname'] == shared_booking.booking_data['firstname']
+    assert elapsed < 0.5, f'❌ Ждали медленную копию: {elapsed:.2f}с'
+    assert fresh_client.resilience.stats['hedged'] == 1
+    logger.info(f"✅ Ответ от второй копии за {elapsed * 1000:.0f}мс")
@@ -0,0 +1,67 @@
+'''Тесты для базы длительностей и распределения тестов по воркерам.'''
+
+from types import SimpleNamespace
+import allure
+from core.metrics.timings import TimingDatabase, lpt_partition
+from core.plugins.scheduling import ENDPOINTS_PROPERTY, TimingRecorder
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@allure.feature('Scheduling')
+@allure.story('LPT: Slow tests are spread across workers')
+def test_lpt_partition_balances_slow_tests():
+    '''Медленные параметризации не попадают на одного воркера.'''
+    durations = {f'test_negative[{i}]': 5.0 for i in range(4)}
+    durations.update({f'test_fast[{i}]': 0.5 for i in range(8)})
+
+    buckets, loads = lpt_partition(durations, workers=4)
+
+    assert sorted(nodeid for bucket in buckets for nodeid in bucket) == sorted(durations)
+    assert all(sum(nodeid.startswith('test_negative') for nodeid in bucket) == 1 for bucket in buckets)
+    assert max(loads) - min(loads) <= max(durations.values()), f'❌ Загрузка неровная: {loads}'
+    logger.info(f"✅ Загрузка воркеров: {loads}")
+
+
+@allure.feature('Scheduling')
+@allure.story('Timing database: Results survive between runs')
+def test_timing_database_roundtrip(tmp_path):
+    '''Длительность сглаживается между прогонами, эндпоинты и падения сохраняются.'''
+    path = str(tmp_path / 'timings.sqlite')
+
+    database = TimingDatabase(path)
+    database.update({'test_a': {'duration': 2.0, 'failed': True, 'endpoints': ['POST /booking']}})
+    database.close()
+
+    database = TimingDatabase(path)
+    database.update({'test_a': {'duration': 4.0, 'failed': False, 'endpoints': ['GET /ping']}})
+    timings = database.load()
+    database.close()
+
+    assert timings['test_a'] == {'duration': 3.0, 'runs': 2, 'failed': False, 'endpoints': ['GET /ping']}
+    logger.info(f"✅ Из базы прочитано: {timings['test_a']}")
+
+
+@allure.feature('Scheduling')
+@allure.story('Timing database: Worker reports carry endpoints to the controller')
+def test_recorder_takes_endpoints_from_reports(tmp_path):
+    '''Главный процесс xdist видит только отчёты: длительность, падение и эндпоинты берутся из них.'''
+    path = str(tmp_path / 'timings.sqlite')
+    recorder = TimingRecorder(SimpleNamespace(), path)
+
+    def report(when, duration, failed=False, user_properties=()):
+        return SimpleNamespace(nodeid='test_a', when=when, duration=duration, failed=failed,
+                               user_properties=list(user_properties))
+
+    recorder.pytest_runtest_logreport(report('setup', 0.25))
+    recorder.pytest_runtest_logreport(report('call', 1.5, failed=True))
+    recorder.pytest_runtest_logreport(
+        report('teardown', 0.25, user_properties=[('other', 1), (ENDPOINTS_PROPERTY, ['GET /booking/{id}'])]))
+    recorder.pytest_sessionfinish(None)
+
+    database = TimingDatabase(path)
+    timings = database.load()
+    database.close()
+    assert timings['test_a'] == {'duration': 2.0, 'runs': 1, 'failed': True, 'endpoints': ['GET /booking/{id}']}, \
+        f"❌ В базе: {timings['test_a']}"
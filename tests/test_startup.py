@@ -0,0 +1,53 @@
+'''Тесты для стоимости запуска pytest (импорт conftest и плагинов).'''
+
+import subprocess
+import sys
+from pathlib import Path
+import allure
+from core.settings.config import Startup
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# pytest и pytest_asyncio грузятся до conftest в любом случае - их не считаем
+PRELOADED = {'importlib', 'pytest', 'pytest_asyncio'}
+STARTUP_CODE = '''
+import importlib, pytest, pytest_asyncio
+import conftest
+for plugin in conftest.pytest_plugins:
+    importlib.import_module(plugin)
+'''
+
+
+def _import_times():
+    '''Запускает импорт с -X importtime: {модуль: (накопленное время в мкс, вложенность)}.
+
+    Вложенность 0 - модули, импортированные прямо из STARTUP_CODE.'''
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = (int(cumulative), (len(name) - len(name.lstrip()) - 1) // 2)
+    return times
+
+
+@allure.feature('Startup')
+@allure.story('Import time: Heavy modules load on first use')
+def test_startup_imports_stay_light():
+    '''conftest и плагины не тянут requests/httpx/pydantic/dotenv/faker и укладываются в бюджет.'''
+    times = _import_times()
+
+    heavy = [name for name in times if name.split('.')[0] in Startup.HEAVY_MODULES.value]
+    assert not heavy, f'❌ При запуске импортируются тяжёлые модули: {heavy}'
+
+    # Верхний уровень - conftest и плагины, их накопленное время включает всё, что они тянут
+    total_ms = sum(cumulative for name, (cumulative, depth) in times.items()
+                   if depth == 0 and name not in PRELOADED) / 1000
+    assert total_ms < Startup.IMPORT_BUDGET_MS.value, \
+        f'❌ Импорт conftest и плагинов занял {total_ms:.1f} мс (бюджет {Startup.IMPORT_BUDGET_MS.value} мс)'
+    logger.info(f"✅ Импорт conftest и плагинов: {total_ms:.1f} мс")
@@ -0,0 +1,204 @@
+'''Тесты для общего кэша токенов и повторной аутентификации на 403.'''
+
+import asyncio
+import os
+import stat
+import threading
+import time
+from types import SimpleNamespace
+import allure
+import pytest
+import requests
+from core.clients import api_client as api_client_module
+from core.clients import async_api_client as async_api_client_module
+from core.clients.api_client import APIClient
+from core.clients.async_api_client import AsyncAPIClient
+from core.clients.token_cache import TokenCache
+from core.metrics.latency import LatencyRegistry
+from core.server.local_server import LocalBookingServer
+import logging
+
+logger = logging.getLogger(__name__)
+
+BOOKING = {'firstname': 'Anna', 'lastname': 'Smith', 'totalprice': 1, 'depositpaid': True,
+           'bookingdates': {'checkin': '2030-01-01', 'checkout': '2030-01-02'}}
+
+
+class _Fetch:
+    '''fetch() для кэша: выдаёт token-1, token-2... и считает вызовы.'''
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls += 1
+            return f'token-{self.calls}'
+
+
+@allure.feature('Token cache')
+@allure.story('Cache: Fresh tokens are reused, stale ones refreshed')
+def test_token_cache_expiry_and_refresh_margin(tmp_path, monkeypatch):
+    '''Токен берётся из файла, пока до истечения больше refresh_margin, потом - новый.'''
+    now = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    cache = TokenCache(str(tmp_path / 'tokens.json'), ttl=100, refresh_margin=10)
+    fetch = _Fetch()
+
+    assert cache.get_or_fetch('url|user', fetch) == 'token-1'
+    now[0] += 89  # До истечения 11с - ещё свежий
+    assert cache.get_or_fetch('url|user', fetch) == 'token-1'
+    now[0] += 2  # До истечения 9с - внутри refresh_margin
+    assert cache.get_or_fetch('url|user', fetch) == 'token-2'
+    assert fetch.calls == 2
+
+    # Другой объект кэша (другой процесс) читает тот же файл
+    assert TokenCache(cache.path, ttl=100, refresh_margin=10).get_or_fetch('url|user', fetch) == 'token-2'
+    assert cache.get_or_fetch('other|user', fetch) == 'token-3', '❌ Ключи разных серверов смешались'
+
+
+@allure.feature('Token cache')
+@allure.story('Cache: Invalidate removes only the stale token')
+def test_token_cache_invalidate(tmp_path):
+    '''invalidate удаляет токен, только если в кэше всё ещё он.'''
+    cache = TokenCache(str(tmp_path / 'tokens.json'))
+    fetch = _Fetch()
+    cache.get_or_fetch('key', fetch)
+
+    cache.invalidate('key', 'someone-else-token')
+    assert cache.get_or_fetch('key', fetch) == 'token-1', '❌ Удалён чужой (более новый) токен'
+    cache.invalidate('key', 'token-1')
+    assert cache.get_or_fetch('key', fetch) == 'token-2'
+
+
+@allure.feature('Token cache')
+@allure.story('Cache: One fetch for concurrent callers, private file')
+def test_token_cache_lock_and_permissions(tmp_path):
+    '''Одновременные вызовы ждут первый fetch и берут его токен; файл доступен только владельцу.'''
+    cache = TokenCache(str(tmp_path / 'tokens.json'))
+    fetch = _Fetch(delay=0.1)
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(cache.get_or_fetch('key', fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetch.calls == 1, f'❌ За токеном сходили {fetch.calls} раз'
+    assert tokens == ['token-1'] * 8
+    mode = stat.S_IMODE(os.stat(cache.path).st_mode)
+    assert mode == 0o600, f'❌ Права файла токенов {oct(mode)}'
+
+
+@allure.feature('Token cache')
+@allure.story('Re-auth: 403 refreshes the token and retries once')
+def _use_local_credentials(monkeypatch, tmp_path):
+    '''Логин и пароль локального сервера для обоих клиентов, свой файл кэша токенов.'''
+    credentials = SimpleNamespace(USERNAME=SimpleNamespace(value='tester'), PASSWORD=SimpleNamespace(value='secret'))
+    monkeypatch.setattr(api_client_module, 'Users', credentials)
+    monkeypatch.setattr(async_api_client_module, 'Users', credentials)
+    monkeypatch.setenv('TOKEN_CACHE_PATH', str(tmp_path / 'tokens.json'))
+    monkeypatch.setenv('TOKEN_CACHE', 'on')
+    monkeypatch.setenv('CASSETTE_MODE', 'off')
+
+
+def test_forbidden_refreshes_token_once(tmp_path, monkeypatch, mocker):
+    '''Сервер забыл токен: 403, новый токен, повтор запроса. Ответ 403 закрывается.'''
+    _use_local_credentials(monkeypatch, tmp_path)
+
+    with LocalBookingServer(username='tester', password='secret') as server:
+        client = APIClient(max_workers=2, latency=LatencyRegistry(), base_url=server.url)
+        client.auth()
+        old_token = client.token
+        booking_id = client.create_booking(BOOKING).json()['bookingid']
+
+        server.httpd.tokens.clear()  # Токен "истёк" на сервере
+        close = mocker.spy(requests.Response, 'close')
+        response = client._request('PUT', f'/booking/{booking_id}', json={**BOOKING, 'totalprice': 2})
+
+        assert response.status_code == 200, f'❌ Ожидали 200 после обновления токена, получили {response.status_code}'
+        assert client.token != old_token and client.token in server.httpd.tokens
+        assert TokenCache(str(tmp_path / 'tokens.json')).get_or_fetch(client._token_key, lambda: None) == client.token
+        assert any(call.args[0].status_code == 403 for call in close.call_args_list), '❌ Ответ 403 не закрыт'
+
+        # Второй 403 подряд не повторяется бесконечно
+        server.httpd.tokens.clear()
+        server.httpd.password = 'changed'
+        response = client._request('PUT', f'/booking/{booking_id}', json=BOOKING)
+        assert response.status_code == 403
+    logger.info("✅ Токен обновлён после 403, запрос повторён один раз")
+
+
+@allure.feature('Token cache')
+@allure.story('Re-auth: A token refreshed by another worker is kept')
+def test_forbidden_keeps_token_refreshed_by_another_client(tmp_path, monkeypatch):
+    '''Два клиента с общим кэшем (как два воркера): пока запрос второго со старым токеном в пути,
+    первый уже обновил токен. Второй не выбрасывает новый токен из кэша и не ходит в /auth.'''
+    _use_local_credentials(monkeypatch, tmp_path)
+    latency = LatencyRegistry()
+
+    with LocalBookingServer(username='tester', password='secret') as server:
+        first = APIClient(max_workers=2, latency=latency, base_url=server.url)
+        second = APIClient(max_workers=2, latency=latency, base_url=server.url)
+        first.auth()
+        second.auth()
+        assert first.token == second.token, '❌ Второй клиент не взял токен из кэша'
+        old_token = first.token
+        booking_id = first.create_booking(BOOKING).json()['bookingid']
+        endpoint = f'/booking/{booking_id}'
+        server.httpd.tokens.clear()  # Токен "истёк" на сервере
+
+        send = second._send
+
+        def send_while_first_refreshes(*args):
+            response = send(*args)
+            if response.status_code == 403:
+                # Ответ 403 ещё не обработан, а первый клиент уже получил новый токен,
+                # и другой поток второго клиента взял его из кэша
+                assert first._request('PUT', endpoint, json=BOOKING).status_code == 200
+                second.auth()
+            return response
+
+        monkeypatch.setattr(second, '_send', send_while_first_refreshes)
+        response = second._request('PUT', endpoint, json=BOOKING)
+
+        assert response.status_code == 200, f'❌ Ожидали 200, получили {response.status_code}'
+        assert second.token == first.token != old_token
+        auth_calls = latency.histograms['POST /auth'].count
+        assert auth_calls == 2, f'❌ Запросов к /auth: {auth_calls}, ожидали 2 (первый вход и одно обновление)'
+        assert TokenCache(str(tmp_path / 'tokens.json')).get_or_fetch(first._token_key, lambda: None) == first.token, \
+            '❌ Новый токен выброшен из кэша'
+    logger.info("✅ Токен, обновлённый другим клиентом, сохранён")
+
+
+@allure.feature('Token cache')
+@allure.story('Re-auth: Async client shares the cache and refreshes once')
+@pytest.mark.asyncio
+async def test_async_forbidden_refreshes_token_once(tmp_path, monkeypatch):
+    '''AsyncAPIClient берёт токен из общего с APIClient кэша; 10 одновременных 403 - один /auth и повтор.'''
+    _use_local_credentials(monkeypatch, tmp_path)
+    latency = LatencyRegistry()
+
+    with LocalBookingServer(username='tester', password='secret') as server:
+        APIClient(max_workers=2, latency=latency, base_url=server.url).auth()
+        async with AsyncAPIClient(max_concurrency=10, latency=latency, base_url=server.url) as client:
+            assert await client.auth() is None, '❌ Асинхронный клиент не взял токен из кэша'
+            old_token = client.token
+            booking_id = (await client.create_booking(BOOKING)).json()['bookingid']
+            endpoint = f'/booking/{booking_id}'
+
+            server.httpd.tokens.clear()
+            responses = await asyncio.gather(*(client._request('PUT', endpoint, json=BOOKING) for _ in range(10)))
+            statuses = [response.status_code for response in responses]
+            assert statuses == [200] * 10, f'❌ Статусы после обновления токена: {statuses}'
+            assert client.token != old_token and client.token in server.httpd.tokens
+            assert latency.histograms['POST /auth'].count == 2, '❌ Каждый 403 сходил в /auth'
+
+            # Второй 403 подряд не повторяется бесконечно
+            server.httpd.tokens.clear()
+            server.httpd.password = 'changed'
+            response = await client._request('PUT', endpoint, json=BOOKING)
+            assert response.status_code == 403
+    logger.info("✅ Асинхронный клиент обновил токен один раз")